@@ -0,0 +1,15 @@
+-- Index accessory cable-OD ranges for containment lookups
+-- `cable_od_range_in` is a two-element NUMERIC array, which Postgres cannot
+-- index for "min <= od <= max" predicates. Mirror it as a numrange column and
+-- put a GiST index on (connector_family, range) so MDMDAO.find_accessories_by
+-- can use `cable_od_range @> od` instead of scanning every row of a family.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE mdm_accessories
+  ADD COLUMN IF NOT EXISTS cable_od_range NUMRANGE
+  GENERATED ALWAYS AS (numrange(cable_od_range_in[1], cable_od_range_in[2], '[]')) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_mdm_accessories_family_od_range
+  ON mdm_accessories USING GIST (connector_family, cable_od_range)
+  WHERE status = 'active';
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The DRC service imports its modules by bare name, as it does when run from services/drc
+DRC_SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "drc")
+
+
+def use_drc_service() -> None:
+    """Make the DRC service's modules importable next to the ``rules`` package."""
+    if DRC_SERVICE_DIR not in sys.path:
+        sys.path.insert(0, DRC_SERVICE_DIR)
@@ -0,0 +1,67 @@
+"""Run the engine micro-benchmarks and compare them with the stored baselines.
+
+    python -m benchmarks                 # from services/; exits 1 on a failure or regression
+    python -m benchmarks -k run_drc      # only cases whose name contains "run_drc"
+    python -m benchmarks --update        # record the current numbers as the baseline
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from . import harness
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+
+def all_cases():
+    from . import drc_cases, rules_cases
+    return drc_cases.cases() + rules_cases.cases()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", action="append", default=[],
+                        help="only run cases whose name contains PATTERN (repeatable)")
+    parser.add_argument("--baseline", default=BASELINES, help="baseline file (default: %(default)s)")
+    parser.add_argument("--update", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="allowed fractional slowdown of ops/s and p50 (default: %(default)s)")
+    parser.add_argument("--peak-threshold", type=float, default=0.10,
+                        help="allowed fractional growth of the peak traced KiB per call (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per timing run of each case (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="timing runs per case; the median run is kept (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in all_cases() if not args.pattern or any(p in case.name for p in args.pattern)]
+    baselines = harness.load_baselines(args.baseline)
+    results = []
+    for case in cases:
+        print(f"  {case.name}", file=sys.stderr, flush=True)
+        results.append(harness.measure(case, min_time_s=args.min_time, repeats=args.repeats))
+    print(harness.render_results(results, baselines))
+
+    failed = [result.name for result in results if result.error is not None]
+    if failed:
+        # Whether or not they have a baseline, and before any of them is recorded
+        print(f"\n{len(failed)} case(s) failed to run")
+        return 1
+
+    if args.update:
+        harness.save_baselines(args.baseline, results, baselines)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = harness.compare(results, baselines, args.threshold, args.peak_threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        print(harness.render_regressions(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
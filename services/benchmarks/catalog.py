@@ -0,0 +1,422 @@
+"""Seeded synthetic MDM catalogs, bulk-loaded into Postgres or a SQLite stand-in.
+
+    python -m benchmarks.catalog --parts 100000 --sqlite /tmp/mdm.db
+    python -m benchmarks.catalog --parts 1000000 --postgres "$MDM_DATABASE_URL" --replace
+    python -m benchmarks.catalog --parts 10000 --sqlite /tmp/mdm.db --assemblies 500 --out /tmp/populations
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from testkit.seed_data import seed_rows
+
+from . import use_drc_service
+
+INIT_SQL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "db", "postgres_extra", "init"
+)
+
+TABLES = ("mdm_cables", "mdm_connectors", "mdm_contacts", "mdm_accessories")
+
+# Loaded columns per table, in COPY/INSERT order; ids come from the SERIAL
+COLUMNS = {
+    "mdm_cables": ("mpn", "family", "type", "conductor_count", "conductor_awg", "pitch_in", "od_in",
+                   "voltage_rating_v", "temp_rating_c", "shield", "flex_class", "status"),
+    "mdm_connectors": ("mpn", "family", "positions", "pitch_mm", "termination", "stud_size",
+                       "compatible_contacts_awg", "orientation", "status"),
+    "mdm_contacts": ("mpn", "connector_family", "type", "awg_range", "plating", "insulation_support",
+                     "retention_type", "status"),
+    "mdm_accessories": ("mpn", "connector_family", "type", "cable_od_range_in", "material", "shielding", "status"),
+}
+ARRAY_COLUMNS = {"compatible_contacts_awg", "awg_range", "cable_od_range_in"}
+
+# Share of the requested part count per table
+SHARES = {"mdm_cables": 0.20, "mdm_connectors": 0.25, "mdm_contacts": 0.35, "mdm_accessories": 0.20}
+# Fraction of generated rows that are not 'active', so lookups still filter on status
+OBSOLETE_FRACTION = 0.03
+# Average parts per generated connector family; keeps per-family lookups realistic as the catalog grows
+PARTS_PER_FAMILY = 400
+LUG_FAMILY = "TE Ring Lugs"
+
+SEED_FAMILIES = (
+    # family, termination, pitch_mm, compatible AWGs, position choices
+    ("JST PH", "crimp", Decimal("2.00"), (24, 26, 28, 30), (2, 3, 4, 5, 6, 8, 10, 12, 14, 16)),
+    ("Molex Mega-Fit", "crimp", Decimal("5.70"), (12, 14, 16, 18), (2, 4, 6, 8, 10, 12, 16, 24)),
+    ("3M IDC", "idc", Decimal("1.27"), (26, 28), (10, 14, 16, 20, 26, 34, 40, 50, 64)),
+    (LUG_FAMILY, "ring_lug", None, (8, 10, 12, 14, 16, 18, 20), (1,)),
+)
+VENDORS = ("Amphenol", "Harwin", "Hirose", "JST", "Molex", "Samtec", "TE", "Wurth", "Phoenix", "Souriau")
+STUD_SIZES = ("#4", "#6", "#8", "#10", "1/4", "M3", "M4", "M5", "M6", "M8")
+AWGS = (10, 12, 14, 16, 18, 20, 22, 24, 26, 28, 30)
+
+
+class Family(NamedTuple):
+    name: str
+    termination: str
+    pitch_mm: Optional[Decimal]
+    awgs: Tuple[int, ...]
+    positions: Tuple[int, ...]
+
+
+class Catalog:
+    """A catalog of ``parts`` rows that is the same for every run with the same ``seed``.
+
+    Rows are generated on demand, table by table, so a million-part catalog is
+    never held in memory. The rows of 001_seed.sql come first in their tables,
+    so every lookup the seed data answers still resolves.
+    """
+
+    def __init__(self, parts: int, seed: int = 0) -> None:
+        if parts < 1:
+            raise ValueError("parts must be at least 1")
+        self.parts = parts
+        self.seed = seed
+        self.counts = {table: int(parts * share) for table, share in SHARES.items()}
+        self.counts["mdm_contacts"] += parts - sum(self.counts.values())
+        self.families = self._families()
+        self._connector_families = [family for family in self.families if family.name != LUG_FAMILY]
+        self._contact_families = [family for family in self.families if family.termination in ("crimp", "solder")]
+
+    def _rng(self, name: str) -> random.Random:
+        return random.Random(f"{self.seed}:{name}")
+
+    def _families(self) -> List[Family]:
+        rng = self._rng("families")
+        families = [Family(*family) for family in SEED_FAMILIES]
+        for index in range(max(1, self.counts["mdm_connectors"] // PARTS_PER_FAMILY)):
+            termination = rng.choice(("crimp", "crimp", "crimp", "idc", "solder"))
+            if termination == "idc":
+                pitch, awgs = Decimal("1.27"), (26, 28)
+            else:
+                pitch = Decimal(rng.choice(("1.00", "1.25", "2.00", "2.50", "3.00", "3.96", "4.20", "5.70")))
+                low = rng.randrange(0, len(AWGS) - 3)
+                awgs = AWGS[low:low + rng.randint(2, 4)]
+            positions = tuple(sorted(rng.sample(range(2, 65), rng.randint(3, 10))))
+            families.append(Family(f"{rng.choice(VENDORS)} S{index:05d}", termination, pitch, awgs, positions))
+        return families
+
+    def rows(self, table: str) -> Iterator[Dict[str, Any]]:
+        """Rows of ``table`` as the MDM DAO reads them (Decimal numerics, list arrays), without ids."""
+        seeded = SEED_ROWS[table]
+        yield from (dict(row) for row in islice(seeded, self.counts[table]))
+        generate = getattr(self, f"_{table}")
+        rng = self._rng(table)
+        for index in range(self.counts[table] - len(seeded)):
+            row = generate(rng, index)
+            row["status"] = "obsolete" if rng.random() < OBSOLETE_FRACTION else "active"
+            yield row
+
+    def _mdm_cables(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        if rng.random() < 0.35:
+            ways = rng.choice((10, 14, 16, 20, 26, 34, 40, 50, 64))
+            return {
+                "mpn": f"SYN-RIB-{index:07d}", "family": f"{rng.choice(VENDORS)} Ribbon", "type": "ribbon",
+                "conductor_count": ways, "conductor_awg": rng.choice((None, 28, 30)),
+                "pitch_in": rng.choice((Decimal("0.0500"), Decimal("0.0500"), Decimal("0.0250"), Decimal("0.0390"))),
+                "od_in": Decimal(rng.randint(400, 600)) / 10000,
+                "voltage_rating_v": 300, "temp_rating_c": rng.choice((80, 105)),
+                "shield": rng.choice(("none", "none", "none", "foil")),
+                "flex_class": rng.choice(("flexible", "standard")),
+            }
+        count = rng.choice((2, 2, 3, 4, 4, 6, 8, 12, 16, 24))
+        awg = rng.choice(AWGS)
+        return {
+            "mpn": f"SYN-RND-{index:07d}", "family": f"{rng.choice(VENDORS)} Multi",
+            "type": rng.choice(("round_shielded", "round_shielded", "round_shielded", "coax")),
+            "conductor_count": count, "conductor_awg": awg, "pitch_in": None,
+            "od_in": Decimal(min(9999, 800 + count * (36 - awg) * 25 + rng.randint(0, 300))) / 10000,
+            "voltage_rating_v": rng.choice((150, 300, 300, 600, 1000)),
+            "temp_rating_c": rng.choice((60, 80, 80, 105, 125)),
+            "shield": rng.choice(("foil", "foil", "braid", "foil+braid", "none")),
+            "flex_class": rng.choice(("flexible", "flexible", "standard", "semi-rigid")),
+        }
+
+    def _mdm_connectors(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        if rng.random() < 0.1:
+            low = rng.randrange(0, 5)
+            return {
+                "mpn": f"SYN-LUG-{index:07d}", "family": LUG_FAMILY, "positions": 1, "pitch_mm": None,
+                "termination": "ring_lug", "stud_size": rng.choice(STUD_SIZES),
+                "compatible_contacts_awg": list(AWGS[low:low + rng.randint(3, 6)]), "orientation": "straight",
+            }
+        family = rng.choice(self._connector_families)
+        return {
+            "mpn": f"SYN-CON-{index:07d}", "family": family.name, "positions": rng.choice(family.positions),
+            "pitch_mm": family.pitch_mm, "termination": family.termination, "stud_size": None,
+            "compatible_contacts_awg": list(family.awgs),
+            "orientation": rng.choice(("straight", "straight", "right_angle", "vertical")),
+        }
+
+    def _mdm_contacts(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        family = rng.choice(self._contact_families)
+        return {
+            "mpn": f"SYN-CTC-{index:07d}", "connector_family": family.name, "type": rng.choice(("pin", "socket")),
+            "awg_range": list(family.awgs), "plating": rng.choice(("tin", "tin", "gold", "silver")),
+            "insulation_support": rng.random() < 0.4,
+            "retention_type": rng.choice((None, "friction", "locking", "twist")),
+        }
+
+    def _mdm_accessories(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        family = rng.choice(self._connector_families)
+        low = rng.randint(300, 4500)
+        return {
+            "mpn": f"SYN-ACC-{index:07d}", "connector_family": family.name,
+            "type": rng.choice(("backshell", "strain_relief", "boot", "hood")),
+            "cable_od_range_in": [Decimal(low) / 10000, Decimal(low + rng.randint(500, 2500)) / 10000],
+            "material": rng.choice(("metal", "plastic", "rubber")), "shielding": rng.random() < 0.3,
+        }
+
+    def snapshot(self):
+        """The whole catalog as an ``MDMSnapshot``, with ids as a fresh load would assign them."""
+        use_drc_service()
+        from mdm_snapshot import MDMSnapshot
+
+        tables = {}
+        for table in TABLES:
+            rows = [dict(row, id=index) for index, row in enumerate(self.rows(table), start=1)]
+            tables[table] = [row for row in rows if row["status"] == "active"]
+        return MDMSnapshot(
+            cables=tables["mdm_cables"], connectors=tables["mdm_connectors"],
+            contacts=tables["mdm_contacts"], accessories=tables["mdm_accessories"],
+            version=f"synthetic-{self.parts}-{self.seed}",
+        )
+
+
+def _seed_rows() -> Dict[str, List[Dict[str, Any]]]:
+    return {table: [{column: row[column] for column in COLUMNS[table]} for row in rows]
+            for table, rows in seed_rows().items()}
+
+
+# The rows of db/postgres_extra/init/001_seed.sql
+SEED_ROWS = _seed_rows()
+
+
+# ---------------------------------------------------------------------------
+# Postgres
+# ---------------------------------------------------------------------------
+
+def _pg_value(value: Any) -> Any:
+    if value is None:
+        return ""  # COPY's CSV NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        return "{" + ",".join(str(item) for item in value) + "}"
+    return value
+
+
+def _copy_chunks(rows: Iterator[Dict[str, Any]], columns: Sequence[str], chunk_rows: int) -> Iterator[io.StringIO]:
+    while True:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        written = 0
+        for row in islice(rows, chunk_rows):
+            writer.writerow([_pg_value(row[column]) for column in columns])
+            written += 1
+        if not written:
+            return
+        buffer.seek(0)
+        yield buffer
+
+
+def load_postgres(conn, catalog: Catalog, replace: bool = False, chunk_rows: int = 50_000) -> Dict[str, int]:
+    """COPY ``catalog`` into the MDM tables over a psycopg2 connection.
+
+    A database without the MDM tables gets them (and their indexes) from the
+    init scripts first. Existing catalog data is only replaced with
+    ``replace``. Returns the rows loaded per table.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('mdm_accessories') IS NULL")
+        if cur.fetchone()[0]:
+            for path in sorted(glob.glob(os.path.join(INIT_SQL_DIR, "*.sql"))):
+                with open(path, encoding="utf-8") as handle:
+                    cur.execute(handle.read())
+        if not replace:
+            for table in TABLES:
+                cur.execute(f"SELECT count(*) FROM {table}")
+                if cur.fetchone()[0] > len(SEED_ROWS[table]):
+                    raise ValueError(f"{table} already holds catalog data; pass replace=True to overwrite it")
+        cur.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY")
+        for table in TABLES:
+            columns = COLUMNS[table]
+            statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+            for chunk in _copy_chunks(catalog.rows(table), columns, chunk_rows):
+                cur.copy_expert(statement, chunk)
+    conn.commit()
+
+    # Fresh statistics, so the planner sees the catalog's real size
+    autocommit, conn.autocommit = conn.autocommit, True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"VACUUM ANALYZE {', '.join(TABLES)}")
+    finally:
+        conn.autocommit = autocommit
+    return dict(catalog.counts)
+
+
+# ---------------------------------------------------------------------------
+# SQLite stand-in
+# ---------------------------------------------------------------------------
+
+# The MDM schema in SQLite types: arrays are JSON text, numerics are REAL.
+# Indexes cover the equality columns of the MDM DAO lookups.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mdm_cables (
+  id INTEGER PRIMARY KEY, mpn TEXT UNIQUE NOT NULL, family TEXT NOT NULL, type TEXT NOT NULL,
+  conductor_count INTEGER NOT NULL, conductor_awg INTEGER, pitch_in REAL, od_in REAL,
+  voltage_rating_v INTEGER, temp_rating_c INTEGER, shield TEXT DEFAULT 'none',
+  flex_class TEXT DEFAULT 'standard', status TEXT DEFAULT 'active'
+);
+CREATE TABLE IF NOT EXISTS mdm_connectors (
+  id INTEGER PRIMARY KEY, mpn TEXT UNIQUE NOT NULL, family TEXT NOT NULL, positions INTEGER NOT NULL,
+  pitch_mm REAL, termination TEXT, stud_size TEXT, compatible_contacts_awg TEXT, orientation TEXT,
+  status TEXT DEFAULT 'active'
+);
+CREATE TABLE IF NOT EXISTS mdm_contacts (
+  id INTEGER PRIMARY KEY, mpn TEXT UNIQUE NOT NULL, connector_family TEXT NOT NULL, type TEXT NOT NULL,
+  awg_range TEXT NOT NULL, plating TEXT DEFAULT 'tin', insulation_support INTEGER DEFAULT 0,
+  retention_type TEXT, status TEXT DEFAULT 'active'
+);
+CREATE TABLE IF NOT EXISTS mdm_accessories (
+  id INTEGER PRIMARY KEY, mpn TEXT UNIQUE NOT NULL, connector_family TEXT NOT NULL, type TEXT NOT NULL,
+  cable_od_range_in TEXT NOT NULL, material TEXT, shielding INTEGER DEFAULT 0, status TEXT DEFAULT 'active'
+);
+CREATE INDEX IF NOT EXISTS idx_mdm_cables_type_count ON mdm_cables (type, conductor_count);
+CREATE INDEX IF NOT EXISTS idx_mdm_connectors_family_termination ON mdm_connectors (family, termination);
+CREATE INDEX IF NOT EXISTS idx_mdm_connectors_stud ON mdm_connectors (stud_size) WHERE stud_size IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_mdm_contacts_family ON mdm_contacts (connector_family);
+CREATE INDEX IF NOT EXISTS idx_mdm_accessories_family ON mdm_accessories (connector_family);
+"""
+
+
+def _sqlite_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return json.dumps([float(item) if isinstance(item, Decimal) else item for item in value])
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def load_sqlite(path: str, catalog: Catalog, replace: bool = False, chunk_rows: int = 50_000) -> Dict[str, int]:
+    """Write ``catalog`` into a SQLite file with the MDM tables and lookup indexes."""
+    conn = sqlite3.connect(path)
+    try:
+        # A scratch database: durability is not worth the write amplification
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SQLITE_SCHEMA)
+        for table in TABLES:
+            if conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0] and not replace:
+                raise ValueError(f"{table} in {path} is not empty; pass replace=True to overwrite it")
+            conn.execute(f"DELETE FROM {table}")
+        for table in TABLES:
+            columns = COLUMNS[table]
+            statement = (
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+            )
+            rows = catalog.rows(table)
+            while True:
+                chunk = [tuple(_sqlite_value(row[column]) for column in columns) for row in islice(rows, chunk_rows)]
+                if not chunk:
+                    break
+                conn.executemany(statement, chunk)
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return dict(catalog.counts)
+
+
+def snapshot_from_sqlite(path: str):
+    """Read a SQLite stand-in back as an ``MDMSnapshot``, with values typed as the Postgres DAO returns them."""
+    use_drc_service()
+    from mdm_snapshot import MDMSnapshot
+
+    decimal_columns = {"pitch_in": "0.0001", "od_in": "0.0001", "pitch_mm": "0.01"}
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        tables = {}
+        for table in TABLES:
+            rows = []
+            for record in conn.execute(f"SELECT * FROM {table} WHERE status = 'active' ORDER BY id"):
+                row = dict(record)
+                for column, value in row.items():
+                    if value is None:
+                        continue
+                    if column in ARRAY_COLUMNS:
+                        row[column] = [Decimal(str(item)) if isinstance(item, float) else item
+                                       for item in json.loads(value)]
+                    elif column in decimal_columns:
+                        row[column] = Decimal(str(value)).quantize(Decimal(decimal_columns[column]))
+                    elif column in ("insulation_support", "shielding"):
+                        row[column] = bool(value)
+                rows.append(row)
+            tables[table] = rows
+    finally:
+        conn.close()
+    return MDMSnapshot(
+        cables=tables["mdm_cables"], connectors=tables["mdm_connectors"],
+        contacts=tables["mdm_contacts"], accessories=tables["mdm_accessories"],
+        version=f"sqlite:{os.path.basename(path)}",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.catalog", description=__doc__.splitlines()[0])
+    parser.add_argument("--parts", type=int, required=True, help="total MDM rows across the four tables")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed (default: %(default)s)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--postgres", metavar="DSN", help="load into this Postgres database")
+    target.add_argument("--sqlite", metavar="PATH", help="load into this SQLite file")
+    parser.add_argument("--replace", action="store_true", help="overwrite MDM rows already in the target")
+    parser.add_argument("--assemblies", type=int, default=0,
+                        help="also write this many Step 1 payloads and assemblies drawn from the catalog")
+    parser.add_argument("--max-wires", type=int, default=5_000, help="largest generated wirelist (default: %(default)s)")
+    parser.add_argument("--out", default=".", help="directory for the population NDJSON files (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    catalog = Catalog(args.parts, args.seed)
+    started = time.perf_counter()
+    try:
+        if args.postgres:
+            import psycopg2
+
+            conn = psycopg2.connect(args.postgres)
+            try:
+                counts = load_postgres(conn, catalog, replace=args.replace)
+            finally:
+                conn.close()
+        else:
+            counts = load_sqlite(args.sqlite, catalog, replace=args.replace)
+    except ValueError as exc:
+        parser.error(str(exc).replace("replace=True", "--replace"))
+    print(f"Loaded {sum(counts.values()):,} parts in {time.perf_counter() - started:.1f}s: "
+          + ", ".join(f"{table}={count:,}" for table, count in counts.items()))
+
+    if args.assemblies:
+        from .populations import write_populations
+
+        paths = write_populations(catalog, args.assemblies, args.out, seed=args.seed, max_wires=args.max_wires)
+        print(f"Wrote {args.assemblies:,} Step 1 payloads and assemblies to {', '.join(paths)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List
+
+from . import use_drc_service
+
+use_drc_service()
+
+from drc import DrcEngine  # noqa: E402
+from testkit.drc_fixtures import snapshot_dao  # noqa: E402
+from models import (  # noqa: E402
+    ConductorSpec, EndpointFull, PartRef, ShieldSpec, SynthesisProposal, WirelistRow,
+)
+
+from .harness import Case  # noqa: E402
+
+Setup = Callable[[], Callable[[], Any]]
+
+CONDUCTORS = (2, 40, 200)
+
+
+def ribbon_proposal(conductors: int) -> SynthesisProposal:
+    endpoint = EndpointFull(
+        connector=PartRef(mpn=f"IDC-0.050-{conductors}POS", family="3M IDC"),
+        termination="idc",
+        contacts={"primary": PartRef(mpn="3M-3510-5010"), "alternates": []},
+    )
+    return SynthesisProposal(
+        proposal_id=f"bench-ribbon-{conductors}", draft_id="bench", cable={},
+        conductors=ConductorSpec(
+            count=conductors, awg=28, od_mm=1.2, ribbon={"ways": conductors, "pitch_in": 0.05, "red_stripe": True},
+            voltage_rating=300, temp_rating_c=80, length_mm=600,
+        ),
+        endpoints={"endA": endpoint, "endB": endpoint},
+        shield=ShieldSpec(type="none", drain_policy="isolated"),
+        wirelist=[WirelistRow(circuit=f"SIG{i}", conductor=i, color="GREY") for i in range(1, conductors + 1)],
+        bom=[], warnings=[], errors=[], explain=[], bend_radius_mm=15.0,
+    )
+
+
+def power_proposal(conductors: int) -> SynthesisProposal:
+    endpoint = EndpointFull(
+        connector=PartRef(mpn="TE-320582", family="TE Ring Lugs"),
+        termination="ring_lug",
+        contacts={"primary": PartRef(mpn="TE-320582"), "alternates": []},
+    )
+    colors = ["BROWN", "BLUE", "GREEN/YELLOW"]
+    return SynthesisProposal(
+        proposal_id=f"bench-power-{conductors}", draft_id="bench", cable={},
+        conductors=ConductorSpec(
+            count=conductors, awg=14, od_mm=7.1, current_rating=12.0, voltage_rating=600, temp_rating_c=105,
+            length_mm=2000, ac_colors=colors,
+        ),
+        endpoints={"endA": endpoint, "endB": endpoint},
+        shield=ShieldSpec(type="foil", drain_policy="pigtail"),
+        wirelist=[WirelistRow(circuit=f"P{i}", conductor=i, color=colors[i % 3]) for i in range(1, conductors + 1)],
+        bom=[], warnings=[], errors=[], explain=[], bend_radius_mm=60.0, locale="EU",
+    )
+
+
+def validate_proposal(build: Callable[[int], SynthesisProposal], conductors: int) -> Setup:
+    def setup():
+        engine, proposal = DrcEngine(mdm_dao=snapshot_dao()), build(conductors)
+        return lambda: engine.validate_proposal(proposal)
+    return setup
+
+
+def cases() -> List[Case]:
+    found = []
+    for conductors in CONDUCTORS:
+        found.append(Case(f"drc.validate_proposal[ribbon/conductors={conductors}]",
+                          validate_proposal(ribbon_proposal, conductors)))
+        found.append(Case(f"drc.validate_proposal[power/conductors={conductors}]",
+                          validate_proposal(power_proposal, conductors)))
+    return found
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Metrics compared against the baseline, and whether a larger value is better.
+# p99 is reported but not gated: one scheduler hiccup moves it more than a real change.
+GATED_METRICS = {"ops_per_sec": True, "p50_ms": False, "peak_kib": False}
+METRICS = ("ops_per_sec", "p50_ms", "p99_ms", "peak_kib")
+
+
+class Case(NamedTuple):
+    name: str
+    # Builds the fixture once and returns the zero-argument call that is timed
+    setup: Callable[[], Callable[[], Any]]
+
+
+class Result(NamedTuple):
+    name: str
+    rounds: int
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    # Peak traced allocation of one call, above what was live before it
+    peak_kib: float
+    error: Optional[str] = None
+
+    def metrics(self) -> Dict[str, float]:
+        return {metric: getattr(self, metric) for metric in METRICS}
+
+
+class Regression(NamedTuple):
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted ``samples``."""
+    rank = max(1, math.ceil(fraction * len(samples)))
+    return samples[rank - 1]
+
+
+def measure(
+    case: Case,
+    min_time_s: float = 0.2,
+    min_rounds: int = 5,
+    max_rounds: int = 100_000,
+    repeats: int = 5,
+    peak_rounds: int = 3,
+) -> Result:
+    """Time ``case`` in ``repeats`` runs of at least ``min_time_s`` and ``min_rounds`` calls.
+
+    The run with the median mean latency is reported, so one run slowed (or
+    sped up) by other load on the machine does not become the result.
+    Latencies come from untraced calls; the peak traced KiB is measured
+    afterwards under tracemalloc, which slows execution too much to time.
+    """
+    try:
+        call = case.setup()
+        call()  # warm-up: lazy plans, caches of compiled tables, imports
+
+        runs: List[List[float]] = []
+        for _ in range(repeats):
+            samples: List[float] = []
+            started = time.perf_counter()
+            while len(samples) < max_rounds:
+                before = time.perf_counter_ns()
+                call()
+                samples.append((time.perf_counter_ns() - before) / 1e6)
+                if len(samples) >= min_rounds and time.perf_counter() - started >= min_time_s:
+                    break
+            runs.append(samples)
+        runs.sort(key=lambda samples: sum(samples) / len(samples))
+        timed = runs[len(runs) // 2]
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(peak_rounds):
+                live, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                call()
+                peaks.append(tracemalloc.get_traced_memory()[1] - live)
+        finally:
+            tracemalloc.stop()
+    except Exception as exc:
+        return Result(case.name, 0, 0.0, 0.0, 0.0, 0.0, error=f"{type(exc).__name__}: {exc}")
+
+    timed.sort()
+    return Result(
+        name=case.name,
+        rounds=len(timed),
+        ops_per_sec=len(timed) / (sum(timed) / 1e3),
+        p50_ms=percentile(timed, 0.50),
+        p99_ms=percentile(timed, 0.99),
+        peak_kib=min(peaks) / 1024,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def load_baselines(path: str) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)["cases"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path: str, results: List[Result], previous: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+    """Write ``results`` over ``previous``; cases that were not run keep their old baseline."""
+    cases = dict(previous or {})
+    for result in results:
+        if result.error is None:
+            cases[result.name] = {metric: round(value, 4) for metric, value in result.metrics().items()}
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": dict(sorted(cases.items())),
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2)
+        handle.write("\n")
+
+
+def compare(
+    results: List[Result],
+    baselines: Dict[str, Dict[str, float]],
+    threshold: float = 0.5,
+    peak_threshold: float = 0.10,
+) -> List[Regression]:
+    """Gated metrics that moved the wrong way by more than their threshold.
+
+    A case that has a baseline but now fails to run is a regression of every
+    gated metric. Cases without a baseline are never regressions (the runner
+    fails any case that raises on its own).
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result.name)
+        if baseline is None:
+            continue
+        for metric, higher_is_better in GATED_METRICS.items():
+            old = baseline.get(metric)
+            if not old:
+                continue
+            if result.error is not None:
+                regressions.append(Regression(result.name, metric, old, math.nan, math.nan))
+                continue
+            new = getattr(result, metric)
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            limit = peak_threshold if metric == "peak_kib" else threshold
+            if worse > limit:
+                regressions.append(Regression(result.name, metric, old, new, change))
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _format(value: float) -> str:
+    if math.isnan(value):
+        return "-"
+    return f"{value:,.3f}" if value < 100 else f"{value:,.0f}"
+
+
+def _table(header: List[str], rows: List[List[str]]) -> str:
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                       for i, (cell, width) in enumerate(zip(row, widths)))
+             for row in [header] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def render_results(results: List[Result], baselines: Dict[str, Dict[str, float]]) -> str:
+    """One row per case, then the error of each case that failed to run.
+
+    The change against the baseline p50 is shown where there is one.
+    """
+    rows, errors = [], []
+    for result in results:
+        if result.error is not None:
+            rows.append([result.name, "error", "", "", "", "", ""])
+            errors.append(f"  {result.name}: {result.error}")
+            continue
+        old = baselines.get(result.name, {}).get("p50_ms")
+        versus = f"{(result.p50_ms - old) / old:+.1%}" if old else "new"
+        rows.append([result.name, str(result.rounds)] + [_format(v) for v in result.metrics().values()] + [versus])
+    table = _table(["case", "rounds", "ops/s", "p50 ms", "p99 ms", "peak KiB", "p50 vs base"], rows)
+    return "\n".join([table, "", "Errors:"] + errors) if errors else table
+
+
+def render_regressions(regressions: List[Regression]) -> str:
+    rows = [
+        [r.name, r.metric, _format(r.baseline), _format(r.current),
+         "failed" if math.isnan(r.change) else f"{r.change:+.1%}"]
+        for r in regressions
+    ]
+    return _table(["case", "metric", "baseline", "current", "change"], rows)
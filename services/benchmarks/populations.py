@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+from typing import Any, Dict, Iterator, List
+
+from rules.models import AssemblySchema
+from rules.schema_digest import SchemaDigest
+
+from . import use_drc_service
+from .catalog import STUD_SIZES, Catalog, Family
+
+use_drc_service()
+
+from models import AssemblyStep1  # noqa: E402
+
+LOCALES = ("NA", "NA", "EU", "EU", "JP", "Other")
+# Line, neutral and protective-earth colours per locale, as the colour rules expect them
+AC_COLORS = {
+    "NA": ("BLACK", "WHITE", "GREEN"),
+    "EU": ("BROWN", "BLUE", "GREEN/YELLOW"),
+    "JP": ("BLACK", "WHITE", "GREEN"),
+    "Other": ("BLACK", "WHITE", "GREEN"),
+}
+
+
+def _circuits(rng: random.Random, kind: str) -> int:
+    """0 to 200 per_circuit entries, most assemblies having a handful."""
+    if rng.random() < 0.1:
+        return 0
+    return min(200, int(rng.expovariate(1 / (12 if kind == "ribbon" else 4))) + 1)
+
+
+def _wires(rng: random.Random, max_wires: int) -> int:
+    """2 to ``max_wires`` rows, log-uniform so every order of magnitude is represented."""
+    return max(2, int(math.exp(rng.uniform(math.log(2), math.log(max(2, max_wires))))))
+
+
+def _family(rng: random.Random, catalog: Catalog, termination: str) -> Family:
+    candidates = [family for family in catalog.families if family.termination == termination]
+    return rng.choice(candidates or catalog.families)
+
+
+def step1_payload(rng: random.Random, catalog: Catalog) -> Dict[str, Any]:
+    """One Step 1 payload whose endpoints name a connector family in ``catalog``."""
+    kind = rng.choice(("ribbon", "power_cable", "power_cable", "sensor_lead", "custom"))
+    termination = "idc" if kind == "ribbon" else rng.choice(("crimp", "crimp", "ring_lug", "solder"))
+    family = _family(rng, catalog, termination)
+    positions = rng.choice(family.positions)
+    circuits = _circuits(rng, kind)
+    power = kind == "power_cable"
+    per_circuit = [
+        {
+            "current_a": round(rng.uniform(2.0, 20.0) if power else rng.uniform(0.01, 1.0), 2),
+            "voltage_v": rng.choice((120, 240, 300)) if power else rng.choice((3.3, 5, 12, 24)),
+            "signal_type": "power" if power else rng.choice(("digital", "analog")),
+        }
+        for _ in range(circuits)
+    ]
+    endpoint = {"selector": {"series": family.name, "positions": positions}, "termination": termination}
+    shield = rng.choice(("none", "foil", "braid", "foil_braid"))
+    return {
+        "type": kind,
+        "length_mm": rng.randint(100, 10_000),
+        "tolerance_mm": rng.choice((5, 10, 25, 50, 100)),
+        "environment": {
+            "temp_min_c": rng.choice((-55, -40, -20, 0)),
+            "temp_max_c": rng.choice((70, 85, 105, 125)),
+            "flex_class": rng.choice(("static", "static", "flex", "high_flex")),
+            "chemicals": rng.sample(["oil", "fuel", "coolant", "salt_spray"], rng.randint(0, 2)),
+        },
+        "electrical": {
+            "system_voltage_v": max((circuit["voltage_v"] for circuit in per_circuit), default=None),
+            "per_circuit": per_circuit,
+        },
+        "emi": {"shield": shield, "drain_policy": "isolated" if shield == "none" else rng.choice(("fold_back", "pigtail"))},
+        "locale": rng.choice(LOCALES),
+        "compliance": {"ipc_class": rng.choice(("1", "2", "3")), "ul94_v0_labels": rng.random() < 0.5,
+                       "rohs_reach": rng.random() < 0.9},
+        "endA": endpoint,
+        "endB": dict(endpoint, selector={"series": family.name, "positions": rng.choice(family.positions)}),
+        "constraints": {},
+        "must_use": [],
+        "notes_pack_id": f"pack-{rng.randint(1, 50):02d}",
+    }
+
+
+def assembly(rng: random.Random, catalog: Catalog, index: int, max_wires: int) -> Dict[str, Any]:
+    """One rules-service assembly whose parts come from ``catalog``'s families."""
+    kind = rng.choice(("ribbon", "power_cable", "power_cable", "sensor_lead"))
+    ribbon = kind == "ribbon"
+    termination = "idc" if ribbon else rng.choice(("crimp", "ring_lug"))
+    family = _family(rng, catalog, termination)
+    locale = rng.choice(LOCALES)
+    wires = _wires(rng, max_wires)
+    awg = 28 if ribbon else rng.choice(family.awgs)
+    od_mm = round(1.0 + wires * 0.05, 2) if ribbon else round(rng.uniform(3.0, 25.0), 1)
+    current = 0.15 if ribbon else rng.uniform(1.0, 20.0)
+    voltage = 48 if ribbon else rng.choice((120, 240, 300, 600))
+
+    if ribbon:
+        colors = ["RED"] + ["GREY"] * (wires - 1)
+        circuit_names = [f"SIG{i + 1}" for i in range(wires)]
+    else:
+        line, neutral, earth = AC_COLORS[locale]
+        pattern = [("L", line), ("N", neutral), ("PE", earth)]
+        # A few miswired rows, as in real review queues
+        circuit_names = [pattern[i % 3][0] for i in range(wires)]
+        colors = [pattern[i % 3][1] if rng.random() > 0.02 else "ORANGE" for i in range(wires)]
+    wirelist = [
+        {"circuit": circuit, "conductor": i + 1, "color": color}
+        for i, (circuit, color) in enumerate(zip(circuit_names, colors))
+    ]
+
+    def endpoint(end: str) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "connector": {"mpn": f"{family.name.replace(' ', '-')}-{end}", "positions": rng.choice(family.positions),
+                          "pin1_indicator": rng.random() < 0.95},
+            "termination": termination,
+            "contacts": {"primary": {"mpn": f"CTC-{end}-{awg}", "plating": rng.choice(("tin", "gold-flash"))}},
+            "accessories": [],
+        }
+        if termination == "ring_lug":
+            data["lugs"] = [{"stud": rng.choice(STUD_SIZES)} if rng.random() > 0.05 else {}]
+            data["requires_heat_shrink"] = rng.random() < 0.3
+        return data
+
+    circuits = _circuits(rng, kind)
+    data = {
+        "assembly_id": f"assy-{catalog.seed}-{index:06d}",
+        "cable": {
+            "type": kind,
+            "length_mm": rng.randint(100, 10_000),
+            "od_mm": od_mm,
+            "bend_radius_mm": round(od_mm * rng.uniform(4.0, 12.0), 1),
+            "min_bend_radius_mm": round(od_mm * 6.0, 1),
+            "environment": {"temp_min_c": -40, "temp_max_c": rng.choice((85, 105, 125)), "flex_class": "static",
+                            "chemicals": []},
+            "electrical": {
+                "system_voltage_v": voltage,
+                "per_circuit": [
+                    {"circuit": f"C{i + 1}", "current_a": round(current, 2), "voltage_v": voltage}
+                    for i in range(circuits)
+                ],
+            },
+            "ratings": {"voltage_v": rng.choice((300, 600, 1000)), "temp_c": rng.choice((80, 105, 125))},
+            "emi": {"shield": rng.choice(("none", "foil")), "drain_policy": "isolated"},
+            "locale": locale,
+            "compliance": {"ipc_class": rng.choice(("2", "3")), "ul94_v0_labels": True, "rohs_reach": True},
+        },
+        "conductors": (
+            {"count": wires, "awg": awg, "ribbon": {"ways": wires, "pitch_in": 0.05, "red_stripe": True}}
+            if ribbon else {"count": wires, "awg": awg}
+        ),
+        "endpoints": {"endA": endpoint("A"), "endB": endpoint("B")},
+        "shield": {"type": "none" if ribbon else "foil", "drain_policy": "isolated"},
+        "wirelist": wirelist,
+        "bom": [{"ref": {"mpn": f"{family.name.replace(' ', '-')}-A"}, "qty": 2, "role": "primary"}],
+        "labels": {
+            "title_block": {"pn": f"PN-{index:06d}", "rev": rng.choice("ABC"), "mfr": "ACME", "date": "01/26"},
+            "text": f"PN PN-{index:06d} MFR ACME",
+            "offset_mm": rng.choice((None, 20, 30, 80)),
+        },
+    }
+    data["schema_hash"] = SchemaDigest(data).root
+    return data
+
+
+def step1_population(catalog: Catalog, count: int, seed: int = 0) -> Iterator[AssemblyStep1]:
+    """``count`` Step 1 payloads drawn from ``catalog``; the same for every run with the same seed."""
+    rng = random.Random(f"{seed}:step1")
+    for _ in range(count):
+        yield AssemblyStep1.model_validate(step1_payload(rng, catalog))
+
+
+def assembly_population(catalog: Catalog, count: int, seed: int = 0, max_wires: int = 5_000) -> Iterator[AssemblySchema]:
+    """``count`` rules-service assemblies with 2 to ``max_wires`` wirelist rows and 0 to 200 circuits."""
+    rng = random.Random(f"{seed}:assemblies")
+    for index in range(count):
+        yield AssemblySchema.model_validate(assembly(rng, catalog, index, max_wires))
+
+
+def write_populations(catalog: Catalog, count: int, out_dir: str, seed: int = 0, max_wires: int = 5_000) -> List[str]:
+    """Write both populations as NDJSON files in ``out_dir`` and return their paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, "step1.ndjson"), os.path.join(out_dir, "assemblies.ndjson")]
+    populations = (step1_population(catalog, count, seed), assembly_population(catalog, count, seed, max_wires))
+    for path, population in zip(paths, populations):
+        with open(path, "w", encoding="utf-8") as handle:
+            for model in population:
+                handle.write(json.dumps(model.model_dump(mode="json"), separators=(",", ":")) + "\n")
+    return paths
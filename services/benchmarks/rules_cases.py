@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List
+
+from rules.drc_engine import DRCEngine
+from rules.fixtures import eu_harness, ribbon_assembly
+from rules.models import AssemblySchema
+from rules.report_cache import ReportCache
+
+from .harness import Case
+
+Setup = Callable[[], Callable[[], Any]]
+
+WIRELIST_ROWS = (2, 500, 5_000, 50_000)
+PER_CIRCUIT = (0, 20, 200)
+
+
+def per_circuit(count: int, current_a: float, voltage_v: float) -> List[dict]:
+    return [{"circuit": f"C{i + 1}", "current_a": current_a, "voltage_v": voltage_v} for i in range(count)]
+
+
+def power_assembly(wires: int, circuits: int = 2) -> AssemblySchema:
+    """EU ring-lug power harness: colour findings on a fifth of the rows, one heat-shrink fix."""
+    assembly = eu_harness(wires)
+    assembly.cable["electrical"]["per_circuit"] = per_circuit(circuits, 10.0, 300)
+    assembly.schema_hash = f"bench-power-{wires}-{circuits}"
+    return assembly
+
+
+def ribbon(wires: int, circuits: int = 2) -> AssemblySchema:
+    assembly = ribbon_assembly()
+    colors = ("RED", "GREY")
+    assembly.wirelist = [
+        {"circuit": f"SIG{i + 1}", "conductor": i + 1, "color": colors[i > 0]} for i in range(wires)
+    ]
+    assembly.conductors.update(count=wires, ribbon={**assembly.conductors["ribbon"], "ways": wires})
+    assembly.cable["electrical"]["per_circuit"] = per_circuit(circuits, 0.15, 48)
+    assembly.schema_hash = f"bench-ribbon-{wires}-{circuits}"
+    return assembly
+
+
+def _engine() -> DRCEngine:
+    # Cold runs: a warm report cache would turn every call after the first into a lookup
+    return DRCEngine(report_cache=ReportCache(max_entries=0), executor="serial")
+
+
+def run_drc(build: Callable[..., AssemblySchema], *args: Any) -> Setup:
+    def setup():
+        engine, assembly = _engine(), build(*args)
+        return lambda: engine.run_drc(assembly)
+    return setup
+
+
+def apply_fixes(build: Callable[..., AssemblySchema], *args: Any) -> Setup:
+    def setup():
+        engine, assembly = _engine(), build(*args)
+        fix_ids = [fix.id for fix in engine.run_drc(assembly).fixes]
+        return lambda: engine.apply_fixes(assembly, fix_ids)
+    return setup
+
+
+def cases() -> List[Case]:
+    found = []
+    for wires in WIRELIST_ROWS:
+        found.append(Case(f"rules.run_drc[power/wires={wires}]", run_drc(power_assembly, wires)))
+    for circuits in PER_CIRCUIT:
+        found.append(Case(f"rules.run_drc[power/wires=20/circuits={circuits}]", run_drc(power_assembly, 20, circuits)))
+    for wires, circuits in ((12, 2), (500, 200)):
+        found.append(Case(f"rules.run_drc[ribbon/wires={wires}/circuits={circuits}]", run_drc(ribbon, wires, circuits)))
+    for wires in (2, 5_000, 50_000):
+        found.append(Case(f"rules.apply_fixes[power/wires={wires}]", apply_fixes(power_assembly, wires)))
+    return found
@@ -0,0 +1,56 @@
+from itertools import islice
+
+import pytest
+
+from .catalog import SEED_ROWS, TABLES, Catalog, load_sqlite, snapshot_from_sqlite
+from .populations import assembly_population, step1_population
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return Catalog(2_000, seed=7)
+
+
+def test_catalog_is_deterministic_and_sized(catalog):
+    again = Catalog(2_000, seed=7)
+    other = Catalog(2_000, seed=8)
+
+    for table in TABLES:
+        rows = list(catalog.rows(table))
+        assert rows == list(again.rows(table))
+        assert len(rows) == catalog.counts[table]
+        assert len({row["mpn"] for row in rows}) == len(rows)
+        # The seed data leads every table, so its lookups still resolve
+        assert rows[:len(SEED_ROWS[table])] == SEED_ROWS[table]
+    assert sum(catalog.counts.values()) == 2_000
+    assert list(islice(other.rows("mdm_cables"), 8, 20)) != list(islice(catalog.rows("mdm_cables"), 8, 20))
+
+
+def test_sqlite_stand_in_round_trips_to_snapshot(catalog, tmp_path):
+    path = str(tmp_path / "mdm.db")
+
+    assert load_sqlite(path, catalog) == catalog.counts
+    with pytest.raises(ValueError):
+        load_sqlite(path, catalog)
+    load_sqlite(path, catalog, replace=True)
+
+    loaded, direct = snapshot_from_sqlite(path), catalog.snapshot()
+    assert loaded.counts == direct.counts
+    assert loaded.find_lugs_by("#10", 8)[0]["mpn"] == "TE-320582"
+    family = catalog.families[-1].name
+    assert loaded.find_accessories_by(family, 0.25) == direct.find_accessories_by(family, 0.25)
+    assert loaded.find_ribbon_by(10, 0.05) == direct.find_ribbon_by(10, 0.05)
+    assert loaded.find_contacts_by("Molex Mega-Fit", 14) == direct.find_contacts_by("Molex Mega-Fit", 14)
+
+
+def test_populations_are_valid_and_reproducible(catalog):
+    payloads = list(step1_population(catalog, 30, seed=3))
+    assemblies = list(assembly_population(catalog, 30, seed=3, max_wires=500))
+
+    families = {family.name for family in catalog.families}
+    assert all(payload.endA.selector.series in families for payload in payloads)
+    assert payloads == list(step1_population(catalog, 30, seed=3))
+    assert [a.schema_hash for a in assemblies] == [a.schema_hash for a in assembly_population(catalog, 30, seed=3, max_wires=500)]
+    assert len({a.schema_hash for a in assemblies}) == 30
+    assert all(2 <= len(a.wirelist) <= 500 for a in assemblies)
+    assert all(len(a.cable["electrical"]["per_circuit"]) <= 200 for a in assemblies)
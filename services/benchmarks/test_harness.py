@@ -0,0 +1,85 @@
+import math
+
+from . import __main__ as runner
+from . import harness
+from .harness import Case, Result
+
+
+def result(name="case", ops=1000.0, p50=1.0, p99=2.0, peak=10.0, error=None):
+    return Result(name, 100, ops, p50, p99, peak, error)
+
+
+def test_measure_reports_latency_and_peak_traced_memory():
+    blocks = []
+
+    def setup():
+        return lambda: blocks.append(bytearray(64 * 1024)) or blocks.pop()
+
+    measured = harness.measure(Case("alloc", setup), min_time_s=0.0, min_rounds=20, repeats=3)
+
+    assert measured.error is None and measured.rounds == 20
+    assert measured.p50_ms <= measured.p99_ms
+    assert measured.ops_per_sec > 0
+    assert 64 <= measured.peak_kib < 80
+
+
+def test_measure_records_failing_case():
+    def setup():
+        def call():
+            raise AttributeError("missing")
+        return call
+
+    measured = harness.measure(Case("broken", setup))
+
+    assert measured.error == "AttributeError: missing"
+    assert "broken: AttributeError: missing" in harness.render_results([measured], {})
+
+
+def test_failing_case_without_baseline_fails_the_run(tmp_path, monkeypatch):
+    def setup():
+        def call():
+            raise AttributeError("missing")
+        return call
+    monkeypatch.setattr(runner, "all_cases", lambda: [Case("new-and-broken", setup)])
+    baseline = tmp_path / "baselines.json"
+
+    assert runner.main(["--baseline", str(baseline), "--min-time", "0", "--repeats", "1"]) == 1
+    assert runner.main(["--baseline", str(baseline), "--update"]) == 1
+    assert not baseline.exists()
+
+
+def test_compare_flags_only_regressions_beyond_thresholds():
+    baselines = {"case": {"ops_per_sec": 1000.0, "p50_ms": 1.0, "p99_ms": 2.0, "peak_kib": 10.0}}
+
+    assert harness.compare([result(ops=800.0, p50=1.2, p99=9.0, peak=10.9)], baselines, threshold=0.25) == []
+    # Faster and smaller is never a regression
+    assert harness.compare([result(ops=5000.0, p50=0.1, peak=1.0)], baselines) == []
+
+    regressions = harness.compare([result(ops=700.0, p50=1.5, peak=12.0)], baselines, threshold=0.25)
+
+    assert [(r.metric, round(r.change, 2)) for r in regressions] == [
+        ("ops_per_sec", -0.3), ("p50_ms", 0.5), ("peak_kib", 0.2),
+    ]
+    table = harness.render_regressions(regressions)
+    assert "p50_ms" in table and "+50.0%" in table
+
+
+def test_compare_treats_new_cases_and_failures():
+    baselines = {"case": {"ops_per_sec": 1000.0, "p50_ms": 1.0, "p99_ms": 2.0, "peak_kib": 10.0}}
+
+    assert harness.compare([result(name="new", p50=100.0)], baselines) == []
+
+    failed = harness.compare([result(error="boom")], baselines)
+
+    assert len(failed) == len(harness.GATED_METRICS) and all(math.isnan(r.current) for r in failed)
+
+
+def test_baselines_round_trip_and_keep_unrun_cases(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    harness.save_baselines(path, [result("a"), result("b", error="boom")], {"old": {"p50_ms": 3.0}})
+
+    saved = harness.load_baselines(path)
+
+    assert sorted(saved) == ["a", "old"]
+    assert saved["a"] == {"ops_per_sec": 1000.0, "p50_ms": 1.0, "p99_ms": 2.0, "peak_kib": 10.0}
+    assert harness.load_baselines(str(tmp_path / "missing.json")) == {}
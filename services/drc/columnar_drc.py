@@ -0,0 +1,188 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from models import DrcIssue, DrcResult, SynthesisProposal
+from rule_plan import AwgArray, RulePlan
+from service_common.rule_timing import rule_timer
+
+
+def _column(values: Sequence[Any]) -> np.ndarray:
+    """Float column with NaN for missing values."""
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+def _truthy(column: np.ndarray) -> np.ndarray:
+    # NaN stands for None, so this matches ``bool(value)`` on the source field
+    return ~np.isnan(column) & (column != 0)
+
+
+def _awg_lookup(table: AwgArray, awg: np.ndarray, extract: Callable[[Any], Any] = lambda value: value) -> np.ndarray:
+    """Per-row table value for ``awg``, NaN where the table has no entry."""
+    values = table.values()
+    lut = _column([None if value is None else extract(value) for value in values] + [None])
+    in_range = ~np.isnan(awg) & (awg >= 0) & (awg < len(values))
+    return lut[np.where(in_range, awg, len(values)).astype(np.intp)]
+
+
+def _categories(names: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Integer code per row and the distinct names the codes index."""
+    index: Dict[str, int] = {}
+    codes = np.array([index.setdefault(name, len(index)) for name in names], dtype=np.intp)
+    return codes, list(index)
+
+
+def _per_category(codes: np.ndarray, names: List[str], value: Callable[[str], Any]) -> np.ndarray:
+    return _column([value(name) for name in names])[codes]
+
+
+class ProposalColumns:
+    """Conductor fields of many proposals flattened into NumPy columns.
+
+    Missing numeric fields are NaN; family, environment and locale are integer
+    codes into the distinct values seen in the batch.
+    """
+
+    def __init__(self, proposals: Sequence[SynthesisProposal]):
+        conductors = [proposal.conductors for proposal in proposals]
+        self.size = len(proposals)
+        self.awg = _column([c.awg for c in conductors])
+        self.current_rating = _column([c.current_rating for c in conductors])
+        self.od_mm = _column([c.od_mm for c in conductors])
+        self.voltage_rating = _column([c.voltage_rating for c in conductors])
+        self.temp_rating_c = _column([c.temp_rating_c for c in conductors])
+        self.length_mm = _column([c.length_mm for c in conductors])
+        self.bend_radius_mm = _column([proposal.bend_radius_mm for proposal in proposals])
+        self.family, self.families = _categories([c.family or "standard" for c in conductors])
+        self.environment, self.environments = _categories([p.environment or "indoor" for p in proposals])
+        self.locale, self.locales = _categories([p.locale or "us" for p in proposals])
+        self.has_ac_colors = np.array([bool(c.ac_colors) for c in conductors], dtype=bool)
+        self.has_endpoints = np.array([bool(proposal.endpoints) for proposal in proposals], dtype=bool)
+        self.needs_drain = np.array(
+            [proposal.shield.type != "none" and not proposal.shield.drain_policy for proposal in proposals],
+            dtype=bool,
+        )
+
+
+def candidate_masks(plan: RulePlan, columns: ProposalColumns) -> Dict[str, np.ndarray]:
+    """Per check method, a boolean column of the proposals that check may flag.
+
+    Table-driven rules are evaluated as array ops against ``plan``; a False
+    entry guarantees the check would return no issues for that proposal.
+    Endpoint-level checks are marked for every proposal that has endpoints.
+    Checks without an entry have no column-wise screen.
+    """
+    n = columns.size
+    never = np.zeros(n, dtype=bool)
+    awg = columns.awg
+    has_awg = ~np.isnan(awg)
+    awg_truthy = _truthy(awg)
+    endpoints = columns.has_endpoints
+
+    ampacity_mask = never
+    if plan.ampacity is not None:
+        ampacity = _awg_lookup(plan.ampacity, awg)
+        current = np.nan_to_num(columns.current_rating, nan=0.0)
+        # Endpoint contacts are checked against the AWG as well
+        ampacity_mask = awg_truthy & (np.isnan(ampacity) | (current > ampacity) | endpoints)
+
+    bend_mask = never
+    if plan.bend_multipliers is not None:
+        multiplier = _per_category(columns.family, columns.families, plan.bend_multiplier)
+        min_bend_radius = columns.od_mm * multiplier
+        bend_mask = (_truthy(columns.od_mm) & _truthy(columns.bend_radius_mm)
+                     & (columns.bend_radius_mm < min_bend_radius))
+
+    if plan.voltage_temp is None:
+        electrical_mask = awg_truthy & (awg > 30)
+    else:
+        voltage_limit = _awg_lookup(plan.voltage_temp, awg, lambda limit: limit.voltage_v)
+        temp_limit = _awg_lookup(plan.voltage_temp, awg, lambda limit: limit.temp_c)
+        voltage = np.nan_to_num(columns.voltage_rating, nan=0.0)
+        temp = np.where(_truthy(columns.temp_rating_c), columns.temp_rating_c, 80.0)
+        electrical_mask = awg_truthy & ((voltage > voltage_limit) | (temp > temp_limit))
+
+    locale_mask = never
+    if plan.locale_colors is not None:
+        supported = np.array([locale in plan.locale_colors for locale in columns.locales], dtype=bool)
+        locale_mask = ~supported[columns.locale] | columns.has_ac_colors
+
+    length_mask = never
+    if plan.length_limits is not None:
+        max_length = _per_category(columns.family, columns.families,
+                                   lambda family: getattr(plan.length_limit(family), "max_length_mm", None))
+        warning_length = _per_category(columns.family, columns.families,
+                                       lambda family: getattr(plan.length_limit(family), "warning_length_mm", None))
+        length = columns.length_mm
+        length_mask = (_truthy(length) & ~np.isnan(max_length)
+                       & ((length > max_length) | (length > warning_length)))
+
+    temperature_mask = never
+    if plan.temperature_ranges is not None:
+        min_temp = _per_category(columns.environment, columns.environments,
+                                 lambda env: getattr(plan.temperature_range(env), "min_temp_c", None))
+        max_temp = _per_category(columns.environment, columns.environments,
+                                 lambda env: getattr(plan.temperature_range(env), "max_temp_c", None))
+        temp = columns.temp_rating_c
+        temperature_mask = ~np.isnan(temp) & ((temp < min_temp) | (temp > max_temp))
+
+    voltage_mask = never
+    if plan.voltage_ratings is not None:
+        max_voltage = _awg_lookup(plan.voltage_ratings, awg, lambda limit: limit.max_voltage_v)
+        recommended = _awg_lookup(plan.voltage_ratings, awg, lambda limit: limit.recommended_max_v)
+        voltage = columns.voltage_rating
+        voltage_mask = has_awg & ((voltage > max_voltage) | (voltage > recommended))
+
+    return {
+        "_check_conductor_count": endpoints,
+        "_check_awg_compatibility": ampacity_mask,
+        "_check_bend_radius": bend_mask,
+        "_check_termination_compatibility": endpoints,
+        "_check_electrical_ratings": electrical_mask,
+        "_check_shielding_requirements": columns.needs_drain,
+        "_check_locale_ac_colors": locale_mask,
+        "_check_mdm_requirements": endpoints,
+        "_check_length_limits": length_mask,
+        "_check_temperature_ranges": temperature_mask,
+        "_check_voltage_ratings": voltage_mask,
+    }
+
+
+def validate_columnar(engine: Any, proposals: Sequence[SynthesisProposal]) -> List[DrcResult]:
+    """Validate ``proposals`` with the table-driven rules evaluated column-wise.
+
+    Returns exactly what ``engine.validate_proposal`` would for each proposal.
+    The array pass only decides which (proposal, check) pairs can produce an
+    issue; the engine's own check methods then build the ``DrcIssue``s for
+    those pairs, in ``engine.CHECKS`` order, so messages and ordering are
+    unchanged. A check with no column-wise screen runs wherever its
+    ``applies`` precondition holds, as in ``validate_proposal``.
+
+    With OTEL_DRC_RULE_TIMING on, each check run is timed as in
+    ``validate_proposal``; pairs the screen rules out never run, so they
+    record no timing.
+    """
+    if not proposals:
+        return []
+    screens = candidate_masks(engine.rule_plan, ProposalColumns(proposals))
+    masks = np.vstack([
+        screens[check.method] if check.method in screens
+        else np.fromiter((check.applies(proposal) for proposal in proposals), dtype=bool, count=len(proposals))
+        for check in engine.CHECKS
+    ])
+    checks = [getattr(engine, check.method) for check in engine.CHECKS]
+    timer = rule_timer(engine.ruleset_id, "drc")
+
+    results: List[Optional[DrcResult]] = [None] * len(proposals)
+    for row in np.flatnonzero(masks.any(axis=0)):
+        proposal = proposals[row]
+        issues: List[DrcIssue] = []
+        for check in np.flatnonzero(masks[:, row]):
+            if timer is None:
+                issues.extend(checks[check](proposal))
+            else:
+                issues.extend(timer(engine.CHECKS[check].rule, checks[check], proposal))
+        results[row] = engine.result_for(issues)
+    for row, result in enumerate(results):
+        if result is None:
+            results[row] = engine.result_for([])
+    return results
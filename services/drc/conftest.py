@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# service_common and testkit sit in services/; the images copy only service_common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from drc import DrcEngine  # noqa: E402
+from testkit.drc_fixtures import FakeClock  # noqa: E402
+from testkit.drc_fixtures import snapshot_dao as seeded_dao  # noqa: E402
+from mdm_dao_async import AsyncMDMDAO  # noqa: E402
+
+
+@pytest.fixture
+def snapshot_dao():
+    """MDM DAO serving the seed catalog snapshot, without a database."""
+    return seeded_dao()
+
+
+@pytest.fixture
+def async_dao(snapshot_dao):
+    return AsyncMDMDAO(dsn="postgresql://unused", snapshot_dao=snapshot_dao)
+
+
+@pytest.fixture
+def drc_engine(snapshot_dao, async_dao):
+    return DrcEngine(mdm_dao=snapshot_dao, async_mdm_dao=async_dao)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
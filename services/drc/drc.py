@@ -1,21 +1,74 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, Iterator, List, NamedTuple, Optional, Dict, Any, Sequence, Tuple
+import asyncio
+import copy
 import json
 import os
 from pathlib import Path
 from models import (
     SynthesisProposal, DrcResult, DrcIssue, DrcIssueType, DrcSeverity,
-    ConductorSpec, EndpointFull, TerminationType, RulesManifest
+    ConductorSpec, EndpointFull, TerminationType, RulesManifest, DrcBatchResponse
 )
-from mdm_dao import MDMDAO
+from mdm_dao import MDMDAO, MDMLookupKey, PrefetchedMDM
+from mdm_dao_async import AsyncMDMDAO
+from rule_plan import RulePlan
+from columnar_drc import validate_columnar
+from service_common.env import env_int
+from service_common.rule_timing import rule_timer
+
+
+class RuleCheck(NamedTuple):
+    """One ``DrcEngine`` check method and the precondition under which it runs."""
+    method: str
+    applies: Callable[[SynthesisProposal], bool]
+
+    @property
+    def rule(self) -> str:
+        """Name the check is timed under (OTEL_DRC_RULE_TIMING)."""
+        return self.method.removeprefix("_check_")
+
+
+def _always(proposal: SynthesisProposal) -> bool:
+    return True
+
 
 class DrcEngine:
     """Design Rule Check engine for synthesis validation."""
 
-    def __init__(self, ruleset_id: str = "rs-001"):
+    # The checks of validate_proposal, in order; the columnar batch path runs
+    # the same list. Checks whose inputs are absent are skipped, as they could
+    # not raise an issue.
+    CHECKS = (
+        # Conductor count vs connector positions
+        RuleCheck("_check_conductor_count", lambda p: bool(p.endpoints)),
+        # AWG vs contact compatibility and ampacity
+        RuleCheck("_check_awg_compatibility", lambda p: bool(p.conductors.awg)),
+        RuleCheck("_check_bend_radius", lambda p: bool(p.conductors.od_mm and p.bend_radius_mm)),
+        RuleCheck("_check_termination_compatibility", lambda p: bool(p.endpoints)),
+        RuleCheck("_check_electrical_ratings", lambda p: bool(p.conductors.awg)),
+        # EMI/shielding requirements
+        RuleCheck("_check_shielding_requirements", _always),
+        RuleCheck("_check_locale_ac_colors", _always),
+        # MDM-based requirements (accessories, lugs, contacts)
+        RuleCheck("_check_mdm_requirements", _always),
+        RuleCheck("_check_environmental_compatibility", _always),
+        # Sample deterministic rules
+        RuleCheck("_check_length_limits", lambda p: bool(p.conductors.length_mm)),
+        RuleCheck("_check_temperature_ranges", lambda p: p.conductors.temp_rating_c is not None),
+        RuleCheck("_check_voltage_ratings",
+                  lambda p: p.conductors.awg is not None and p.conductors.voltage_rating is not None),
+    )
+
+    def __init__(self, ruleset_id: str = "rs-001", mdm_dao: Optional[MDMDAO] = None,
+                 async_mdm_dao: Optional[AsyncMDMDAO] = None):
         """Initialize DRC engine with rule tables."""
         self.ruleset_id = ruleset_id
         self.rule_tables = self._load_rule_tables()
-        self.mdm_dao = MDMDAO()
+        # Tables compiled once into pre-resolved lookups for the checks
+        self.rule_plan = RulePlan(self.rule_tables)
+        self.mdm_dao = mdm_dao or MDMDAO()
+        self.async_mdm_dao = async_mdm_dao or AsyncMDMDAO(snapshot_dao=self.mdm_dao)
+        # Batches at least this large are screened column-wise with NumPy
+        self.columnar_min_batch = env_int("DRC_COLUMNAR_MIN_BATCH", 256)
 
     def _load_rule_tables(self) -> Dict[str, Any]:
         """Load JSON rule tables for the specified ruleset."""
@@ -33,44 +86,83 @@ class DrcEngine:
 
         return rule_tables
 
-    def validate_proposal(self, proposal: SynthesisProposal) -> DrcResult:
-        """Validate a synthesis proposal for design rule compliance."""
-
-        issues: List[DrcIssue] = []
-
-        # Check conductor count vs connector positions
-        issues.extend(self._check_conductor_count(proposal))
-
-        # Check AWG vs contact compatibility and ampacity
-        issues.extend(self._check_awg_compatibility(proposal))
-
-        # Check bend radius requirements
-        issues.extend(self._check_bend_radius(proposal))
-
-        # Check termination compatibility
-        issues.extend(self._check_termination_compatibility(proposal))
-
-        # Check electrical ratings
-        issues.extend(self._check_electrical_ratings(proposal))
+    async def validate_proposal_async(self, proposal: SynthesisProposal) -> DrcResult:
+        """Validate a proposal, awaiting MDM lookups instead of blocking on them."""
+        return (await self.prefetched_for_async(proposal)).validate_proposal(proposal)
 
-        # Check EMI/shielding requirements
-        issues.extend(self._check_shielding_requirements(proposal))
-
-        # Check locale AC color requirements
-        issues.extend(self._check_locale_ac_colors(proposal))
+    async def prefetched_for_async(self, proposal: SynthesisProposal) -> "DrcEngine":
+        """Engine reading ``proposal``'s MDM parts from one awaited prefetch."""
+        try:
+            prefetched = await self.async_mdm_dao.prefetch(keys=self._mdm_keys([proposal]))
+        except Exception as e:
+            # Surfaces as the usual mdm_unavailable issue
+            prefetched = PrefetchedMDM(error=e)
+        return self._with_mdm(prefetched)
 
-        # Check MDM-based requirements (accessories, lugs, contacts)
-        issues.extend(self._check_mdm_requirements(proposal))
+    def validate_proposals(self, proposals: Sequence[SynthesisProposal]) -> DrcBatchResponse:
+        """Validate many proposals with one grouped MDM lookup."""
+        keys = self._mdm_keys(proposals)
+        try:
+            prefetched = PrefetchedMDM(parts=dict(zip(keys, self.mdm_dao.find_parts_batch(keys))))
+        except Exception as e:
+            prefetched = PrefetchedMDM(error=e)
+        return self._validate_prefetched(proposals, prefetched)
 
-        # Check environmental compatibility
-        issues.extend(self._check_environmental_compatibility(proposal))
+    async def validate_proposals_async(self, proposals: Sequence[SynthesisProposal]) -> DrcBatchResponse:
+        """``validate_proposals`` with the grouped MDM lookup awaited on the async DAO."""
+        try:
+            prefetched = await self.async_mdm_dao.prefetch(keys=self._mdm_keys(proposals))
+        except Exception as e:
+            prefetched = PrefetchedMDM(error=e)
+        return await asyncio.to_thread(self._validate_prefetched, proposals, prefetched)
 
-        # Sample deterministic rules
-        issues.extend(self._check_length_limits(proposal))
-        issues.extend(self._check_temperature_ranges(proposal))
-        issues.extend(self._check_voltage_ratings(proposal))
+    def _validate_prefetched(self, proposals: Sequence[SynthesisProposal], prefetched: PrefetchedMDM) -> DrcBatchResponse:
+        engine = self._with_mdm(prefetched)
+        if len(proposals) >= self.columnar_min_batch:
+            results = validate_columnar(engine, proposals)
+        else:
+            # The checks are pure Python and hold the GIL, so threads would add overhead without speedup
+            results = [engine.validate_proposal(proposal) for proposal in proposals]
+
+        histogram = {"info": 0, "warning": 0, "error": 0}
+        for result in results:
+            for issue in result.issues:
+                histogram[issue.severity] += 1
+        return DrcBatchResponse(results=results, severity_histogram=histogram)
+
+    def _with_mdm(self, prefetched: PrefetchedMDM) -> "DrcEngine":
+        # The rule checks themselves are CPU-only; run them on a shallow copy
+        # that reads MDM from the prefetched results.
+        engine = copy.copy(self)
+        engine.mdm_dao = prefetched
+        return engine
+
+    def _mdm_keys(self, proposals: Sequence[SynthesisProposal]) -> List[MDMLookupKey]:
+        """Unique MDM lookup keys across ``proposals``."""
+        keys: Dict[MDMLookupKey, None] = {}
+        for proposal in proposals:
+            try:
+                keys.update(dict.fromkeys(self._mdm_checks(proposal)[3]))
+            except Exception:
+                # A malformed proposal reports this from _check_mdm_requirements
+                continue
+        return list(keys)
 
-        # Determine overall result
+    def validate_proposal(self, proposal: SynthesisProposal) -> DrcResult:
+        """Validate a synthesis proposal for design rule compliance."""
+        return self.result_for(list(self.iter_issues(proposal)))
+
+    def iter_issues(self, proposal: SynthesisProposal) -> Iterator[DrcIssue]:
+        """Issues of ``validate_proposal``, in order, yielded as each check produces them."""
+        # Checks are timed one by one when OTEL_DRC_RULE_TIMING is on
+        timer = rule_timer(self.ruleset_id, "drc")
+        for check in self.CHECKS:
+            if check.applies(proposal):
+                method = getattr(self, check.method)
+                yield from method(proposal) if timer is None else timer(check.rule, method, proposal)
+
+    def result_for(self, issues: List[DrcIssue]) -> DrcResult:
+        """Overall result, status and summary of a proposal's issues."""
         has_errors = any(issue.severity == "error" for issue in issues)
         has_warnings = any(issue.severity == "warning" for issue in issues)
 
@@ -118,13 +210,13 @@ class DrcEngine:
             return issues
 
         # Get ampacity data from rule table
-        ampacity_table = self.rule_tables.get("ampacity", {}).get("data", {})
-        if not ampacity_table:
+        ampacity_table = self.rule_plan.ampacity
+        if ampacity_table is None:
             return issues
 
         # Check if AWG exists in ampacity table
-        awg_str = str(awg)
-        if awg_str not in ampacity_table:
+        ampacity = ampacity_table.get(awg)
+        if ampacity is None:
             issues.append(DrcIssue(
                 type="awg_not_supported",
                 severity="error",
@@ -134,7 +226,6 @@ class DrcEngine:
             ))
             return issues
 
-        ampacity = ampacity_table[awg_str]
         current_rating = proposal.conductors.current_rating or 0
 
         # Check if current rating exceeds ampacity
@@ -176,13 +267,11 @@ class DrcEngine:
         issues = []
 
         # Get bend radius data from rule table
-        bend_radius_table = self.rule_tables.get("bend_radius", {}).get("data", {})
-        if not bend_radius_table:
+        if self.rule_plan.bend_multipliers is None:
             return issues
 
         cable_family = proposal.conductors.family or "standard"
-        bend_radius_data = bend_radius_table.get(cable_family, bend_radius_table.get("standard", {"multiplier": 10}))
-        bend_radius_multiplier = bend_radius_data.get("multiplier", 10) if isinstance(bend_radius_data, dict) else bend_radius_data
+        bend_radius_multiplier = self.rule_plan.bend_multiplier(cable_family)
 
         # Calculate minimum bend radius
         if proposal.conductors.od_mm:
@@ -233,8 +322,8 @@ class DrcEngine:
         issues = []
 
         # Get voltage/temp data from rule table
-        voltage_temp_table = self.rule_tables.get("voltage_temp", {}).get("data", {})
-        if not voltage_temp_table:
+        voltage_temp_table = self.rule_plan.voltage_temp
+        if voltage_temp_table is None:
             # Fallback to simple check
             if proposal.conductors.awg and proposal.conductors.awg > 30:
                 issues.append(DrcIssue(
@@ -248,13 +337,11 @@ class DrcEngine:
 
         awg = proposal.conductors.awg
         if awg:
-            awg_str = str(awg)
-            if awg_str in voltage_temp_table:
-                awg_data = voltage_temp_table[awg_str]
-
+            awg_data = voltage_temp_table.get(awg)
+            if awg_data is not None:
                 # Check voltage rating
                 voltage_rating = proposal.conductors.voltage_rating or 0
-                min_voltage = awg_data.get("voltage_v", 300)
+                min_voltage = awg_data.voltage_v
                 if voltage_rating > min_voltage:
                     issues.append(DrcIssue(
                         type="voltage_rating_exceeded",
@@ -266,7 +353,7 @@ class DrcEngine:
 
                 # Check temperature rating
                 temp_rating = proposal.conductors.temp_rating_c or 80
-                max_temp = awg_data.get("temp_c", 80)
+                max_temp = awg_data.temp_c
                 if temp_rating > max_temp:
                     issues.append(DrcIssue(
                         type="temperature_rating_exceeded",
@@ -299,8 +386,8 @@ class DrcEngine:
         issues = []
 
         # Get locale AC colors data from rule table
-        locale_colors_table = self.rule_tables.get("locale_ac_colors", {}).get("data", {})
-        if not locale_colors_table:
+        locale_colors_table = self.rule_plan.locale_colors
+        if locale_colors_table is None:
             return issues
 
         locale = proposal.locale or "us"
@@ -319,7 +406,7 @@ class DrcEngine:
         # Check AC conductor colors if specified
         if proposal.conductors.ac_colors:
             for i, color in enumerate(proposal.conductors.ac_colors):
-                expected_color = locale_colors.get(str(i + 1))  # Colors are 1-indexed in table
+                expected_color = locale_colors[i] if i < len(locale_colors) else None
                 if expected_color and color.lower() != expected_color.lower():
                     issues.append(DrcIssue(
                         type="ac_color_mismatch",
@@ -336,60 +423,39 @@ class DrcEngine:
         issues = []
 
         try:
-            # Check accessory clamp ranges for each endpoint
-            for endpoint_name, endpoint in proposal.endpoints.items():
-                if endpoint.connector and proposal.conductors.od_mm:
-                    cable_od_in = proposal.conductors.od_mm / 25.4  # Convert mm to inches
-                    accessories = self.mdm_dao.find_accessories_by(
-                        endpoint.connector.family,
-                        cable_od_in
-                    )
-
-                    if not accessories:
-                        issues.append(DrcIssue(
-                            type="no_compatible_accessories",
-                            severity="warning",
-                            message=f"No accessories found for {endpoint.connector.family} connector with cable OD {cable_od_in:.3f}\"",
-                            location=f"endpoints.{endpoint_name}.connector",
-                            suggestion="Verify connector family or cable OD specifications"
-                        ))
-
-            # Check lug compatibility for ring lug terminations
-            for endpoint_name, endpoint in proposal.endpoints.items():
-                if endpoint.termination == "ring_lug" and proposal.conductors.awg:
-                    stud_size = getattr(endpoint, 'stud_size', 'M3')  # Default to M3 if not specified
-                    lugs = self.mdm_dao.find_lugs_by(stud_size, proposal.conductors.awg)
-
-                    if not lugs:
-                        issues.append(DrcIssue(
-                            type="no_compatible_lugs",
-                            severity="error",
-                            message=f"No {stud_size} lugs found for AWG {proposal.conductors.awg}",
-                            location=f"endpoints.{endpoint_name}.termination",
-                            suggestion=f"Change stud size or use different AWG wire"
-                        ))
+            # Every endpoint lookup goes out in one batch so MDM is hit once per proposal
+            accessory_checks, lug_checks, contact_checks, keys = self._mdm_checks(proposal)
+            results = self.mdm_dao.find_parts_batch(keys)
 
-            # Check contact plating compatibility
-            for endpoint_name, endpoint in proposal.endpoints.items():
-                if endpoint.contacts and proposal.conductors.awg:
-                    contact_mpn = endpoint.contacts["primary"].mpn
-                    # Extract connector family from contact MPN (simplified)
-                    connector_family = contact_mpn.split("-")[0] if "-" in contact_mpn else contact_mpn
+            for endpoint_name, family, cable_od_in, index in accessory_checks:
+                if not results[index].accessories:
+                    issues.append(DrcIssue(
+                        type="no_compatible_accessories",
+                        severity="warning",
+                        message=f"No accessories found for {family} connector with cable OD {cable_od_in:.3f}\"",
+                        location=f"endpoints.{endpoint_name}.connector",
+                        suggestion="Verify connector family or cable OD specifications"
+                    ))
 
-                    contacts = self.mdm_dao.find_contacts_by(
-                        connector_family,
-                        proposal.conductors.awg,
-                        "tin"  # Prefer tin plating
-                    )
+            for endpoint_name, stud_size, index in lug_checks:
+                if not results[index].lugs:
+                    issues.append(DrcIssue(
+                        type="no_compatible_lugs",
+                        severity="error",
+                        message=f"No {stud_size} lugs found for AWG {proposal.conductors.awg}",
+                        location=f"endpoints.{endpoint_name}.termination",
+                        suggestion=f"Change stud size or use different AWG wire"
+                    ))
 
-                    if not contacts:
-                        issues.append(DrcIssue(
-                            type="no_compatible_contacts",
-                            severity="error",
-                            message=f"No contacts found for {connector_family} family with AWG {proposal.conductors.awg}",
-                            location=f"endpoints.{endpoint_name}.contacts",
-                            suggestion="Verify connector family or change AWG"
-                        ))
+            for endpoint_name, connector_family, index in contact_checks:
+                if not results[index].contacts:
+                    issues.append(DrcIssue(
+                        type="no_compatible_contacts",
+                        severity="error",
+                        message=f"No contacts found for {connector_family} family with AWG {proposal.conductors.awg}",
+                        location=f"endpoints.{endpoint_name}.contacts",
+                        suggestion="Verify connector family or change AWG"
+                    ))
 
         except Exception as e:
             # If MDM is unavailable, log but don't fail DRC
@@ -403,6 +469,42 @@ class DrcEngine:
 
         return issues
 
+    def _mdm_checks(self, proposal: SynthesisProposal) -> Tuple[list, list, list, List[MDMLookupKey]]:
+        """Plan the MDM lookups for accessories, lugs and contacts on each endpoint."""
+        accessory_checks = []
+        lug_checks = []
+        contact_checks = []
+        keys = []
+
+        # Accessory clamp ranges for each endpoint
+        for endpoint_name, endpoint in proposal.endpoints.items():
+            if endpoint.connector and proposal.conductors.od_mm:
+                cable_od_in = proposal.conductors.od_mm / 25.4  # Convert mm to inches
+                accessory_checks.append((endpoint_name, endpoint.connector.family, cable_od_in, len(keys)))
+                keys.append(MDMLookupKey(family=endpoint.connector.family, od=cable_od_in))
+
+        # Lug compatibility for ring lug terminations
+        for endpoint_name, endpoint in proposal.endpoints.items():
+            if endpoint.termination == "ring_lug" and proposal.conductors.awg:
+                stud_size = getattr(endpoint, 'stud_size', 'M3')  # Default to M3 if not specified
+                lug_checks.append((endpoint_name, stud_size, len(keys)))
+                keys.append(MDMLookupKey(stud=stud_size, awg=proposal.conductors.awg))
+
+        # Contact plating compatibility
+        for endpoint_name, endpoint in proposal.endpoints.items():
+            if endpoint.contacts and proposal.conductors.awg:
+                contact_mpn = endpoint.contacts["primary"].mpn
+                # Extract connector family from contact MPN (simplified)
+                connector_family = contact_mpn.split("-")[0] if "-" in contact_mpn else contact_mpn
+                contact_checks.append((endpoint_name, connector_family, len(keys)))
+                keys.append(MDMLookupKey(
+                    family=connector_family,
+                    awg=proposal.conductors.awg,
+                    plating="tin"  # Prefer tin plating
+                ))
+
+        return accessory_checks, lug_checks, contact_checks, keys
+
     def _check_environmental_compatibility(self, proposal: SynthesisProposal) -> List[DrcIssue]:
         """Check environmental compatibility."""
         issues = []
@@ -416,18 +518,16 @@ class DrcEngine:
         issues = []
 
         # Get length limits data from rule table
-        length_limits_table = self.rule_tables.get("length_limits", {}).get("data", {})
-        if not length_limits_table:
+        if self.rule_plan.length_limits is None:
             return issues
 
         cable_type = proposal.conductors.family or "standard"
-        limits = length_limits_table.get(cable_type, length_limits_table.get("standard", {}))
-        
+        limits = self.rule_plan.length_limit(cable_type)
+
         if not limits:
             return issues
 
-        max_length_mm = limits.get("max_length_mm", 1000)
-        warning_length_mm = limits.get("warning_length_mm", 800)
+        max_length_mm, warning_length_mm = limits
 
         if proposal.conductors.length_mm:
             if proposal.conductors.length_mm > max_length_mm:
@@ -454,18 +554,16 @@ class DrcEngine:
         issues = []
 
         # Get temperature ranges data from rule table
-        temp_ranges_table = self.rule_tables.get("temperature_ranges", {}).get("data", {})
-        if not temp_ranges_table:
+        if self.rule_plan.temperature_ranges is None:
             return issues
 
         environment = proposal.environment or "indoor"
-        temp_range = temp_ranges_table.get(environment, temp_ranges_table.get("indoor", {}))
-        
+        temp_range = self.rule_plan.temperature_range(environment)
+
         if not temp_range:
             return issues
 
-        min_temp_c = temp_range.get("min_temp_c", -40)
-        max_temp_c = temp_range.get("max_temp_c", 125)
+        min_temp_c, max_temp_c = temp_range
         temp_rating = proposal.conductors.temp_rating_c
 
         if temp_rating is not None:
@@ -493,23 +591,20 @@ class DrcEngine:
         issues = []
 
         # Get voltage ratings data from rule table
-        voltage_ratings_table = self.rule_tables.get("voltage_ratings", {}).get("data", {})
-        if not voltage_ratings_table:
+        voltage_ratings_table = self.rule_plan.voltage_ratings
+        if voltage_ratings_table is None:
             return issues
 
         awg = proposal.conductors.awg
         if awg is None:
             return issues
 
-        awg_str = str(awg)
-        voltage_data = voltage_ratings_table.get(awg_str, {})
-        
+        voltage_data = voltage_ratings_table.get(awg)
+
         if not voltage_data:
             return issues
 
-        max_voltage_v = voltage_data.get("max_voltage_v", 600)
-        safety_margin_v = voltage_data.get("safety_margin_v", 50)
-        recommended_max_v = max_voltage_v - safety_margin_v
+        max_voltage_v, recommended_max_v = voltage_data
 
         voltage_rating = proposal.conductors.voltage_rating
 
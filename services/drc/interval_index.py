@@ -0,0 +1,78 @@
+from typing import Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Interval = Tuple[float, float, T]
+
+
+class _Node(Generic[T]):
+    __slots__ = ("center", "by_low", "by_high", "left", "right")
+
+    def __init__(self, center: float, overlapping: List[Interval]):
+        self.center = center
+        # Intervals containing `center`, once ascending by low end and once
+        # descending by high end, so a query only walks the ones that match.
+        self.by_low = sorted(overlapping, key=lambda interval: interval[0])
+        self.by_high = sorted(overlapping, key=lambda interval: interval[1], reverse=True)
+        self.left: Optional["_Node[T]"] = None
+        self.right: Optional["_Node[T]"] = None
+
+
+class IntervalIndex(Generic[T]):
+    """Static centred interval tree over closed intervals ``[low, high]``.
+
+    ``stab(point)`` returns every item whose interval contains ``point`` in
+    O(log n + k) time, where k is the number of matches.
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        items = [interval for interval in intervals if interval[0] <= interval[1]]
+        self._size = len(items)
+        self._root = self._build(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stab(self, point: float) -> List[T]:
+        matches: List[T] = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for low, _, item in node.by_low:
+                    if low > point:
+                        break
+                    matches.append(item)
+                node = node.left
+            elif point > node.center:
+                for _, high, item in node.by_high:
+                    if high < point:
+                        break
+                    matches.append(item)
+                node = node.right
+            else:
+                matches.extend(item for _, _, item in node.by_low)
+                break
+        return matches
+
+    @classmethod
+    def _build(cls, intervals: Sequence[Interval]) -> Optional[_Node[T]]:
+        if not intervals:
+            return None
+        endpoints = sorted(value for low, high, _ in intervals for value in (low, high))
+        center = endpoints[len(endpoints) // 2]
+
+        left: List[Interval] = []
+        right: List[Interval] = []
+        overlapping: List[Interval] = []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+
+        node = _Node(center, overlapping)
+        node.left = cls._build(left)
+        node.right = cls._build(right)
+        return node
@@ -1,8 +1,32 @@
-from fastapi import FastAPI, HTTPException
-from typing import Optional
-from models import AssemblyStep1, SynthesisProposal, DrcResult, RulesManifest, DrcRunRequest, DrcRunResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from models import (
+    AssemblyStep1, SynthesisProposal, DrcResult, RulesManifest, DrcRunRequest, DrcRunResponse,
+    SynthesisBatchRequest, SynthesisBatchResult, DrcBatchRequest, DrcBatchResponse
+)
 from synthesis import SynthesisEngine
 from drc import DrcEngine
+from mdm_dao import MDMDAO, close_plan_captures
+from mdm_dao_async import AsyncMDMDAO
+from mdm_trace import slow_queries
+from service_common.framing import encode_events, stream_media_type
+from service_common.rule_timing import rule_timings
+import metrics
+
+# Initialize engines; both share one DAO and therefore one MDM connection pool.
+# The async DAO serves the async handlers so waiting on Postgres does not tie
+# up a threadpool worker; its pool bounds DB concurrency.
+mdm_dao = MDMDAO()
+async_mdm_dao = AsyncMDMDAO(snapshot_dao=mdm_dao)
+synthesis_engine = SynthesisEngine(mdm_dao=mdm_dao, async_mdm_dao=async_mdm_dao)
+drc_engine = DrcEngine(mdm_dao=mdm_dao, async_mdm_dao=async_mdm_dao)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await async_mdm_dao.close()
+    close_plan_captures()
 
 app = FastAPI(
     title="DRC Service",
@@ -10,35 +34,120 @@ app = FastAPI(
     description="Design Rule Check service for cable platform validation",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
+app.add_middleware(metrics.MetricsMiddleware)
+
+@metrics.registry.collector
+def engine_metrics():
+    """Pool, cache and rule-timing figures kept by the DAOs and engines."""
+    pool = mdm_dao.pool_stats()
+    pool["wait_seconds"] = pool.pop("wait_total_s")
+    del pool["wait_avg_s"]
+    yield from metrics.stats_families(
+        "drc_mdm_pool", pool, "Sync MDM connection pool",
+        counters=("acquired", "waits", "timeouts", "created", "recycled", "health_check_failures", "wait_seconds"),
+    )
+    yield from metrics.stats_families("drc_mdm_async_pool", async_mdm_dao.pool_stats(), "Async MDM connection pool",
+                                      counters=("recycled",))
+    yield from metrics.stats_families(
+        "drc_synthesis_cache", synthesis_engine.cache.stats(), "Synthesis result cache",
+        counters=("hits", "misses", "evictions", "expirations"),
+    )
+    yield from metrics.stats_families(
+        "drc_mdm_slow", slow_queries.stats(), "MDM slow-query log",
+        counters=("queries", "plans_captured", "plans_rate_limited", "plan_failures"),
+    )
+    yield from metrics.rule_timing_families(rule_timings.snapshot(), rule_timings.buckets_ms)
 
-# Initialize engines
-synthesis_engine = SynthesisEngine()
-drc_engine = DrcEngine()
 
 @app.get("/health")
 def health():
     return {"status": "ok", "service": "drc"}
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Runtime metrics in the Prometheus text format."""
+    # Async so the threadpool collector reads the limiter from the event loop
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.post("/v1/synthesis/propose", response_model=SynthesisProposal)
-def propose_synthesis(draft_id: str, step1_payload: AssemblyStep1):
+async def propose_synthesis(draft_id: str, step1_payload: AssemblyStep1):
     """Generate synthesis proposal from Step 1 assembly specification."""
     try:
-        proposal = synthesis_engine.propose_synthesis(draft_id, step1_payload)
+        proposal = await synthesis_engine.propose_synthesis_async(draft_id, step1_payload)
         return proposal
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Synthesis failed: {str(e)}")
 
+@app.post("/v1/synthesis/propose:batch")
+async def propose_synthesis_batch(request: SynthesisBatchRequest):
+    """Generate proposals for many Step 1 payloads, streamed as NDJSON in completion order.
+
+    Each line is a SynthesisBatchResult; a failing item carries `error` instead
+    of failing the whole batch.
+    """
+    items = [(item.draft_id, item.step1) for item in request.items]
+
+    async def results():
+        async for index, outcome in synthesis_engine.propose_synthesis_batch(items):
+            if isinstance(outcome, Exception):
+                result = SynthesisBatchResult(
+                    index=index, draft_id=items[index][0], error=f"Synthesis failed: {str(outcome)}"
+                )
+            else:
+                result = SynthesisBatchResult(index=index, draft_id=items[index][0], proposal=outcome)
+            yield result.model_dump_json(exclude_none=True) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.get("/v1/synthesis/cache/stats")
+def synthesis_cache_stats():
+    """Hit/miss and size counters for the synthesis result cache."""
+    return synthesis_engine.cache.stats()
+
+@app.get("/v1/mdm/slow-queries")
+def mdm_slow_queries():
+    """MDM statements slower than MDM_SLOW_QUERY_MS, newest first, with any captured plans."""
+    return {"stats": slow_queries.stats(), "entries": slow_queries.entries()}
+
 @app.post("/v1/drc/preview", response_model=DrcResult)
-def preview_drc(proposal: SynthesisProposal):
-    """Validate synthesis proposal against design rules."""
+async def preview_drc(proposal: SynthesisProposal, request: Request):
+    """Validate synthesis proposal against design rules.
+
+    With `Accept: application/x-ndjson` or `text/event-stream` each issue is
+    sent as an `issue` frame as soon as its check produces it, followed by a
+    `result` frame carrying the overall status and summary.
+    """
+    media_type = stream_media_type(request.headers.get("accept"))
+    if media_type:
+        engine = await drc_engine.prefetched_for_async(proposal)
+
+        def events():
+            issues = []
+            for issue in engine.iter_issues(proposal):
+                issues.append(issue)
+                yield "issue", issue
+            result = engine.result_for(issues)
+            yield "result", {"status": result.status, "summary": result.summary}
+
+        return StreamingResponse(encode_events(events(), media_type, "DRC validation failed"), media_type=media_type)
+
     try:
-        result = drc_engine.validate_proposal(proposal)
+        result = await drc_engine.validate_proposal_async(proposal)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"DRC validation failed: {str(e)}")
 
+@app.post("/v1/drc/preview:batch", response_model=DrcBatchResponse)
+async def preview_drc_batch(request: DrcBatchRequest):
+    """Validate many synthesis proposals with shared MDM lookups."""
+    try:
+        return await drc_engine.validate_proposals_async(request.proposals)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"DRC validation failed: {str(e)}")
+
 # Legacy endpoint for compatibility
 @app.post("/v1/drc/run", response_model=DrcRunResponse)
 def run_drc_legacy(design: DrcRunRequest):
@@ -0,0 +1,260 @@
+import asyncio
+import functools
+import itertools
+import logging
+import re
+import time
+from contextlib import AsyncExitStack
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import asyncpg
+from service_common.env import env_float, env_int
+import mdm_dao
+from mdm_dao import (
+    MDMDAO, MDMLookupKey, MDMLookupResult, MDMQuery, PoolTimeout, PrefetchedMDM,
+    _database_url, _query_key, _resolve_batch_rows,
+)
+from mdm_snapshot import MDMSnapshot
+from mdm_trace import fetch_traced_async
+from metrics import MDM_QUERY_ERRORS, MDM_QUERY_SECONDS
+
+logger = logging.getLogger("drc.mdm")
+
+def _numbered(sql: str) -> str:
+    """Rewrite psycopg2 ``%s`` placeholders as asyncpg's ``$1``, ``$2``, ..."""
+    count = itertools.count(1)
+    return re.sub(r"%s", lambda match: f"${next(count)}", sql)
+
+
+_RIBBON_SQL = _numbered(mdm_dao._RIBBON_SQL)
+_ROUND_CABLE_SQL = _numbered(mdm_dao._ROUND_CABLE_SQL)
+_CONTACTS_SQL = _numbered(mdm_dao._CONTACTS_SQL)
+_CONTACTS_ANY_PLATING_SQL = _numbered(mdm_dao._CONTACTS_ANY_PLATING_SQL)
+_LUGS_SQL = _numbered(mdm_dao._LUGS_SQL)
+_ACCESSORIES_SQL = _numbered(mdm_dao._ACCESSORIES_SQL)
+_CONNECTORS_SQL = _numbered(mdm_dao._CONNECTORS_SQL)
+_CONNECTORS_ANY_POSITIONS_SQL = _numbered(mdm_dao._CONNECTORS_ANY_POSITIONS_SQL)
+_PARTS_BATCH_SQL = _numbered(mdm_dao._PARTS_BATCH_SQL)
+
+
+def _numeric(value: Optional[float]) -> Optional[Decimal]:
+    # asyncpg only encodes NUMERIC from Decimal; go through str so 0.05 stays 0.05
+    return None if value is None else Decimal(str(value))
+
+
+def observed_lookup(lookup: Callable) -> Callable:
+    """``mdm_dao.observed_lookup`` for coroutine lookups."""
+    name = lookup.__name__
+
+    @functools.wraps(lookup)
+    async def observed(self, *args, **kwargs):
+        dao = self.snapshot_dao
+        source = "snapshot" if dao is not None and dao.serving_snapshot else "live"
+        started = time.perf_counter()
+        try:
+            return await lookup(self, *args, **kwargs)
+        except Exception as exc:
+            MDM_QUERY_ERRORS.inc(name, type(exc).__name__)
+            raise
+        finally:
+            MDM_QUERY_SECONDS.observe(time.perf_counter() - started, name, source)
+    return observed
+
+
+class _AgedConnection(asyncpg.Connection):
+    """asyncpg connection that remembers when it was opened."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened_at = time.monotonic()
+
+
+class AsyncMDMDAO:
+    """asyncio counterpart of ``MDMDAO`` backed by an asyncpg pool.
+
+    Exposes the same lookups as coroutines. The pool is created on first use
+    and sized by the same MDM_POOL_* settings as the sync pool; as there, a
+    connection older than MDM_POOL_MAX_LIFETIME_S is closed when it is handed
+    back, and the pool opens a fresh one on demand. Plans of slow statements
+    are captured on a one-connection pool of their own. When ``snapshot_dao``
+    is in snapshot mode, lookups are answered from its in-memory catalog instead.
+    """
+
+    def __init__(self, dsn: Optional[str] = None, snapshot_dao: Optional[MDMDAO] = None,
+                 max_size: Optional[int] = None):
+        self.db_url = dsn or _database_url()
+        self.snapshot_dao = snapshot_dao
+        self.max_size = max_size or env_int("MDM_POOL_MAX_SIZE", 10)
+        self.max_lifetime_s = env_float("MDM_POOL_MAX_LIFETIME_S", 1800.0)
+        self.timeout_s = env_float("MDM_POOL_TIMEOUT_S", 10.0)
+        self._pool: Optional[asyncpg.Pool] = None
+        self._plan_pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+        self._recycled = 0
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    # Connects on its first slow statement, so EXPLAIN ANALYZE never takes a request connection
+                    self._plan_pool = await asyncpg.create_pool(self.db_url, min_size=0, max_size=1)
+                    self._pool = await asyncpg.create_pool(
+                        self.db_url,
+                        min_size=0,
+                        max_size=self.max_size,
+                        connection_class=_AgedConnection,
+                    )
+        return self._pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._plan_pool is not None:
+            await self._plan_pool.close()
+            self._plan_pool = None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Occupancy of the asyncpg pool; zero until the first live lookup opens it."""
+        pool = self._pool
+        size = pool.get_size() if pool is not None else 0
+        idle = pool.get_idle_size() if pool is not None else 0
+        return {"max_size": self.max_size, "size": size, "idle": idle, "in_use": size - idle,
+                "recycled": self._recycled}
+
+    async def _fetch(self, statement: str, sql: str, *args: Any) -> List[asyncpg.Record]:
+        pool = await self._get_pool()
+        async with AsyncExitStack() as stack:
+            # Only the wait for a connection is a pool timeout; the query and the close time out on their own
+            try:
+                conn = await stack.enter_async_context(pool.acquire(timeout=self.timeout_s))
+            except asyncio.TimeoutError:
+                raise PoolTimeout(f"No MDM connection available within {self.timeout_s:.1f}s") from None
+            rows = await fetch_traced_async(conn, statement, sql, *args,
+                                            plan_pool=self._plan_pool, plan_timeout_s=self.timeout_s)
+            if time.monotonic() - conn.opened_at > self.max_lifetime_s:
+                # Closing detaches it from the pool, which reconnects on the next acquire
+                self._recycled += 1
+                await conn.close(timeout=self.timeout_s)
+            return rows
+
+    async def _current_snapshot(self) -> Optional[MDMSnapshot]:
+        dao = self.snapshot_dao
+        if dao is None or not dao.snapshot_mode:
+            return None
+        if dao.snapshot_check_due:
+            # The version probe is blocking; keep it off the event loop.
+            return await asyncio.to_thread(dao.current_snapshot)
+        return dao.current_snapshot()
+
+    @observed_lookup
+    async def find_ribbon_by(self, ways: int, pitch_in: float, temp_min: int = 80, shield: str = "none") -> List[Dict[str, Any]]:
+        """Find ribbon cables by specifications."""
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_ribbon_by(ways, pitch_in, temp_min, shield)
+
+        rows = await self._fetch("find_ribbon_by", _RIBBON_SQL, ways, _numeric(pitch_in), temp_min, shield)
+        return [dict(row) for row in rows]
+
+    @observed_lookup
+    async def find_round_cable_by(self, cond_count: int, awg_range: List[int], voltage_min: int = 300,
+                                  temp_min: int = 80, shield: str = "foil", flex_class: str = "flexible") -> List[Dict[str, Any]]:
+        """Find round shielded cables by specifications."""
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_round_cable_by(cond_count, awg_range, voltage_min, temp_min, shield, flex_class)
+
+        rows = await self._fetch("find_round_cable_by", _ROUND_CABLE_SQL,
+                                 cond_count, list(awg_range), voltage_min, temp_min, shield, flex_class)
+        return [dict(row) for row in rows]
+
+    @observed_lookup
+    async def find_contacts_by(self, connector_family: str, awg: int, plating_pref: str = "tin") -> List[Dict[str, Any]]:
+        """Find contacts by connector family and AWG."""
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_contacts_by(connector_family, awg, plating_pref)
+
+        # First try preferred plating
+        rows = await self._fetch("find_contacts_by", _CONTACTS_SQL, connector_family, awg, plating_pref)
+
+        # If no results, try any plating
+        if not rows:
+            rows = await self._fetch("find_contacts_by.any_plating", _CONTACTS_ANY_PLATING_SQL, connector_family, awg)
+        return [dict(row) for row in rows]
+
+    @observed_lookup
+    async def find_lugs_by(self, stud_size: str, awg: int) -> List[Dict[str, Any]]:
+        """Find ring lugs by stud size and AWG."""
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_lugs_by(stud_size, awg)
+
+        rows = await self._fetch("find_lugs_by", _LUGS_SQL, stud_size, awg)
+        return [dict(row) for row in rows]
+
+    @observed_lookup
+    async def find_accessories_by(self, connector_family: str, cable_od: float) -> List[Dict[str, Any]]:
+        """Find accessories by connector family and cable OD."""
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_accessories_by(connector_family, cable_od)
+
+        rows = await self._fetch("find_accessories_by", _ACCESSORIES_SQL, connector_family, _numeric(cable_od))
+        return [dict(row) for row in rows]
+
+    @observed_lookup
+    async def find_connector_by_family_termination(self, family: str, termination: str, positions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find connectors by family, termination, and optional positions."""
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_connector_by_family_termination(family, termination, positions)
+
+        if positions:
+            rows = await self._fetch("find_connector_by_family_termination", _CONNECTORS_SQL,
+                                     family, termination, positions)
+        else:
+            rows = await self._fetch("find_connector_by_family_termination.any_positions",
+                                     _CONNECTORS_ANY_POSITIONS_SQL, family, termination)
+        return [dict(row) for row in rows]
+
+    @observed_lookup
+    async def find_parts_batch(self, keys: Sequence[MDMLookupKey]) -> List[MDMLookupResult]:
+        """Resolve accessories, lugs and contacts for many keys in one round trip."""
+        if not keys:
+            return []
+        snapshot = await self._current_snapshot()
+        if snapshot is not None:
+            return snapshot.find_parts_batch(keys)
+
+        unique = list(dict.fromkeys(keys))
+        rows = await self._fetch(
+            "find_parts_batch",
+            _PARTS_BATCH_SQL,
+            [key.family for key in unique],
+            [key.awg for key in unique],
+            [_numeric(key.od) for key in unique],
+            [key.stud for key in unique],
+        )
+        return _resolve_batch_rows([(row["kind"], row["part"]) for row in rows], keys)
+
+    async def run(self, query: MDMQuery) -> Any:
+        """Execute a planned ``find_*_by`` lookup."""
+        return await getattr(self, query.method)(*query.args)
+
+    async def prefetch(self, queries: Sequence[MDMQuery] = (),
+                       keys: Sequence[MDMLookupKey] = ()) -> PrefetchedMDM:
+        """Run ``queries`` and a parts batch for ``keys`` concurrently.
+
+        Duplicate queries and keys are looked up once, so a whole batch of
+        proposals can share one prefetch.
+        """
+        queries = list({_query_key(query): query for query in queries}.values())
+        keys = list(dict.fromkeys(keys))
+        *results, parts = await asyncio.gather(
+            *(self.run(query) for query in queries),
+            self.find_parts_batch(keys),
+        )
+        return PrefetchedMDM(list(zip(queries, results)), dict(zip(keys, parts)))
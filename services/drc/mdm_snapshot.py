@@ -0,0 +1,203 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import psycopg2.extras
+from interval_index import IntervalIndex
+
+# Fingerprint of the whole catalog (active and inactive rows), used to decide
+# whether a refresh actually needs to reload anything.
+_CATALOG_VERSION_SQL = """
+    SELECT md5(string_agg(part, '' ORDER BY part)) AS version FROM (
+        SELECT 'cables:' || md5(string_agg(t::text, '' ORDER BY t.id)) AS part FROM mdm_cables t
+        UNION ALL
+        SELECT 'connectors:' || md5(string_agg(t::text, '' ORDER BY t.id)) FROM mdm_connectors t
+        UNION ALL
+        SELECT 'contacts:' || md5(string_agg(t::text, '' ORDER BY t.id)) FROM mdm_contacts t
+        UNION ALL
+        SELECT 'accessories:' || md5(string_agg(t::text, '' ORDER BY t.id)) FROM mdm_accessories t
+    ) parts
+"""
+
+LUG_FAMILY = "TE Ring Lugs"
+
+
+class MDMLookupKey(NamedTuple):
+    """One batched part lookup.
+
+    Accessories resolve when ``family`` and ``od`` (inches) are set, ring lugs
+    when ``stud`` and ``awg`` are set, and contacts when ``family`` and ``awg``
+    are set; fields left as None skip that part type.
+    """
+    family: Optional[str] = None
+    awg: Optional[int] = None
+    od: Optional[float] = None
+    stud: Optional[str] = None
+    plating: str = "tin"
+
+
+class MDMLookupResult(NamedTuple):
+    accessories: List[Dict[str, Any]]
+    lugs: List[Dict[str, Any]]
+    contacts: List[Dict[str, Any]]
+
+
+def _num(value: Any) -> Optional[float]:
+    """Normalise NUMERIC columns (Decimal) so they compare like Postgres does."""
+    return None if value is None else float(value)
+
+
+def _asc_nulls_last(rows: Iterable[Dict[str, Any]], column: str) -> List[Dict[str, Any]]:
+    return sorted(rows, key=lambda row: (row.get(column) is None, _num(row.get(column)) or 0.0, row.get("id") or 0))
+
+
+def _desc_nulls_first(rows: Iterable[Dict[str, Any]], column: str) -> List[Dict[str, Any]]:
+    # Postgres puts NULLs first for DESC ordering; ties keep id order.
+    ordered = sorted(rows, key=lambda row: row.get("id") or 0)
+    ordered.sort(key=lambda row: row.get(column) or "", reverse=True)
+    ordered.sort(key=lambda row: row.get(column) is not None)
+    return ordered
+
+
+class MDMSnapshot:
+    """Immutable in-memory copy of the active MDM catalog with lookup indexes.
+
+    Answers the same queries as ``MDMDAO`` with identical filtering and
+    ordering, so callers can switch between live and snapshot reads freely.
+    """
+
+    VERSION_SQL = _CATALOG_VERSION_SQL
+
+    def __init__(
+        self,
+        cables: List[Dict[str, Any]],
+        connectors: List[Dict[str, Any]],
+        contacts: List[Dict[str, Any]],
+        accessories: List[Dict[str, Any]],
+        version: Optional[str] = None,
+    ):
+        self.version = version
+        self.counts = {
+            "cables": len(cables),
+            "connectors": len(connectors),
+            "contacts": len(contacts),
+            "accessories": len(accessories),
+        }
+
+        ribbons: Dict[Tuple[int, float], List[Dict[str, Any]]] = defaultdict(list)
+        round_cables: Dict[Tuple[int, int], List[Dict[str, Any]]] = defaultdict(list)
+        for cable in cables:
+            if cable.get("type") == "ribbon" and cable.get("pitch_in") is not None:
+                ribbons[(cable["conductor_count"], _num(cable["pitch_in"]))].append(cable)
+            elif cable.get("type") == "round_shielded" and cable.get("conductor_awg") is not None:
+                round_cables[(cable["conductor_count"], cable["conductor_awg"])].append(cable)
+        self._ribbons = {key: _asc_nulls_last(rows, "od_in") for key, rows in ribbons.items()}
+        self._round_cables = dict(round_cables)
+
+        contacts_by_key: Dict[Tuple[str, int], List[Dict[str, Any]]] = defaultdict(list)
+        for contact in contacts:
+            for awg in contact.get("awg_range") or []:
+                contacts_by_key[(contact["connector_family"], awg)].append(contact)
+        self._contacts = {key: _desc_nulls_first(rows, "plating") for key, rows in contacts_by_key.items()}
+
+        lugs: Dict[Tuple[str, int], List[Dict[str, Any]]] = defaultdict(list)
+        by_family_termination: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        for connector in connectors:
+            by_family_termination[(connector["family"], connector.get("termination"))].append(connector)
+            if connector["family"] == LUG_FAMILY and connector.get("stud_size") is not None:
+                for awg in connector.get("compatible_contacts_awg") or []:
+                    lugs[(connector["stud_size"], awg)].append(connector)
+        self._lugs = {key: _asc_nulls_last(rows, "positions") for key, rows in lugs.items()}
+        self._connectors = {
+            key: _asc_nulls_last(rows, "positions") for key, rows in by_family_termination.items()
+        }
+
+        # Per family, an interval tree over each accessory's OD range so a
+        # containment lookup is logarithmic in the size of the family.
+        accessories_by_family: Dict[str, List[Tuple[float, float, Dict[str, Any]]]] = defaultdict(list)
+        for accessory in accessories:
+            od_range = accessory.get("cable_od_range_in") or []
+            if len(od_range) < 2 or od_range[0] is None or od_range[1] is None:
+                continue
+            accessories_by_family[accessory["connector_family"]].append(
+                (_num(od_range[0]), _num(od_range[1]), accessory)
+            )
+        self._accessories: Dict[str, IntervalIndex[Dict[str, Any]]] = {
+            family: IntervalIndex(entries) for family, entries in accessories_by_family.items()
+        }
+
+    @classmethod
+    def load(cls, conn) -> "MDMSnapshot":
+        """Read every active MDM row over ``conn`` and index it."""
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute(cls.VERSION_SQL)
+            version = cur.fetchone()["version"]
+            tables = {}
+            for table in ("mdm_cables", "mdm_connectors", "mdm_contacts", "mdm_accessories"):
+                cur.execute(f"SELECT * FROM {table} WHERE status = 'active' ORDER BY id")
+                tables[table] = [dict(row) for row in cur.fetchall()]
+        return cls(
+            cables=tables["mdm_cables"],
+            connectors=tables["mdm_connectors"],
+            contacts=tables["mdm_contacts"],
+            accessories=tables["mdm_accessories"],
+            version=version,
+        )
+
+    def find_ribbon_by(self, ways: int, pitch_in: float, temp_min: int = 80, shield: str = "none") -> List[Dict[str, Any]]:
+        return [
+            dict(row) for row in self._ribbons.get((ways, float(pitch_in)), [])
+            if row.get("temp_rating_c") is not None and row["temp_rating_c"] >= temp_min
+            and row.get("shield") == shield
+        ]
+
+    def find_round_cable_by(self, cond_count: int, awg_range: List[int], voltage_min: int = 300,
+                            temp_min: int = 80, shield: str = "foil", flex_class: str = "flexible") -> List[Dict[str, Any]]:
+        candidates = []
+        for awg in set(awg_range):
+            candidates.extend(self._round_cables.get((cond_count, awg), []))
+        matches = [
+            row for row in candidates
+            if row.get("voltage_rating_v") is not None and row["voltage_rating_v"] >= voltage_min
+            and row.get("temp_rating_c") is not None and row["temp_rating_c"] >= temp_min
+            and row.get("shield") == shield
+            and row.get("flex_class") == flex_class
+        ]
+        return [dict(row) for row in _asc_nulls_last(matches, "od_in")]
+
+    def find_contacts_by(self, connector_family: str, awg: int, plating_pref: str = "tin") -> List[Dict[str, Any]]:
+        candidates = self._contacts.get((connector_family, awg), [])
+        preferred = [row for row in candidates if row.get("plating") == plating_pref]
+        return [dict(row) for row in (preferred or candidates)]
+
+    def find_lugs_by(self, stud_size: str, awg: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._lugs.get((stud_size, awg), [])]
+
+    def find_accessories_by(self, connector_family: str, cable_od: float) -> List[Dict[str, Any]]:
+        index = self._accessories.get(connector_family)
+        if index is None:
+            return []
+        matches = index.stab(float(cable_od))
+        matches.sort(key=lambda row: (row.get("type") or "", row.get("id") or 0))
+        return [dict(row) for row in matches]
+
+    def find_connector_by_family_termination(self, family: str, termination: str, positions: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self._connectors.get((family, termination), [])
+        if positions:
+            rows = [row for row in rows if row.get("positions") == positions]
+        return [dict(row) for row in rows]
+
+    def find_parts_batch(self, keys: Sequence[MDMLookupKey]) -> List[MDMLookupResult]:
+        """Resolve each key as the matching single ``find_*_by`` calls would."""
+        return [self._resolve(key) for key in keys]
+
+    def _resolve(self, key: MDMLookupKey) -> MDMLookupResult:
+        accessories = []
+        if key.family is not None and key.od is not None:
+            accessories = self.find_accessories_by(key.family, key.od)
+        lugs = []
+        if key.stud is not None and key.awg is not None:
+            lugs = self.find_lugs_by(key.stud, key.awg)
+        contacts = []
+        if key.family is not None and key.awg is not None:
+            contacts = self.find_contacts_by(key.family, key.awg, key.plating)
+        return MDMLookupResult(accessories, lugs, contacts)
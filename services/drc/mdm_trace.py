@@ -0,0 +1,286 @@
+"""Per-statement tracing of MDM queries, with a slow-query log and plan capture.
+
+Every DAO statement runs under an ``mdm.<statement>`` span (when the
+opentelemetry API is importable) carrying its row count and duration. A
+statement slower than ``MDM_SLOW_QUERY_MS`` is logged and kept in
+``slow_queries``; up to ``MDM_EXPLAIN_PER_MINUTE`` of them also get their
+``EXPLAIN (ANALYZE, BUFFERS)`` plan captured. Capturing re-runs the
+statement, so it happens in the background on a connection of its own and
+the plan is attached to the log entry when it arrives.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Set
+
+from service_common.env import env_float, env_int
+from otel import otel_trace
+
+logger = logging.getLogger("drc.mdm")
+
+EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS) "
+
+
+class SlowQuery(NamedTuple):
+    id: int
+    statement: str
+    duration_ms: float
+    rows: int
+    # Bound values can carry customer data, so only their number is kept
+    param_count: int
+    plan: Optional[str]
+    at: float
+
+
+class SlowQueryLog:
+    """Bounded log of slow statements, rate-limiting how many get a captured plan.
+
+    ``threshold_ms <= 0`` turns the log off; ``explain_per_minute = 0`` keeps
+    logging slow statements without capturing plans.
+    """
+
+    def __init__(self, threshold_ms: float = 250.0, max_entries: int = 50, explain_per_minute: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold_ms = threshold_ms
+        self.explain_per_minute = explain_per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Deque[SlowQuery] = deque(maxlen=max(1, max_entries))
+        self._explained_at: Deque[float] = deque()
+        self._next_id = 0
+        self._counters = {"queries": 0, "plans_captured": 0, "plans_rate_limited": 0, "plan_failures": 0}
+
+    @classmethod
+    def from_env(cls) -> "SlowQueryLog":
+        return cls(
+            threshold_ms=env_float("MDM_SLOW_QUERY_MS", 250.0),
+            max_entries=env_int("MDM_SLOW_QUERY_LOG_SIZE", 50),
+            explain_per_minute=env_int("MDM_EXPLAIN_PER_MINUTE", 2),
+        )
+
+    def is_slow(self, duration_ms: float) -> bool:
+        return 0 < self.threshold_ms <= duration_ms
+
+    def allow_explain(self) -> bool:
+        """Take one of this minute's plan captures, if any are left."""
+        now = self._clock()
+        with self._lock:
+            while self._explained_at and now - self._explained_at[0] >= 60.0:
+                self._explained_at.popleft()
+            if len(self._explained_at) >= self.explain_per_minute:
+                self._counters["plans_rate_limited"] += 1
+                return False
+            self._explained_at.append(now)
+            return True
+
+    def record(self, statement: str, duration_ms: float, rows: int, params: Optional[Sequence[Any]]) -> int:
+        """Log a slow statement; returns the id its plan is attached under."""
+        logger.warning("Slow MDM query %s: %.1f ms, %d rows", statement, duration_ms, rows)
+        with self._lock:
+            self._next_id += 1
+            self._entries.append(SlowQuery(
+                self._next_id, statement, round(duration_ms, 3), rows, len(params or ()), None, time.time(),
+            ))
+            self._counters["queries"] += 1
+            return self._next_id
+
+    def attach_plan(self, entry_id: int, plan: str) -> None:
+        """Set the captured plan of entry ``entry_id``, unless it has left the log since."""
+        with self._lock:
+            self._counters["plans_captured"] += 1
+            for index, entry in enumerate(self._entries):
+                if entry.id == entry_id:
+                    self._entries[index] = entry._replace(plan=plan)
+                    return
+
+    def plan_dropped(self) -> None:
+        """A plan capture was allowed but its queue was full."""
+        with self._lock:
+            self._counters["plans_rate_limited"] += 1
+
+    def explain_failed(self, statement: str, exc: Exception) -> None:
+        logger.warning("Could not capture the plan of slow MDM query %s: %s", statement, exc)
+        with self._lock:
+            self._counters["plan_failures"] += 1
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Logged slow statements, newest first."""
+        with self._lock:
+            return [entry._asdict() for entry in reversed(self._entries)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "explain_per_minute": self.explain_per_minute,
+                "size": len(self._entries),
+                "max_entries": self._entries.maxlen,
+                **self._counters,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._explained_at.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+slow_queries = SlowQueryLog.from_env()
+
+
+class _Timing:
+    __slots__ = ("rows", "duration_ms")
+
+    def __init__(self):
+        self.rows = 0
+        self.duration_ms = 0.0
+
+
+@contextmanager
+def query_span(statement: str):
+    """Time one statement; set ``rows`` on the yielded timing before leaving the block."""
+    timing = _Timing()
+    span_context = nullcontext() if otel_trace is None else otel_trace.get_tracer("drc").start_as_current_span(
+        f"mdm.{statement}", attributes={"db.system": "postgresql", "db.operation": statement}
+    )
+    with span_context as span:
+        started = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.duration_ms = (time.perf_counter() - started) * 1000.0
+            if span is not None:
+                span.set_attribute("mdm.rows", timing.rows)
+                span.set_attribute("mdm.duration_ms", timing.duration_ms)
+                span.set_attribute("mdm.slow", slow_queries.is_slow(timing.duration_ms))
+
+
+def _plan_text(rows: Sequence[Any]) -> str:
+    return "\n".join(row["QUERY PLAN"] if isinstance(row, dict) else row[0] for row in rows)
+
+
+class PlanCapture:
+    """Captures plans of slow psycopg2 statements on a background thread.
+
+    Each plan is taken on a connection of ``pool`` (an ``MDMConnectionPool``),
+    never the request's, so the request neither waits for the re-run nor
+    shares a transaction with it. At most ``max_pending`` captures wait; more
+    are dropped. The thread starts with the first capture.
+    """
+
+    def __init__(self, pool, max_pending: int = 4):
+        self.pool = pool
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, log: SlowQueryLog, entry_id: int, statement: str, sql: str,
+               params: Optional[Sequence[Any]]) -> None:
+        try:
+            self._jobs.put_nowait((log, entry_id, statement, sql, params))
+        except queue.Full:
+            log.plan_dropped()
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mdm-plan-capture", daemon=True)
+                self._thread.start()
+
+    def join(self) -> None:
+        """Wait until every submitted capture has finished."""
+        self._jobs.join()
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._jobs.put(None)
+            thread.join()
+        self.pool.close()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                self._capture(*job)
+            finally:
+                self._jobs.task_done()
+
+    def _capture(self, log: SlowQueryLog, entry_id: int, statement: str, sql: str,
+                 params: Optional[Sequence[Any]]) -> None:
+        try:
+            with self.pool.connection() as conn:
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(EXPLAIN + sql, params)
+                        plan = _plan_text(cur.fetchall())
+                finally:
+                    # ANALYZE executed the statement; keep nothing of it
+                    conn.rollback()
+        except Exception as exc:
+            log.explain_failed(statement, exc)
+        else:
+            log.attach_plan(entry_id, plan)
+
+
+# Running async captures, referenced until done so they are not collected mid-flight
+_plan_tasks: Set["asyncio.Task"] = set()
+
+
+async def _capture_async(log: SlowQueryLog, entry_id: int, pool, timeout_s: float, statement: str, sql: str,
+                         args: Sequence[Any]) -> None:
+    try:
+        async with pool.acquire(timeout=timeout_s) as conn:
+            plan = _plan_text(await conn.fetch(EXPLAIN + sql, *args))
+    except Exception as exc:
+        log.explain_failed(statement, exc)
+    else:
+        log.attach_plan(entry_id, plan)
+
+
+def fetch_traced(cur, statement: str, sql: str, params: Optional[Sequence[Any]] = None,
+                 plans: Optional[PlanCapture] = None) -> List[Any]:
+    """``cur.execute(sql, params)`` and ``fetchall()``, traced as ``statement`` (psycopg2).
+
+    A slow statement's plan is queued on ``plans``; without one it is only logged.
+    """
+    with query_span(statement) as timing:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        timing.rows = len(rows)
+    log = slow_queries
+    if log.is_slow(timing.duration_ms):
+        entry_id = log.record(statement, timing.duration_ms, timing.rows, params)
+        if plans is not None and log.allow_explain():
+            plans.submit(log, entry_id, statement, sql, params)
+    return rows
+
+
+async def fetch_traced_async(conn, statement: str, sql: str, *args: Any, plan_pool=None,
+                             plan_timeout_s: float = 10.0) -> List[Any]:
+    """``conn.fetch(sql, *args)``, traced as ``statement`` (asyncpg).
+
+    A slow statement's plan is captured in a background task on a connection
+    of ``plan_pool`` (an asyncpg pool other than the request pool), waiting
+    at most ``plan_timeout_s`` for one; without a pool it is only logged.
+    """
+    with query_span(statement) as timing:
+        rows = await conn.fetch(sql, *args)
+        timing.rows = len(rows)
+    log = slow_queries
+    if log.is_slow(timing.duration_ms):
+        entry_id = log.record(statement, timing.duration_ms, timing.rows, args)
+        if plan_pool is not None and log.allow_explain():
+            task = asyncio.get_running_loop().create_task(
+                _capture_async(log, entry_id, plan_pool, plan_timeout_s, statement, sql, args)
+            )
+            _plan_tasks.add(task)
+            task.add_done_callback(_plan_tasks.discard)
+    return rows
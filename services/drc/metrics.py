@@ -0,0 +1,16 @@
+"""DRC service metrics, on the ``service_common.metrics`` registry served at ``/metrics``.
+
+MDM lookups are recorded as they happen; the text format, request metrics
+and scrape-time collectors come from ``service_common.metrics``, shared with
+the rules service.
+"""
+from service_common.metrics import (  # noqa: F401 (re-exported for main)
+    CONTENT_TYPE, MetricsMiddleware, registry, rule_timing_families, stats_families,
+)
+
+MDM_QUERY_SECONDS = registry.histogram(
+    "drc_mdm_query_duration_seconds", "MDM lookup latency by DAO method and source", ("lookup", "source"),
+)
+MDM_QUERY_ERRORS = registry.counter(
+    "drc_mdm_query_errors_total", "MDM lookups that raised, by DAO method and exception", ("lookup", "error"),
+)
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union, Literal
+from typing import Dict, List, Optional, Union, Literal
 from pydantic import BaseModel, Field
 
 # Basic types
@@ -123,6 +123,20 @@ class SynthesisProposal(BaseModel):
     locale: Optional[str] = None  # Locale for color standards
     environment: Optional[str] = None  # Operating environment (indoor, outdoor, etc.)
 
+# Batch synthesis request item and streamed result
+class SynthesisBatchItem(BaseModel):
+    draft_id: str
+    step1: AssemblyStep1
+
+class SynthesisBatchRequest(BaseModel):
+    items: List[SynthesisBatchItem]
+
+class SynthesisBatchResult(BaseModel):
+    index: int  # Position of the item in the request
+    draft_id: str
+    proposal: Optional[SynthesisProposal] = None
+    error: Optional[str] = None
+
 # DRC preview response
 class DRCPreviewResponse(BaseModel):
     warnings: List[str]
@@ -165,6 +179,14 @@ class DrcResult(BaseModel):
     issues: List[DrcIssue]
     summary: str
 
+# Batch DRC preview
+class DrcBatchRequest(BaseModel):
+    proposals: List[SynthesisProposal]
+
+class DrcBatchResponse(BaseModel):
+    results: List[DrcResult]  # Same order as the request
+    severity_histogram: Dict[DrcSeverity, int]  # Issue counts across all results
+
 # Rules manifest
 class RulesManifest(BaseModel):
     version: str
@@ -0,0 +1,149 @@
+from typing import Any, Dict, Generic, Iterable, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def _table_data(rule_tables: Dict[str, Any], name: str) -> Dict[str, Any]:
+    return rule_tables.get(name, {}).get("data", {})
+
+
+def _awg_key(key: str) -> Optional[int]:
+    """AWG for a table key, or None if ``str(awg)`` could never produce it."""
+    if key.isdigit() and str(int(key)) == key:
+        return int(key)
+    return None
+
+
+class AwgArray(Generic[T]):
+    """Per-AWG values in a list indexed by the AWG number itself."""
+
+    def __init__(self, entries: Iterable[Tuple[int, T]]):
+        entries = list(entries)
+        size = max((awg for awg, _ in entries), default=-1) + 1
+        values: list = [None] * size
+        for awg, value in entries:
+            values[awg] = value
+        self._values = tuple(values)
+
+    def values(self) -> Tuple[Optional[T], ...]:
+        """Values by AWG, None for gaps."""
+        return self._values
+
+    def get(self, awg: int) -> Optional[T]:
+        if 0 <= awg < len(self._values):
+            return self._values[awg]
+        return None
+
+
+class VoltageTempLimit(NamedTuple):
+    voltage_v: Any
+    temp_c: Any
+
+
+class VoltageRatingLimit(NamedTuple):
+    max_voltage_v: Any
+    recommended_max_v: Any
+
+
+class LengthLimit(NamedTuple):
+    max_length_mm: Any
+    warning_length_mm: Any
+
+
+class TemperatureRange(NamedTuple):
+    min_temp_c: Any
+    max_temp_c: Any
+
+
+class RulePlan:
+    """Rule tables compiled once into typed, pre-resolved lookups.
+
+    Every table that is missing or empty compiles to None, which the DRC
+    checks treat exactly like the empty table they used to read. Defaults
+    and family/environment fallbacks are resolved here, so a check does one
+    lookup per table and no string conversion.
+    """
+
+    def __init__(self, rule_tables: Dict[str, Any]):
+        ampacity = _table_data(rule_tables, "ampacity")
+        self.ampacity: Optional[AwgArray[Any]] = AwgArray(
+            (awg, value) for key, value in ampacity.items() if (awg := _awg_key(key)) is not None
+        ) if ampacity else None
+
+        bend_radius = _table_data(rule_tables, "bend_radius")
+        self.bend_multipliers: Optional[Dict[str, Any]] = None
+        self.bend_default_multiplier: Any = None
+        if bend_radius:
+            self.bend_multipliers = {family: self._multiplier(data) for family, data in bend_radius.items()}
+            self.bend_default_multiplier = self._multiplier(bend_radius.get("standard", {"multiplier": 10}))
+
+        voltage_temp = _table_data(rule_tables, "voltage_temp")
+        self.voltage_temp: Optional[AwgArray[VoltageTempLimit]] = AwgArray(
+            (awg, VoltageTempLimit(data.get("voltage_v", 300), data.get("temp_c", 80)))
+            for key, data in voltage_temp.items() if (awg := _awg_key(key)) is not None
+        ) if voltage_temp else None
+
+        locale_colors = _table_data(rule_tables, "locale_ac_colors")
+        self.locale_colors: Optional[Dict[str, Tuple[Optional[str], ...]]] = None
+        if locale_colors:
+            self.locale_colors = {
+                locale: self._positions(colors if isinstance(colors, dict) else {})
+                for locale, colors in locale_colors.items()
+            }
+
+        length_limits = _table_data(rule_tables, "length_limits")
+        self.length_limits: Optional[Dict[str, Optional[LengthLimit]]] = None
+        self.length_default: Optional[LengthLimit] = None
+        if length_limits:
+            self.length_limits = {family: self._length(limits) for family, limits in length_limits.items()}
+            self.length_default = self._length(length_limits.get("standard", {}))
+
+        temperature_ranges = _table_data(rule_tables, "temperature_ranges")
+        self.temperature_ranges: Optional[Dict[str, Optional[TemperatureRange]]] = None
+        self.temperature_default: Optional[TemperatureRange] = None
+        if temperature_ranges:
+            self.temperature_ranges = {env: self._temperature(r) for env, r in temperature_ranges.items()}
+            self.temperature_default = self._temperature(temperature_ranges.get("indoor", {}))
+
+        voltage_ratings = _table_data(rule_tables, "voltage_ratings")
+        self.voltage_ratings: Optional[AwgArray[VoltageRatingLimit]] = None
+        if voltage_ratings:
+            entries = []
+            for key, data in voltage_ratings.items():
+                awg = _awg_key(key)
+                if awg is None or not data:
+                    continue
+                max_voltage_v = data.get("max_voltage_v", 600)
+                entries.append((awg, VoltageRatingLimit(max_voltage_v, max_voltage_v - data.get("safety_margin_v", 50))))
+            self.voltage_ratings = AwgArray(entries)
+
+    @staticmethod
+    def _multiplier(data: Any) -> Any:
+        return data.get("multiplier", 10) if isinstance(data, dict) else data
+
+    @staticmethod
+    def _positions(colors: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+        # Colors are 1-indexed in the table; position i holds conductor i + 1
+        by_position = {position: color for key, color in colors.items() if (position := _awg_key(key))}
+        return tuple(by_position.get(i + 1) for i in range(max(by_position, default=0)))
+
+    @staticmethod
+    def _length(limits: Dict[str, Any]) -> Optional[LengthLimit]:
+        if not limits:
+            return None
+        return LengthLimit(limits.get("max_length_mm", 1000), limits.get("warning_length_mm", 800))
+
+    @staticmethod
+    def _temperature(temp_range: Dict[str, Any]) -> Optional[TemperatureRange]:
+        if not temp_range:
+            return None
+        return TemperatureRange(temp_range.get("min_temp_c", -40), temp_range.get("max_temp_c", 125))
+
+    def bend_multiplier(self, family: str) -> Any:
+        return self.bend_multipliers.get(family, self.bend_default_multiplier)
+
+    def length_limit(self, family: str) -> Optional[LengthLimit]:
+        return self.length_limits.get(family, self.length_default)
+
+    def temperature_range(self, environment: str) -> Optional[TemperatureRange]:
+        return self.temperature_ranges.get(environment, self.temperature_default)
@@ -1,15 +1,116 @@
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple, Union
+import asyncio
+import copy
 from models import (
     AssemblyStep1, SynthesisProposal, PartRef, WirelistRow, BomLine,
     ConductorSpec, EndpointFull, ShieldSpec, TerminationType
 )
-from mdm_dao import MDMDAO
+from mdm_dao import MDMDAO, MDMLookupKey, MDMLookupResult, MDMQuery, PrefetchedMDM
+from mdm_dao_async import AsyncMDMDAO
+from result_cache import ResultCache, canonical_digest
 
 class SynthesisEngine:
     """Deterministic synthesis engine for Step 2 cable assembly proposals."""
 
-    def __init__(self):
-        self.mdm_dao = MDMDAO()
+    def __init__(self, mdm_dao: Optional[MDMDAO] = None, async_mdm_dao: Optional[AsyncMDMDAO] = None,
+                 cache: Optional[ResultCache[SynthesisProposal]] = None):
+        self.mdm_dao = mdm_dao or MDMDAO()
+        self.async_mdm_dao = async_mdm_dao or AsyncMDMDAO(snapshot_dao=self.mdm_dao)
+        # Proposals are deterministic for a given Step 1 payload and catalog
+        # version, so they are cached by content (SYNTHESIS_CACHE_MAX_ENTRIES/_TTL_S).
+        # Only snapshot mode has a catalog version; live-mode proposals are not cached.
+        self.cache = cache if cache is not None else ResultCache.from_env("SYNTHESIS_CACHE")
+
+    async def propose_synthesis_async(self, draft_id: str, step1_payload: Optional[AssemblyStep1] = None) -> SynthesisProposal:
+        """Generate a proposal, awaiting MDM lookups instead of blocking on them."""
+        if not step1_payload:
+            raise ValueError("step1_payload required for synthesis")
+
+        key = self._cache_key(step1_payload)
+        cached = self._cached(key)
+        if cached is not None:
+            return self._for_draft(cached, draft_id, key)
+
+        cable_query = self._cable_query(step1_payload)
+        endpoint_keys = self._endpoint_lookup_keys(step1_payload)
+        prefetched = await self.async_mdm_dao.prefetch(
+            queries=[cable_query] if cable_query else [],
+            keys=[key for key in endpoint_keys.values() if key is not None],
+        )
+
+        # Everything after the lookups is CPU-only; run it on a shallow copy
+        # that reads MDM from the prefetched results.
+        engine = copy.copy(self)
+        engine.mdm_dao = prefetched
+        proposal = engine._synthesize(draft_id, step1_payload, self._proposal_id(draft_id, key))
+        self._remember(key, proposal)
+        return self._for_draft(proposal, draft_id, key)
+
+    async def propose_synthesis_batch(
+        self, items: Sequence[Tuple[str, AssemblyStep1]]
+    ) -> AsyncIterator[Tuple[int, Union[SynthesisProposal, Exception]]]:
+        """Propose for many (draft_id, step1) pairs, yielding (index, proposal or error) as each completes.
+
+        Cached payloads are yielded first. Identical payloads are synthesized
+        once, and the MDM lookups of every remaining item go out as a single
+        deduplicated prefetch before the proposals are built concurrently.
+        """
+        plans: Dict[tuple, Tuple[AssemblyStep1, Optional[MDMQuery], List[MDMLookupKey]]] = {}
+        pending: Dict[tuple, List[Tuple[int, str]]] = {}
+
+        for index, (draft_id, step1) in enumerate(items):
+            try:
+                key = self._cache_key(step1)
+                cached = self._cached(key)
+                if cached is not None:
+                    yield index, self._for_draft(cached, draft_id, key)
+                    continue
+                if key not in plans:
+                    endpoint_keys = self._endpoint_lookup_keys(step1)
+                    plans[key] = (
+                        step1,
+                        self._cable_query(step1),
+                        [lookup for lookup in endpoint_keys.values() if lookup is not None],
+                    )
+            except Exception as e:
+                yield index, e
+                continue
+            pending.setdefault(key, []).append((index, draft_id))
+
+        if not pending:
+            return
+
+        try:
+            prefetched = await self.async_mdm_dao.prefetch(
+                queries=[query for _, query, _ in plans.values() if query is not None],
+                keys=[lookup for _, _, lookups in plans.values() for lookup in lookups],
+            )
+        except Exception as e:
+            # Items that need MDM fail individually; the rest still succeed
+            prefetched = PrefetchedMDM(error=e)
+        engine = copy.copy(self)
+        engine.mdm_dao = prefetched
+
+        async def build(key: tuple) -> Tuple[tuple, Union[SynthesisProposal, Exception]]:
+            step1 = plans[key][0]
+            draft_id = pending[key][0][1]
+            try:
+                # Keep the event loop free while proposals are assembled
+                proposal = await asyncio.to_thread(
+                    engine._synthesize, draft_id, step1, self._proposal_id(draft_id, key)
+                )
+            except Exception as e:
+                return key, e
+            self._remember(key, proposal)
+            return key, proposal
+
+        for completed in asyncio.as_completed([build(key) for key in pending]):
+            key, outcome = await completed
+            for index, draft_id in pending[key]:
+                if isinstance(outcome, Exception):
+                    yield index, outcome
+                else:
+                    yield index, self._for_draft(outcome, draft_id, key)
 
     def propose_synthesis(self, draft_id: str, step1_payload: Optional[AssemblyStep1] = None) -> SynthesisProposal:
         """Generate synthesis proposal from Step 1 assembly specification."""
@@ -18,7 +119,39 @@ class SynthesisEngine:
         if not step1_payload:
             raise ValueError("step1_payload required for synthesis")
 
-        proposal_id = f"prop_{draft_id}_{hash(str(step1_payload)) % 10000}"
+        key = self._cache_key(step1_payload)
+        proposal = self._cached(key)
+        if proposal is None:
+            proposal = self._synthesize(draft_id, step1_payload, self._proposal_id(draft_id, key))
+            self._remember(key, proposal)
+        return self._for_draft(proposal, draft_id, key)
+
+    def _cache_key(self, step1: AssemblyStep1) -> tuple:
+        """Content address of a proposal: canonical payload digest plus catalog version."""
+        return canonical_digest(step1), self.mdm_dao.catalog_version
+
+    def _cached(self, key: tuple) -> Optional[SynthesisProposal]:
+        return self.cache.get(key) if key[1] is not None else None
+
+    def _remember(self, key: tuple, proposal: SynthesisProposal) -> None:
+        # Live reads have no catalog version to key on, so a cached proposal
+        # would never see catalog changes; only snapshot-backed ones are kept.
+        if key[1] is not None:
+            self.cache.put(key, proposal)
+
+    def _proposal_id(self, draft_id: str, key: tuple) -> str:
+        # Derived from the payload digest only, so every replica agrees
+        return f"prop_{draft_id}_{key[0][:12]}"
+
+    def _for_draft(self, proposal: SynthesisProposal, draft_id: str, key: tuple) -> SynthesisProposal:
+        """Copy of a cached proposal addressed to ``draft_id``; callers never share the cached object."""
+        return proposal.model_copy(
+            update={"draft_id": draft_id, "proposal_id": self._proposal_id(draft_id, key)},
+            deep=True
+        )
+
+    def _synthesize(self, draft_id: str, step1_payload: AssemblyStep1, proposal_id: str) -> SynthesisProposal:
+        """Build a proposal from scratch (uncached)."""
 
         # Cable selection
         cable_spec = self._select_cable(step1_payload)
@@ -58,17 +191,36 @@ class SynthesisEngine:
             explain=explain
         )
 
+    def _cable_query(self, step1: AssemblyStep1) -> Optional[MDMQuery]:
+        """MDM lookup used to select the cable, or None for generic cable types."""
+        if step1.type == "ribbon":
+            # Determine pitch from endpoints
+            pitch_in = float(self._determine_ribbon_pitch(step1))
+            ways = self._determine_ways_required(step1)
+            return MDMQuery("find_ribbon_by", (ways, pitch_in, 80, "none"))
+
+        if step1.type in ["power_cable", "custom"]:
+            voltage_min = step1.electrical.system_voltage_v if step1.electrical else 300
+            conductors_needed = self._estimate_conductors_needed(step1)
+
+            # Calculate AWG range based on current requirements
+            awg_range = self._calculate_awg_range(step1)
+            return MDMQuery(
+                "find_round_cable_by", (conductors_needed, awg_range, voltage_min, 80, "foil", "flexible")
+            )
+
+        return None
+
     def _select_cable(self, step1: AssemblyStep1) -> Dict[str, Any]:
         """Select minimal cable family meeting requirements."""
         cable_type = step1.type
+        query = self._cable_query(step1)
 
         if cable_type == "ribbon":
-            # Determine pitch from endpoints
-            pitch_in = float(self._determine_ribbon_pitch(step1))
-            ways = self._determine_ways_required(step1)
+            ways, pitch_in = query.args[:2]
 
             # Query MDM for ribbon cables
-            cables = self.mdm_dao.find_ribbon_by(ways, pitch_in, temp_min=80, shield="none")
+            cables = self.mdm_dao.run(query)
 
             if not cables:
                 # Fallback to generic
@@ -98,16 +250,10 @@ class SynthesisEngine:
 
         elif cable_type in ["power_cable", "custom"]:
             # Power cable selection
-            voltage_min = step1.electrical.system_voltage_v if step1.electrical else 300
-            conductors_needed = self._estimate_conductors_needed(step1)
-
-            # Calculate AWG range based on current requirements
-            awg_range = self._calculate_awg_range(step1)
+            conductors_needed, _, voltage_min = query.args[:3]
 
             # Query MDM for round shielded cables
-            cables = self.mdm_dao.find_round_cable_by(
-                conductors_needed, awg_range, voltage_min, temp_min=80, shield="foil", flex_class="flexible"
-            )
+            cables = self.mdm_dao.run(query)
 
             if not cables:
                 # Fallback
@@ -269,12 +415,34 @@ class SynthesisEngine:
 
     def _specify_endpoints(self, step1: AssemblyStep1) -> Dict[str, Any]:
         """Specify full endpoint configurations."""
-        endA = self._specify_endpoint(step1.endA, step1)
-        endB = self._specify_endpoint(step1.endB, step1)
+        # Resolve both endpoints' MDM parts in a single batch lookup
+        keys = self._endpoint_lookup_keys(step1)
+        wanted = [key for key in keys.values() if key is not None]
+        resolved = dict(zip(wanted, self.mdm_dao.find_parts_batch(wanted))) if wanted else {}
+
+        endA = self._specify_endpoint(step1.endA, step1, resolved.get(keys["endA"]))
+        endB = self._specify_endpoint(step1.endB, step1, resolved.get(keys["endB"]))
 
         return {"endA": endA, "endB": endB}
 
-    def _specify_endpoint(self, endpoint: Any, step1: AssemblyStep1) -> EndpointFull:
+    def _endpoint_lookup_keys(self, step1: AssemblyStep1) -> Dict[str, Optional[MDMLookupKey]]:
+        return {
+            "endA": self._endpoint_lookup_key(step1.endA, step1),
+            "endB": self._endpoint_lookup_key(step1.endB, step1),
+        }
+
+    def _endpoint_lookup_key(self, endpoint: Any, step1: AssemblyStep1) -> Optional[MDMLookupKey]:
+        """MDM parts an endpoint needs, or None when it needs no lookup."""
+        if endpoint.termination == "crimp":
+            return MDMLookupKey(
+                family=self._determine_connector_family(step1),
+                awg=self._calculate_awg(step1),
+                plating="gold_flash" if self._needs_gold_plating(step1) else "tin"
+            )
+        return None
+
+    def _specify_endpoint(self, endpoint: Any, step1: AssemblyStep1,
+                          mdm_parts: Optional[MDMLookupResult] = None) -> EndpointFull:
         """Specify full endpoint with contacts and accessories."""
         # Basic connector selection
         if hasattr(endpoint.selector, 'mpn'):
@@ -291,7 +459,7 @@ class SynthesisEngine:
             )
 
         # Contact selection
-        contacts = self._select_contacts(endpoint.termination, step1)
+        contacts = self._select_contacts(endpoint.termination, step1, mdm_parts)
 
         # Accessories
         accessories = self._select_accessories(connector, step1)
@@ -303,7 +471,8 @@ class SynthesisEngine:
             accessories=accessories
         )
 
-    def _select_contacts(self, termination: TerminationType, step1: AssemblyStep1) -> Optional[Dict[str, Any]]:
+    def _select_contacts(self, termination: TerminationType, step1: AssemblyStep1,
+                         mdm_parts: Optional[MDMLookupResult] = None) -> Optional[Dict[str, Any]]:
         """Select appropriate contacts."""
         if termination == "crimp":
             awg = self._calculate_awg(step1)
@@ -312,8 +481,11 @@ class SynthesisEngine:
             # Determine connector family from endpoints
             connector_family = self._determine_connector_family(step1)
 
-            # Query MDM for contacts
-            contacts = self.mdm_dao.find_contacts_by(connector_family, awg, plating_pref)
+            # Query MDM for contacts unless the batch lookup already did
+            if mdm_parts is not None:
+                contacts = mdm_parts.contacts
+            else:
+                contacts = self.mdm_dao.find_contacts_by(connector_family, awg, plating_pref)
 
             if not contacts:
                 # Fallback
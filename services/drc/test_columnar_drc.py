@@ -0,0 +1,89 @@
+import itertools
+
+import pytest
+from columnar_drc import validate_columnar
+from drc import DrcEngine
+from testkit.drc_fixtures import ring_lug_proposal
+from models import ConductorSpec, DrcIssue, ShieldSpec, SynthesisProposal
+
+
+def conductor_proposal(**conductors) -> SynthesisProposal:
+    extra = {key: conductors.pop(key) for key in ("bend_radius_mm", "locale", "environment") if key in conductors}
+    return SynthesisProposal(
+        proposal_id="prop-1", draft_id="draft-1", cable={},
+        conductors=ConductorSpec(**conductors), endpoints={},
+        shield=ShieldSpec(type="none", drain_policy="isolated"),
+        wirelist=[], bom=[], warnings=[], errors=[], explain=[], **extra,
+    )
+
+
+class TestColumnarDrc:
+    """Test column-wise batch validation matches per-proposal validation."""
+
+    @pytest.fixture
+    def engine(self, snapshot_dao):
+        return DrcEngine(mdm_dao=snapshot_dao)
+
+    def proposals(self):
+        grid = itertools.product(
+            [None, 0, 14, 18, 26, 31],       # awg
+            [None, 5, 30.5],                 # current_rating
+            [None, 300, 700],                # voltage_rating
+            [None, -60, 80, 150],            # temp_rating_c
+            [None, 900, 12000],              # length_mm
+        )
+        proposals = []
+        for i, (awg, current, voltage, temp, length) in enumerate(grid):
+            proposals.append(conductor_proposal(
+                awg=awg, current_rating=current, voltage_rating=voltage, temp_rating_c=temp, length_mm=length,
+                od_mm=[None, 2.5, 6.0][i % 3], bend_radius_mm=[None, 10.0, 100.0][i % 3],
+                family=[None, "ribbon", "round"][i % 3], ac_colors=[None, ["brown", "blue"]][i % 2],
+                locale=[None, "eu", "xx"][i % 3], environment=[None, "outdoor"][i % 2],
+            ))
+        return proposals + [ring_lug_proposal()]
+
+    def test_matches_validate_proposal(self, engine):
+        proposals = self.proposals()
+
+        results = validate_columnar(engine, proposals)
+
+        assert results == [engine.validate_proposal(proposal) for proposal in proposals]
+        assert {result.status for result in results} == {"pass", "warning", "error"}
+
+    def test_every_engine_check_runs_on_both_paths(self, engine, monkeypatch):
+        # Unscreened checks, such as the environmental one, must still run column-wise
+        def environmental(proposal):
+            return [DrcIssue(type="environmental_compatibility", severity="warning", message=proposal.environment,
+                             location="proposal")] if proposal.environment else []
+        monkeypatch.setattr(engine, "_check_environmental_compatibility", environmental)
+        proposals = self.proposals()
+
+        results = validate_columnar(engine, proposals)
+
+        assert results == [engine.validate_proposal(proposal) for proposal in proposals]
+        assert any(issue.message == "outdoor" for result in results for issue in result.issues)
+
+    def test_passing_rows_skip_the_checks(self, engine, monkeypatch):
+        def unexpected(proposal):
+            raise AssertionError("check should have been screened out")
+        for name in ("_check_awg_compatibility", "_check_bend_radius", "_check_electrical_ratings",
+                     "_check_length_limits", "_check_voltage_ratings"):
+            monkeypatch.setattr(engine, name, unexpected)
+
+        results = validate_columnar(engine, [conductor_proposal(awg=18, current_rating=5, voltage_rating=100)] * 3)
+
+        assert [result.status for result in results] == ["pass"] * 3
+
+    def test_large_batches_use_columnar_path(self, engine, monkeypatch):
+        import drc
+        calls = []
+        monkeypatch.setattr(drc, "validate_columnar", lambda e, p: calls.append(len(p)) or validate_columnar(e, p))
+        engine.columnar_min_batch = 4
+        proposals = self.proposals()[:4]
+
+        batch = engine.validate_proposals(proposals)
+
+        assert calls == [4]
+        assert batch.results == [engine.validate_proposal(proposal) for proposal in proposals]
+        assert engine.validate_proposals(proposals[:3]).results == batch.results[:3]
+        assert calls == [4]
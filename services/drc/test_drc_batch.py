@@ -0,0 +1,123 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from drc import DrcEngine
+from testkit.drc_fixtures import ring_lug_proposal
+
+
+class TestDrcBatch:
+    """Test batch DRC preview shares MDM lookups and aggregates severities."""
+
+    def proposals(self):
+        fine = ring_lug_proposal()
+        fine.conductors.awg = 14
+        return [ring_lug_proposal(), fine, ring_lug_proposal()]
+
+    def test_batch_matches_single_validation(self, drc_engine, monkeypatch):
+        calls = []
+        find_parts_batch = drc_engine.mdm_dao.find_parts_batch
+        monkeypatch.setattr(drc_engine.mdm_dao, "find_parts_batch", lambda keys: calls.append(keys) or find_parts_batch(keys))
+        proposals = self.proposals()
+
+        batch = drc_engine.validate_proposals(proposals)
+
+        assert len(calls) == 1
+        assert len(calls[0]) == len(set(calls[0]))
+        assert batch.results == [drc_engine.validate_proposal(proposal) for proposal in proposals]
+        expected = {"info": 0, "warning": 0, "error": 0}
+        for result in batch.results:
+            for issue in result.issues:
+                expected[issue.severity] += 1
+        assert batch.severity_histogram == expected
+        assert expected["error"] > 0
+
+    def test_mdm_failure_is_reported_per_proposal(self, drc_engine, monkeypatch):
+        def unavailable(keys):
+            raise RuntimeError("connection refused")
+        monkeypatch.setattr(drc_engine.mdm_dao, "find_parts_batch", unavailable)
+
+        batch = drc_engine.validate_proposals(self.proposals())
+
+        assert all(any(issue.type == "mdm_unavailable" for issue in r.issues) for r in batch.results)
+        assert batch.severity_histogram["info"] >= 3
+
+    def test_batch_endpoint(self, drc_engine, monkeypatch):
+        import main
+        monkeypatch.setattr(main, "drc_engine", drc_engine)
+        # Proposal.endpoints is an untyped dict, so endpoints don't survive JSON
+        proposals = self.proposals()
+        for proposal in proposals:
+            proposal.endpoints = {}
+
+        response = TestClient(main.app).post(
+            "/v1/drc/preview:batch",
+            json={"proposals": [proposal.model_dump(mode="json") for proposal in proposals]},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["results"]) == 3
+        assert body == drc_engine.validate_proposals(proposals).model_dump(mode="json")
+
+    def test_mdm_checks_use_one_batch_lookup(self, snapshot_dao, monkeypatch):
+        calls = []
+        find_parts_batch = snapshot_dao.find_parts_batch
+        monkeypatch.setattr(snapshot_dao, "find_parts_batch", lambda keys: calls.append(keys) or find_parts_batch(keys))
+
+        issues = DrcEngine(mdm_dao=snapshot_dao)._check_mdm_requirements(ring_lug_proposal())
+
+        assert len(calls) == 1 and len(calls[0]) == 6
+        assert [issue.type for issue in issues] == ["no_compatible_lugs"] * 2 + ["no_compatible_contacts"] * 2
+
+
+class TestDrcPreviewStreaming:
+    """Test /v1/drc/preview streams issues when asked to."""
+
+    @pytest.fixture
+    def client(self, drc_engine, monkeypatch):
+        import main
+        monkeypatch.setattr(main, "drc_engine", drc_engine)
+        return TestClient(main.app), drc_engine
+
+    def proposal(self):
+        proposal = ring_lug_proposal()
+        proposal.endpoints = {}
+        proposal.conductors.temp_rating_c = -100
+        return proposal
+
+    def test_ndjson_frames_match_json_result(self, client):
+        client, engine = client
+        body = self.proposal().model_dump(mode="json")
+        expected = client.post("/v1/drc/preview", json=body).json()
+
+        response = client.post("/v1/drc/preview", json=body, headers={"Accept": "application/x-ndjson"})
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [f["data"] for f in frames if f["event"] == "issue"] == expected["issues"]
+        assert expected["issues"]
+        assert frames[-1] == {"event": "result", "data": {"status": expected["status"], "summary": expected["summary"]}}
+
+    def test_sse_frames(self, client):
+        client, engine = client
+        body = self.proposal().model_dump(mode="json")
+
+        response = client.post("/v1/drc/preview", json=body, headers={"Accept": "text/event-stream"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = [block.split("\n") for block in response.text.strip().split("\n\n")]
+        assert all(lines[0].startswith("event: ") and lines[1].startswith("data: ") for lines in blocks)
+        assert blocks[-1][0] == "event: result"
+
+    def test_failure_mid_stream_ends_with_an_error_frame(self, client, monkeypatch):
+        client, engine = client
+
+        def broken(proposal):
+            raise RuntimeError("rule table missing")
+        monkeypatch.setattr(engine, "_check_temperature_ranges", broken)
+        body = self.proposal().model_dump(mode="json")
+
+        response = client.post("/v1/drc/preview", json=body, headers={"Accept": "application/x-ndjson"})
+
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert frames[-1] == {"event": "error", "data": {"detail": "DRC validation failed: rule table missing"}}
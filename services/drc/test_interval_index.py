@@ -0,0 +1,32 @@
+import random
+
+from interval_index import IntervalIndex
+
+
+class TestIntervalIndex:
+    """Test interval tree stabbing queries against a brute-force scan."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        intervals = []
+        for item in range(2000):
+            low = round(rng.uniform(0.0, 1.0), 3)
+            intervals.append((low, round(low + rng.uniform(0.0, 0.3), 3), item))
+        index = IntervalIndex(intervals)
+
+        for point in [rng.uniform(-0.1, 1.4) for _ in range(200)] + [0.0, 0.5, 1.0]:
+            expected = sorted(item for low, high, item in intervals if low <= point <= high)
+            assert sorted(index.stab(point)) == expected
+
+    def test_bounds_are_inclusive(self):
+        index = IntervalIndex([(0.15, 0.30, "a"), (0.25, 0.45, "b")])
+        assert sorted(index.stab(0.15)) == ["a"]
+        assert sorted(index.stab(0.30)) == ["a", "b"]
+        assert sorted(index.stab(0.45)) == ["b"]
+        assert index.stab(0.46) == []
+
+    def test_empty_and_inverted_intervals(self):
+        assert IntervalIndex([]).stab(1.0) == []
+        index = IntervalIndex([(0.5, 0.1, "inverted"), (0.1, 0.1, "point")])
+        assert len(index) == 1
+        assert index.stab(0.1) == ["point"]
@@ -1,5 +1,124 @@
+import json
+import threading
+import time
 import pytest
-from mdm_dao import MDMDAO
+from testkit.drc_fixtures import FakeConnection
+from mdm_dao import MDMDAO, MDMConnectionPool, MDMLookupKey, PoolTimeout
+
+
+class TestMDMConnectionPool:
+    """Test pooled MDM connection reuse, bounds and recycling."""
+
+    @pytest.fixture
+    def opened(self):
+        return []
+
+    @pytest.fixture
+    def make_pool(self, opened):
+        def factory(**kwargs):
+            def connect(dsn):
+                conn = FakeConnection()
+                opened.append(conn)
+                return conn
+            return MDMConnectionPool("postgresql://test", connect=connect, **kwargs)
+        return factory
+
+    def test_connections_are_reused(self, make_pool, opened):
+        pool = make_pool(max_size=2)
+        for _ in range(5):
+            with pool.connection():
+                pass
+        assert len(opened) == 1
+        stats = pool.stats()
+        assert stats["acquired"] == 5
+        assert stats["created"] == 1
+        assert stats["idle"] == 1 and stats["in_use"] == 0
+
+    def test_pool_is_bounded_and_times_out(self, make_pool):
+        pool = make_pool(max_size=1, timeout_s=0.05)
+        conn = pool.acquire()
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+        pool.release(conn)
+        assert pool.stats()["timeouts"] == 1
+
+    def test_waiter_receives_released_connection(self, make_pool, opened):
+        pool = make_pool(max_size=1, timeout_s=2.0)
+        conn = pool.acquire()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        pool.release(conn)
+        waiter.join(timeout=2.0)
+        assert got == [conn]
+        assert pool.stats()["waits"] == 1
+        assert len(opened) == 1
+
+    def test_expired_connections_are_recycled(self, make_pool, opened):
+        pool = make_pool(max_size=1, max_lifetime_s=0.0)
+        with pool.connection():
+            pass
+        with pool.connection():
+            pass
+        assert len(opened) == 2
+        assert opened[0].closed
+        assert pool.stats()["recycled"] >= 1
+
+    def test_idle_connection_failing_health_check_is_replaced(self, make_pool, opened):
+        pool = make_pool(max_size=1, health_check_idle_s=0.0)
+        with pool.connection():
+            pass
+        opened[0].broken = True
+        with pool.connection() as conn:
+            assert conn is opened[1]
+        assert pool.stats()["health_check_failures"] == 1
+
+    def test_closed_connection_is_not_returned_to_pool(self, make_pool, opened):
+        pool = make_pool(max_size=1)
+        with pool.connection() as conn:
+            conn.close()
+        assert pool.stats()["size"] == 0
+        with pool.connection() as conn:
+            assert conn is opened[1]
+
+class TestMDMPartsBatch:
+    """Test batched part lookups resolve in a single round trip."""
+
+    def test_batch_is_one_query_and_resolves_per_key(self):
+        conn = FakeConnection()
+        conn.rows = [
+            ("accessory", json.dumps({"id": 1, "mpn": "3M-3420-0001", "connector_family": "3M IDC",
+                                      "type": "strain_relief", "cable_od_range_in": [0.15, 0.30]})),
+            ("lug", json.dumps({"id": 2, "mpn": "TE-320582", "family": "TE Ring Lugs", "positions": 1,
+                                "stud_size": "#10", "compatible_contacts_awg": [8, 10]})),
+            ("contact", json.dumps({"id": 1, "mpn": "MOLEX-76650-0001", "connector_family": "Molex Mega-Fit",
+                                    "awg_range": [12, 14], "plating": "tin"})),
+        ]
+        pool = MDMConnectionPool("postgresql://test", connect=lambda dsn: conn)
+        dao = MDMDAO(pool=pool, snapshot_mode=False)
+
+        keys = [
+            MDMLookupKey(family="3M IDC", od=0.25),
+            MDMLookupKey(stud="#10", awg=8),
+            MDMLookupKey(family="Molex Mega-Fit", awg=14, plating="gold"),
+            MDMLookupKey(stud="#10", awg=8),
+        ]
+        results = dao.find_parts_batch(keys)
+
+        assert len(conn.executed) == 1
+        assert [a["mpn"] for a in results[0].accessories] == ["3M-3420-0001"]
+        assert results[0].lugs == [] and results[0].contacts == []
+        assert [lug["mpn"] for lug in results[1].lugs] == ["TE-320582"]
+        # No gold contact available, so the tin one is the fallback
+        assert [c["mpn"] for c in results[2].contacts] == ["MOLEX-76650-0001"]
+        assert results[3] == results[1]
+
+    def test_empty_batch_skips_the_database(self):
+        dao = MDMDAO(pool=MDMConnectionPool("postgresql://unused"), snapshot_mode=False)
+        assert dao.find_parts_batch([]) == []
+        assert dao.pool_stats()["acquired"] == 0
+
 
 class TestMDMDAO:
     """Test MDM DAO queries."""
@@ -70,4 +189,16 @@ class TestMDMDAO:
         connector = results[0]
         assert connector['family'] == '3M IDC'
         assert connector['termination'] == 'idc'
-        assert connector['positions'] == 10
\ No newline at end of file
+        assert connector['positions'] == 10
+
+    def test_find_parts_batch_matches_single_lookups(self, dao):
+        """Test batched lookups agree with the per-part queries."""
+        keys = [
+            MDMLookupKey(family="3M IDC", od=0.25),
+            MDMLookupKey(stud="#10", awg=8),
+            MDMLookupKey(family="Molex Mega-Fit", awg=14),
+        ]
+        accessories, lugs, contacts = dao.find_parts_batch(keys)
+        assert [a['mpn'] for a in accessories.accessories] == [a['mpn'] for a in dao.find_accessories_by("3M IDC", 0.25)]
+        assert [l['mpn'] for l in lugs.lugs] == [l['mpn'] for l in dao.find_lugs_by("#10", 8)]
+        assert [c['mpn'] for c in contacts.contacts] == [c['mpn'] for c in dao.find_contacts_by("Molex Mega-Fit", 14)]
@@ -0,0 +1,139 @@
+import asyncio
+import copy
+from contextlib import asynccontextmanager
+
+import pytest
+import mdm_dao
+import mdm_dao_async
+from drc import DrcEngine
+from testkit.drc_fixtures import ring_lug_proposal
+from mdm_dao import MDMLookupKey, MDMQuery, PoolTimeout, PrefetchedMDM
+from mdm_dao_async import AsyncMDMDAO
+from models import AssemblyStep1, EMI, Electrical, Endpoint, EndpointSelectorSeries, Environment
+from synthesis import SynthesisEngine
+
+
+class TestAsyncMDMDAO:
+    """Test the asyncio DAO and the prefetch path used by the async endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_lookups_served_from_snapshot_without_pool(self, async_dao):
+        assert (await async_dao.find_lugs_by("#10", 8))[0]["mpn"] == "TE-320582"
+        ribbons = await async_dao.find_ribbon_by(10, 0.05)
+        assert [cable["mpn"] for cable in ribbons] == ["3M-3365-10-300", "3M-3302-10-300"]
+        assert async_dao._pool is None
+
+    @pytest.mark.asyncio
+    async def test_prefetch_replays_planned_lookups(self, async_dao):
+        query = MDMQuery("find_round_cable_by", (2, [14, 22], 300, 80, "foil", "flexible"))
+        key = MDMLookupKey(family="JST PH", awg=26, od=0.1)
+        prefetched = await async_dao.prefetch(queries=[query], keys=[key])
+
+        assert prefetched.run(query) == await async_dao.run(query)
+        assert prefetched.find_parts_batch([key]) == await async_dao.find_parts_batch([key])
+        with pytest.raises(LookupError):
+            prefetched.run(MDMQuery("find_lugs_by", ("#10", 8)))
+
+    def test_statements_are_the_sync_sql_renumbered(self):
+        assert mdm_dao_async._LUGS_SQL == mdm_dao._LUGS_SQL.replace("%s", "$1", 1).replace("%s", "$2", 1)
+        assert "%s" not in mdm_dao_async._PARTS_BATCH_SQL and "$4::text[]" in mdm_dao_async._PARTS_BATCH_SQL
+
+    @pytest.mark.asyncio
+    async def test_connections_past_max_lifetime_are_closed_on_release(self, monkeypatch):
+        class Connection:
+            def __init__(self, opened_at, close_error=None):
+                self.opened_at = opened_at
+                self.closed = False
+                self.close_error = close_error
+
+            async def fetch(self, sql, *args):
+                return [{"mpn": "TE-320582"}]
+
+            async def close(self, timeout=None):
+                if self.close_error is not None:
+                    raise self.close_error
+                self.closed = True
+
+        class Pool:
+            def __init__(self, conn):
+                self.conn = conn
+
+            @asynccontextmanager
+            async def acquire(self, timeout=None):
+                yield self.conn
+
+            def get_size(self):
+                return 1
+
+            def get_idle_size(self):
+                return 1
+
+        dao = AsyncMDMDAO(dsn="postgresql://unused")
+        dao.max_lifetime_s = 60.0
+        monkeypatch.setattr(mdm_dao_async.time, "monotonic", lambda: 1000.0)
+
+        fresh = dao._pool = Pool(Connection(opened_at=990.0))
+        assert await dao.find_lugs_by("#10", 8) == [{"mpn": "TE-320582"}]
+        assert not fresh.conn.closed
+
+        old = dao._pool = Pool(Connection(opened_at=900.0))
+        await dao.find_lugs_by("#10", 8)
+        assert old.conn.closed
+        assert dao.pool_stats()["recycled"] == 1
+
+        # A close that times out is not reported as waiting for the pool
+        dao._pool = Pool(Connection(opened_at=900.0, close_error=asyncio.TimeoutError()))
+        with pytest.raises(asyncio.TimeoutError) as raised:
+            await dao.find_lugs_by("#10", 8)
+        assert not isinstance(raised.value, PoolTimeout)
+
+    def test_prefetch_error_is_raised_on_lookup(self):
+        prefetched = PrefetchedMDM(error=RuntimeError("connection refused"))
+        with pytest.raises(RuntimeError):
+            prefetched.find_parts_batch([MDMLookupKey(stud="M3", awg=14)])
+        # An empty batch needs no lookup, so it cannot fail
+        assert prefetched.find_parts_batch([]) == []
+
+    @pytest.mark.asyncio
+    async def test_validate_proposal_async_matches_sync(self, snapshot_dao, async_dao):
+        engine = DrcEngine(mdm_dao=snapshot_dao, async_mdm_dao=async_dao)
+        proposal = ring_lug_proposal()
+
+        result = await engine.validate_proposal_async(proposal)
+
+        assert result == engine.validate_proposal(proposal)
+        assert engine.mdm_dao is snapshot_dao
+
+    @pytest.mark.asyncio
+    async def test_validate_proposal_async_reports_mdm_failure(self, snapshot_dao, async_dao, monkeypatch):
+        async def unavailable(**kwargs):
+            raise RuntimeError("connection refused")
+        monkeypatch.setattr(async_dao, "prefetch", unavailable)
+        engine = DrcEngine(mdm_dao=snapshot_dao, async_mdm_dao=async_dao)
+
+        result = await engine.validate_proposal_async(ring_lug_proposal())
+
+        assert [issue.type for issue in result.issues if issue.type == "mdm_unavailable"] == ["mdm_unavailable"]
+
+    @pytest.mark.asyncio
+    async def test_prefetched_cable_selection_matches_sync(self, snapshot_dao, async_dao):
+        engine = SynthesisEngine(mdm_dao=snapshot_dao, async_mdm_dao=async_dao)
+        endpoint = Endpoint(selector=EndpointSelectorSeries(series="IDC-0.050", positions=10), termination="idc")
+        step1 = AssemblyStep1(
+            type="ribbon", length_mm=1000, tolerance_mm=50, locale="NA",
+            endA=endpoint, endB=endpoint,
+            electrical=Electrical(system_voltage_v=5, per_circuit=[
+                {"current_a": 0.1, "voltage_v": 5, "signal_type": "digital"} for _ in range(10)
+            ]),
+            environment=Environment(temp_min_c=-20, temp_max_c=85, flex_class="static", chemicals=[]),
+            emi=EMI(shield="none", drain_policy="isolated"),
+            compliance={}, constraints={}, must_use=[], notes_pack_id="test_pack",
+        )
+
+        prefetched = await async_dao.prefetch(queries=[engine._cable_query(step1)])
+        view = copy.copy(engine)
+        view.mdm_dao = prefetched
+
+        cable = view._select_cable(step1)
+        assert cable["primary"].mpn == "3M-3365-10-300"
+        assert cable == engine._select_cable(step1)
@@ -0,0 +1,67 @@
+import pytest
+from testkit.drc_fixtures import seed_snapshot
+from mdm_dao import MDMLookupKey
+
+
+class TestMDMSnapshot:
+    """Test in-memory MDM lookups match the live query semantics."""
+
+    @pytest.fixture
+    def snapshot(self):
+        return seed_snapshot()
+
+    def test_find_ribbon_by_matches_numeric_pitch(self, snapshot):
+        results = snapshot.find_ribbon_by(ways=10, pitch_in=0.05, temp_min=80, shield="none")
+        assert [cable["mpn"] for cable in results] == ["3M-3365-10-300", "3M-3302-10-300"]
+
+        hot = snapshot.find_ribbon_by(ways=10, pitch_in=0.05, temp_min=100, shield="none")
+        assert [cable["mpn"] for cable in hot] == ["3M-3302-10-300"]
+
+    def test_find_round_cable_by_awg_range_sorted_by_od(self, snapshot):
+        results = snapshot.find_round_cable_by(2, [14, 22], voltage_min=300, temp_min=80)
+        assert [cable["mpn"] for cable in results] == ["BELDEN-8723-002", "BELDEN-9501-002"]
+        assert snapshot.find_round_cable_by(2, [14, 22], voltage_min=600) == [results[1]]
+
+    def test_find_contacts_prefers_plating_then_falls_back(self, snapshot):
+        tin = snapshot.find_contacts_by("Molex Mega-Fit", 14, "tin")
+        assert [contact["mpn"] for contact in tin] == ["MOLEX-76650-0001"]
+
+        fallback = snapshot.find_contacts_by("JST PH", 26, "tin")
+        assert [contact["mpn"] for contact in fallback] == ["JST-SPH-002T-P0.5L"]
+
+        assert snapshot.find_contacts_by("Molex Mega-Fit", 22, "tin") == []
+
+    def test_find_lugs_by_stud_and_awg(self, snapshot):
+        assert [lug["mpn"] for lug in snapshot.find_lugs_by("#10", 8)] == ["TE-320582"]
+        assert snapshot.find_lugs_by("M3", 8) == []
+
+    def test_find_accessories_by_od_containment(self, snapshot):
+        results = snapshot.find_accessories_by("3M IDC", 0.25)
+        assert [accessory["mpn"] for accessory in results] == ["3M-3420-0003", "3M-3420-0001", "3M-3420-0002"]
+
+        assert [a["mpn"] for a in snapshot.find_accessories_by("3M IDC", 0.40)] == ["3M-3420-0002"]
+        assert snapshot.find_accessories_by("3M IDC", 0.50) == []
+        assert snapshot.find_accessories_by("Unknown", 0.25) == []
+
+    def test_results_are_copies(self, snapshot):
+        snapshot.find_lugs_by("#10", 8)[0]["mpn"] = "mutated"
+        assert snapshot.find_lugs_by("#10", 8)[0]["mpn"] == "TE-320582"
+
+    def test_dao_serves_lookups_from_snapshot(self, snapshot_dao):
+        assert snapshot_dao.catalog_version == "seed-v1"
+        assert snapshot_dao.find_lugs_by("#10", 8)[0]["mpn"] == "TE-320582"
+        assert snapshot_dao.find_accessories_by("JST PH", 0.1)[0]["mpn"] == "JST-PHDR-TB"
+        assert snapshot_dao.pool_stats()["acquired"] == 0
+
+    def test_find_parts_batch_resolves_each_key(self, snapshot):
+        results = snapshot.find_parts_batch([
+            MDMLookupKey(family="JST PH", awg=26, od=0.1),
+            MDMLookupKey(stud="M3", awg=14),
+            MDMLookupKey(family="Unknown", awg=14, od=0.1, stud="M3"),
+        ])
+        assert [a["mpn"] for a in results[0].accessories] == ["JST-PHDR-TB"]
+        assert [c["mpn"] for c in results[0].contacts] == ["JST-SPH-002T-P0.5L"]
+        assert results[0].lugs == []
+        assert [lug["mpn"] for lug in results[1].lugs] == ["TE-321460"]
+        assert results[2].accessories == [] and results[2].contacts == []
+        assert [lug["mpn"] for lug in results[2].lugs] == ["TE-321460"]
@@ -0,0 +1,168 @@
+import asyncio
+from fastapi.testclient import TestClient
+import mdm_dao
+import mdm_trace
+from testkit.drc_fixtures import FakeConnection, FakeCursor
+from mdm_dao import MDMDAO, MDMConnectionPool
+from mdm_trace import EXPLAIN, PlanCapture, SlowQueryLog
+
+ACCESSORY = {"id": 1, "mpn": "3M-3420-0001", "connector_family": "3M IDC", "type": "strain_relief"}
+PLAN = [{"QUERY PLAN": "Index Scan using idx_accessories_od_range on mdm_accessories"},
+        {"QUERY PLAN": "  Buffers: shared hit=4"}]
+
+
+class PlanCursor(FakeCursor):
+    def execute(self, sql, params=None):
+        super().execute(sql, params)
+        if sql.startswith(EXPLAIN):
+            if self.conn.fail_explain:
+                raise RuntimeError("permission denied for table mdm_accessories")
+            self.conn.rows = PLAN
+        else:
+            self.conn.rows = [ACCESSORY]
+
+
+class PlanConnection(FakeConnection):
+    def __init__(self, fail_explain=False):
+        super().__init__()
+        self.fail_explain = fail_explain
+
+    def cursor(self, *args, **kwargs):
+        return PlanCursor(self)
+
+
+class TestMDMQueryTracing:
+    """Test the slow-query log and plan capture around DAO statements."""
+
+    def use_log(self, monkeypatch, clock, threshold_ms=1e-9, explain_per_minute=2):
+        log = SlowQueryLog(threshold_ms=threshold_ms, max_entries=3, explain_per_minute=explain_per_minute, clock=clock)
+        monkeypatch.setattr(mdm_trace, "slow_queries", log)
+        return log
+
+    def dao(self, request, capture=None):
+        """DAO whose lookups run on ``request`` and whose plans are captured on ``capture``."""
+        plans = PlanCapture(MDMConnectionPool("postgresql://test", max_size=1, connect=lambda dsn: capture))
+        return MDMDAO(pool=MDMConnectionPool("postgresql://test", connect=lambda dsn: request),
+                      snapshot_mode=False, plans=plans)
+
+    def test_fast_statements_are_not_logged(self, monkeypatch, clock):
+        log = self.use_log(monkeypatch, clock, threshold_ms=60_000)
+        conn = PlanConnection()
+
+        assert self.dao(conn).find_accessories_by("3M IDC", 0.25) == [ACCESSORY]
+
+        assert len(conn.executed) == 1
+        assert log.entries() == [] and log.stats()["queries"] == 0
+
+    def test_slow_statement_plan_is_captured_on_its_own_connection(self, monkeypatch, clock):
+        log = self.use_log(monkeypatch, clock)
+        request, capture = PlanConnection(), PlanConnection()
+        dao = self.dao(request, capture)
+
+        assert dao.find_accessories_by("3M IDC", 0.25) == [ACCESSORY]
+        dao.plans.join()
+
+        (select,) = request.executed
+        assert capture.executed == [EXPLAIN + select]
+        (entry,) = log.entries()
+        assert entry["statement"] == "find_accessories_by" and entry["rows"] == 1
+        # Bound values are not kept, only how many there were
+        assert "params" not in entry and entry["param_count"] == 2
+        assert entry["plan"] == "\n".join(row["QUERY PLAN"] for row in PLAN)
+        dao.plans.close()
+
+    def test_plan_captures_are_rate_limited_and_the_log_bounded(self, monkeypatch, clock):
+        log = self.use_log(monkeypatch, clock, explain_per_minute=1)
+        dao = self.dao(PlanConnection(), PlanConnection())
+
+        for _ in range(4):
+            dao.find_accessories_by("3M IDC", 0.25)
+            dao.plans.join()
+        clock.now += 60
+        dao.find_accessories_by("3M IDC", 0.25)
+        dao.plans.join()
+
+        assert [entry["plan"] is not None for entry in log.entries()] == [True, False, False]
+        stats = log.stats()
+        assert stats["queries"] == 5 and stats["size"] == 3
+        assert stats["plans_captured"] == 2 and stats["plans_rate_limited"] == 3
+        dao.plans.close()
+
+    def test_failed_explain_is_counted_and_keeps_the_result(self, monkeypatch, clock):
+        log = self.use_log(monkeypatch, clock)
+        request, capture = PlanConnection(), PlanConnection(fail_explain=True)
+        dao = self.dao(request, capture)
+
+        assert dao.find_accessories_by("3M IDC", 0.25) == [ACCESSORY]
+        dao.plans.join()
+
+        assert len(request.executed) == 1
+        assert log.entries()[0]["plan"] is None
+        assert log.stats()["plan_failures"] == 1
+        dao.plans.close()
+
+    def test_daos_of_one_database_share_a_plan_capture(self, monkeypatch):
+        monkeypatch.setattr(mdm_dao, "_plan_captures", {})
+        first = MDMDAO(pool=MDMConnectionPool("postgresql://test"), snapshot_mode=False)
+        second = MDMDAO(pool=MDMConnectionPool("postgresql://test"), snapshot_mode=False)
+        other = MDMDAO(pool=MDMConnectionPool("postgresql://other"), snapshot_mode=False)
+
+        assert first.plans is second.plans and other.plans is not first.plans
+        mdm_dao.close_plan_captures()
+        assert mdm_dao.get_plan_capture("postgresql://test") is not first.plans
+
+    def test_async_plans_are_captured_on_a_pooled_connection(self, monkeypatch, clock):
+        log = self.use_log(monkeypatch, clock)
+
+        class AsyncConnection:
+            def __init__(self):
+                self.fetched = []
+
+            async def fetch(self, sql, *args):
+                self.fetched.append(sql)
+                return [("Seq Scan on mdm_lugs",)] if sql.startswith(EXPLAIN) else [ACCESSORY, ACCESSORY]
+
+        class AsyncPool:
+            def __init__(self):
+                self.conn = AsyncConnection()
+                self.timeouts = []
+
+            def acquire(self, timeout=None):
+                pool = self
+                self.timeouts.append(timeout)
+
+                class Acquired:
+                    async def __aenter__(self):
+                        return pool.conn
+
+                    async def __aexit__(self, *exc):
+                        return False
+
+                return Acquired()
+
+        request, pool = AsyncConnection(), AsyncPool()
+
+        async def fetch():
+            rows = await mdm_trace.fetch_traced_async(request, "find_lugs_by", "SELECT 1", "#10", 8,
+                                                      plan_pool=pool, plan_timeout_s=2.5)
+            await asyncio.gather(*mdm_trace._plan_tasks)
+            return rows
+
+        assert asyncio.run(fetch()) == [ACCESSORY, ACCESSORY]
+        assert request.fetched == ["SELECT 1"]
+        assert pool.conn.fetched == [EXPLAIN + "SELECT 1"]
+        assert pool.timeouts == [2.5]
+        (entry,) = log.entries()
+        assert (entry["rows"], entry["param_count"], entry["plan"]) == (2, 2, "Seq Scan on mdm_lugs")
+
+    def test_slow_query_endpoint(self, monkeypatch, clock):
+        import main
+        log = self.use_log(monkeypatch, clock)
+        monkeypatch.setattr(main, "slow_queries", log)
+        log.record("find_contacts_by", 812.5, 3, ("Molex Mega-Fit", 14, "tin"))
+
+        body = TestClient(main.app).get("/v1/mdm/slow-queries").json()
+
+        assert body["stats"]["queries"] == 1
+        assert body["entries"][0]["statement"] == "find_contacts_by"
+        assert "Molex Mega-Fit" not in str(body)
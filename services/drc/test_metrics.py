@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import metrics
+from mdm_dao import MDMDAO, MDMConnectionPool
+
+
+def sample(metric, name, **labels):
+    """Value of the sample ``name`` with exactly ``labels``, or None."""
+    for found in metric.collect().samples:
+        if found.name == name and dict(found.labels) == labels:
+            return found.value
+    return None
+
+
+class TestMetrics:
+    """Test the /metrics endpoint and MDM lookup metrics."""
+
+    def test_snapshot_lookups_are_timed(self, snapshot_dao, async_dao):
+        name = "drc_mdm_query_duration_seconds_count"
+        before = sample(metrics.MDM_QUERY_SECONDS, name, lookup="find_lugs_by", source="snapshot") or 0
+
+        snapshot_dao.find_lugs_by("#10", 8)
+        asyncio.run(async_dao.find_lugs_by("#10", 8))
+
+        assert sample(metrics.MDM_QUERY_SECONDS, name, lookup="find_lugs_by", source="snapshot") == before + 2
+
+    def test_failed_live_lookups_are_counted(self):
+        def refuse(dsn):
+            raise ConnectionRefusedError("no database")
+        dao = MDMDAO(pool=MDMConnectionPool("postgresql://unused", connect=refuse), snapshot_mode=False)
+        name = "drc_mdm_query_errors_total"
+        before = sample(metrics.MDM_QUERY_ERRORS, name, lookup="find_accessories_by", error="ConnectionRefusedError") or 0
+
+        with pytest.raises(ConnectionRefusedError):
+            dao.find_accessories_by("3M IDC", 1.2)
+
+        assert sample(metrics.MDM_QUERY_ERRORS, name, lookup="find_accessories_by", error="ConnectionRefusedError") == before + 1
+        assert sample(metrics.MDM_QUERY_SECONDS, "drc_mdm_query_duration_seconds_count",
+                      lookup="find_accessories_by", source="live") >= 1
+
+    def test_metrics_endpoint(self):
+        import main
+        client = TestClient(main.app)
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == metrics.CONTENT_TYPE
+        lines = response.text.splitlines()
+        assert any(line.startswith('http_request_duration_seconds_count{method="GET",route="/health",status="200"}')
+                   for line in lines)
+        for name in ("drc_mdm_pool_in_use", "drc_mdm_pool_timeouts_total", "drc_mdm_async_pool_size",
+                     "drc_synthesis_cache_hits_total", "threadpool_workers_busy", "threadpool_tasks_waiting"):
+            assert any(line.startswith(name + " ") for line in lines), name
@@ -0,0 +1,52 @@
+import pytest
+from drc import DrcEngine
+from testkit.drc_fixtures import ring_lug_proposal
+from service_common import rule_timing
+
+
+class TestRuleTiming:
+    """Test per-check timing of validate_proposal."""
+
+    @pytest.fixture
+    def engine(self, snapshot_dao):
+        return DrcEngine(mdm_dao=snapshot_dao)
+
+    @pytest.fixture
+    def timings(self, monkeypatch):
+        monkeypatch.setattr(rule_timing, "OTEL_DRC_RULE_TIMING", True)
+        rule_timing.rule_timings.reset()
+        yield rule_timing.rule_timings
+        rule_timing.rule_timings.reset()
+
+    def test_each_check_is_timed_without_changing_the_result(self, engine, timings, monkeypatch):
+        proposal = ring_lug_proposal()
+        timed = engine.validate_proposal(proposal)
+        monkeypatch.setattr(rule_timing, "OTEL_DRC_RULE_TIMING", False)
+
+        assert timed == engine.validate_proposal(proposal)
+        snapshot = timings.snapshot()
+        assert {ruleset for ruleset, _ in snapshot} == {engine.ruleset_id}
+        rules = {rule for _, rule in snapshot}
+        assert {"mdm_requirements", "locale_ac_colors", "shielding_requirements"} <= rules
+        assert all(not rule.startswith("_check_") for rule in rules)
+        assert all(h["count"] == 1 == sum(h["buckets"]) for h in snapshot.values())
+
+    def test_timing_is_off_by_default(self, engine):
+        rule_timing.rule_timings.reset()
+
+        engine.validate_proposal(ring_lug_proposal())
+
+        assert rule_timing.rule_timer(engine.ruleset_id) is None
+        assert rule_timing.rule_timings.snapshot() == {}
+
+    def test_columnar_batch_is_timed_like_validate_proposal(self, engine, timings):
+        engine.validate_proposal(ring_lug_proposal())
+        per_proposal = timings.snapshot()
+        timings.reset()
+        engine.columnar_min_batch = 1
+
+        engine.validate_proposals([ring_lug_proposal(), ring_lug_proposal()])
+
+        snapshot = timings.snapshot()
+        assert snapshot and set(snapshot) <= set(per_proposal)
+        assert all(h["count"] == 2 for h in snapshot.values())
@@ -0,0 +1,92 @@
+import pytest
+from testkit.drc_fixtures import seed_snapshot, step1
+from models import AssemblyStep1, ConductorSpec, ShieldSpec, SynthesisProposal
+from result_cache import ResultCache, canonical_digest
+from synthesis import SynthesisEngine
+
+
+class TestResultCache:
+    """Test LRU/TTL eviction and counters."""
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2, ttl_s=0)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, clock):
+        cache = ResultCache(max_entries=10, ttl_s=5, clock=clock)
+        cache.put("a", 1)
+        clock.now = 5
+        assert cache.get("a") == 1
+        clock.now = 5.5
+        assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+        assert stats["hit_ratio"] == 0.5
+
+    def test_zero_entries_disables_cache(self):
+        cache = ResultCache(max_entries=0)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+
+    def test_canonical_digest_is_content_addressed(self):
+        assert canonical_digest(step1()) == canonical_digest(AssemblyStep1(**step1().model_dump()))
+        assert canonical_digest(step1()) != canonical_digest(step1(length_mm=1001))
+
+
+class TestSynthesisCaching:
+    """Test proposals are memoized by payload and catalog version."""
+
+    @pytest.fixture
+    def engine(self, snapshot_dao, monkeypatch):
+        engine = SynthesisEngine(mdm_dao=snapshot_dao, cache=ResultCache(max_entries=8, ttl_s=0))
+        engine.built = []
+
+        def synthesize(draft_id, step1_payload, proposal_id):
+            engine.built.append(proposal_id)
+            return SynthesisProposal(
+                proposal_id=proposal_id, draft_id=draft_id, cable={},
+                conductors=ConductorSpec(awg=28, count=10),
+                endpoints={}, shield=ShieldSpec(type="none", drain_policy="isolated"),
+                wirelist=[], bom=[], warnings=[], errors=[], explain=[],
+            )
+        monkeypatch.setattr(engine, "_synthesize", synthesize)
+        return engine
+
+    def test_repeat_payload_hits_cache_with_stable_id(self, engine):
+        first = engine.propose_synthesis("draft-1", step1())
+        second = engine.propose_synthesis("draft-1", step1())
+        other_draft = engine.propose_synthesis("draft-2", step1())
+
+        assert len(engine.built) == 1
+        assert first == second
+        assert first.proposal_id == f"prop_draft-1_{canonical_digest(step1())[:12]}"
+        assert (other_draft.draft_id, other_draft.proposal_id) == ("draft-2", f"prop_draft-2_{canonical_digest(step1())[:12]}")
+
+        second.warnings.append("mutated")
+        assert engine.propose_synthesis("draft-1", step1()).warnings == []
+
+        # A new catalog version is a new cache key
+        snapshot = seed_snapshot()
+        snapshot.version = "seed-v2"
+        engine.mdm_dao.use_snapshot(snapshot)
+        engine.propose_synthesis("draft-1", step1())
+        assert len(engine.built) == 2
+        assert engine.cache.stats()["hits"] == 3
+
+    def test_live_catalog_proposals_are_not_cached(self, engine):
+        engine.mdm_dao.use_snapshot(None)
+
+        first = engine.propose_synthesis("draft-1", step1())
+        second = engine.propose_synthesis("draft-1", step1())
+
+        assert len(engine.built) == 2
+        assert first.proposal_id == second.proposal_id
+        assert engine.cache.stats()["size"] == 0
@@ -0,0 +1,66 @@
+from drc import DrcEngine
+from models import ConductorSpec, ShieldSpec, SynthesisProposal
+from rule_plan import LengthLimit, RulePlan, TemperatureRange, VoltageRatingLimit
+
+
+RULE_TABLES = {
+    "ampacity": {"data": {"18": 14, "10": 55, "08": 70, "4/0": 260}},
+    "bend_radius": {"data": {"round": {"multiplier": 8}, "flat": 6}},
+    "voltage_ratings": {"data": {"24": {"max_voltage_v": 300, "safety_margin_v": 60}, "26": {}}},
+    "length_limits": {"data": {"ribbon": {"max_length_mm": 3000}, "standard": {"max_length_mm": 1500}}},
+    "temperature_ranges": {"data": {"outdoor": {"min_temp_c": -40, "max_temp_c": 70}}},
+    "locale_ac_colors": {"data": {"eu": {"description": "IEC", "1": "brown", "3": "green"}}},
+}
+
+
+class TestRulePlan:
+    """Test rule tables compile into pre-resolved lookups."""
+
+    def test_awg_tables_are_int_indexed(self):
+        plan = RulePlan(RULE_TABLES)
+        assert plan.ampacity.get(18) == 14
+        assert plan.ampacity.get(10) == 55
+        # Keys that str(awg) can never produce are dropped
+        assert plan.ampacity.get(8) is None
+        assert plan.ampacity.get(-1) is None and plan.ampacity.get(99) is None
+        assert plan.voltage_ratings.get(24) == VoltageRatingLimit(300, 240)
+        assert plan.voltage_ratings.get(26) is None
+
+    def test_family_defaults_are_resolved(self):
+        plan = RulePlan(RULE_TABLES)
+        assert plan.bend_multiplier("round") == 8
+        assert plan.bend_multiplier("flat") == 6
+        assert plan.bend_multiplier("unknown") == 10
+        assert plan.length_limit("ribbon") == LengthLimit(3000, 800)
+        assert plan.length_limit("unknown") == LengthLimit(1500, 800)
+        assert plan.temperature_range("outdoor") == TemperatureRange(-40, 70)
+        assert plan.temperature_range("indoor") is None
+        assert plan.locale_colors["eu"] == ("brown", None, "green")
+
+    def test_missing_tables_compile_to_none(self):
+        plan = RulePlan({"ampacity": {"data": {}}})
+        assert plan.ampacity is None
+        assert plan.bend_multipliers is None and plan.voltage_temp is None
+        assert plan.locale_colors is None and plan.length_limits is None
+
+    def test_engine_checks_use_compiled_plan(self):
+        engine = DrcEngine()
+        engine.rule_tables = RULE_TABLES
+        engine.rule_plan = RulePlan(RULE_TABLES)
+        proposal = SynthesisProposal(
+            proposal_id="p", draft_id="d", cable={},
+            conductors=ConductorSpec(awg=18, current_rating=20, od_mm=5, family="round",
+                                     length_mm=2000, ac_colors=["brown", "blue", "black"]),
+            endpoints={}, shield=ShieldSpec(type="none", drain_policy="isolated"),
+            wirelist=[], bom=[], warnings=[], errors=[], explain=[],
+            bend_radius_mm=30, locale="eu",
+        )
+
+        result = engine.validate_proposal(proposal)
+
+        assert [(issue.type, issue.location) for issue in result.issues] == [
+            ("current_exceeds_ampacity", "conductors.current_rating"),
+            ("bend_radius_too_small", "bend_radius_mm"),
+            ("ac_color_mismatch", "conductors.ac_colors[2]"),
+            ("bend_radius_too_small", "conductors.length_mm"),
+        ]
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from testkit.drc_fixtures import step1
+from models import ConductorSpec, ShieldSpec, SynthesisProposal
+from result_cache import ResultCache
+from synthesis import SynthesisEngine
+
+
+def fake_synthesize(built):
+    def synthesize(draft_id, step1_payload, proposal_id):
+        if step1_payload.length_mm == 13:
+            raise ValueError("unlucky length")
+        built.append(step1_payload.length_mm)
+        return SynthesisProposal(
+            proposal_id=proposal_id, draft_id=draft_id, cable={},
+            conductors=ConductorSpec(awg=28, count=10),
+            endpoints={}, shield=ShieldSpec(type="none", drain_policy="isolated"),
+            wirelist=[], bom=[], warnings=[], errors=[], explain=[],
+        )
+    return synthesize
+
+
+class TestSynthesisBatch:
+    """Test batch proposals share lookups and report per-item errors."""
+
+    @pytest.fixture
+    def engine(self, snapshot_dao, async_dao, monkeypatch):
+        engine = SynthesisEngine(
+            mdm_dao=snapshot_dao,
+            async_mdm_dao=async_dao,
+            cache=ResultCache(max_entries=16, ttl_s=0),
+        )
+        engine.built = []
+        monkeypatch.setattr(engine, "_synthesize", fake_synthesize(engine.built))
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_batch_dedupes_payloads_and_lookups(self, engine, monkeypatch):
+        prefetches = []
+        prefetch = engine.async_mdm_dao.prefetch
+
+        async def recording_prefetch(queries=(), keys=()):
+            prefetches.append(list(queries))
+            return await prefetch(queries=queries, keys=keys)
+        monkeypatch.setattr(engine.async_mdm_dao, "prefetch", recording_prefetch)
+
+        engine.propose_synthesis("cached", step1(500))
+        items = [("a", step1(1000)), ("b", step1(1000)), ("c", step1(2000)), ("d", step1(500)), ("e", step1(13))]
+        results = {index: outcome async for index, outcome in engine.propose_synthesis_batch(items)}
+
+        assert sorted(results) == [0, 1, 2, 3, 4]
+        assert sorted(engine.built) == [500, 1000, 2000]
+        assert len(prefetches) == 1 and len(prefetches[0]) == 3
+        assert [results[i].draft_id for i in range(4)] == ["a", "b", "c", "d"]
+        assert results[0].proposal_id != results[1].proposal_id
+        assert isinstance(results[4], ValueError)
+
+    def test_batch_endpoint_streams_ndjson(self, engine, monkeypatch):
+        import main
+        monkeypatch.setattr(main, "synthesis_engine", engine)
+        client = TestClient(main.app)
+        body = {"items": [
+            {"draft_id": "a", "step1": step1(1000).model_dump(mode="json")},
+            {"draft_id": "e", "step1": step1(13).model_dump(mode="json")},
+        ]}
+
+        response = client.post("/v1/synthesis/propose:batch", json=body)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+        assert lines[0]["proposal"]["draft_id"] == "a" and "error" not in lines[0]
+        assert lines[1] == {"index": 1, "draft_id": "e", "error": "Synthesis failed: unlucky length"}
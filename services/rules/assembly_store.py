@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from service_common.env import env_int
+
+from .models import AssemblySchema
+from .schema_digest import SchemaDigest
+
+
+class SQLiteAssemblyBackend:
+    """Durable assembly rows in a local SQLite file (or ``:memory:``)."""
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rules_assemblies (
+                    assembly_id TEXT NOT NULL,
+                    schema_hash TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    stored_at REAL NOT NULL DEFAULT (julianday('now')),
+                    PRIMARY KEY (assembly_id, schema_hash)
+                )
+                """
+            )
+
+    def put(self, assembly_id: str, schema_hash: str, payload: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rules_assemblies (assembly_id, schema_hash, payload) VALUES (?, ?, ?)",
+                (assembly_id, schema_hash, payload),
+            )
+
+    def get(self, assembly_id: str, schema_hash: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            if schema_hash is None:
+                row = self._conn.execute(
+                    "SELECT payload FROM rules_assemblies WHERE assembly_id = ? "
+                    "ORDER BY stored_at DESC, rowid DESC LIMIT 1",
+                    (assembly_id,),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT payload FROM rules_assemblies WHERE assembly_id = ? AND schema_hash = ?",
+                    (assembly_id, schema_hash),
+                ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class PostgresAssemblyBackend:
+    """Durable assembly rows in Postgres, shared by every replica.
+
+    Statements run on a bounded, thread-safe pool of up to ``max_size``
+    connections; a connection the server dropped is discarded and the
+    statement retried once on a fresh one.
+    """
+
+    def __init__(self, dsn: str, max_size: int = 4, pool: Optional[Any] = None) -> None:
+        import psycopg2  # Only needed when a Postgres store is configured
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self._disconnects = (psycopg2.OperationalError, psycopg2.InterfaceError)
+        self._pool = pool if pool is not None else ThreadedConnectionPool(1, max_size, dsn)
+        # ThreadedConnectionPool raises when exhausted; callers wait for a slot instead
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS rules_assemblies (
+                assembly_id TEXT NOT NULL,
+                schema_hash TEXT NOT NULL,
+                payload JSONB NOT NULL,
+                stored_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (assembly_id, schema_hash)
+            )
+            """
+        )
+
+    def put(self, assembly_id: str, schema_hash: str, payload: str) -> None:
+        self._execute(
+            """
+            INSERT INTO rules_assemblies (assembly_id, schema_hash, payload) VALUES (%s, %s, %s)
+            ON CONFLICT (assembly_id, schema_hash)
+            DO UPDATE SET payload = EXCLUDED.payload, stored_at = now()
+            """,
+            (assembly_id, schema_hash, payload),
+        )
+
+    def get(self, assembly_id: str, schema_hash: Optional[str] = None) -> Optional[str]:
+        if schema_hash is None:
+            row = self._execute(
+                "SELECT payload::text FROM rules_assemblies WHERE assembly_id = %s "
+                "ORDER BY stored_at DESC LIMIT 1",
+                (assembly_id,), fetch=True,
+            )
+        else:
+            row = self._execute(
+                "SELECT payload::text FROM rules_assemblies WHERE assembly_id = %s AND schema_hash = %s",
+                (assembly_id, schema_hash), fetch=True,
+            )
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = (), fetch: bool = False) -> Optional[Tuple[Any, ...]]:
+        for attempt in range(2):
+            with self._slots:
+                conn = self._pool.getconn()
+                broken = False
+                try:
+                    conn.autocommit = True
+                    with conn.cursor() as cur:
+                        cur.execute(sql, params)
+                        return cur.fetchone() if fetch else None
+                except self._disconnects:
+                    broken = True
+                    if attempt:
+                        raise
+                finally:
+                    self._pool.putconn(conn, close=broken or bool(conn.closed))
+        return None
+
+
+def backend_from_url(url: str, pool_size: int = 4) -> Optional[Any]:
+    """Backend for ``sqlite:///<path>`` (``sqlite:///:memory:``) or a ``postgresql://`` DSN."""
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteAssemblyBackend(url[len("sqlite:///"):])
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresAssemblyBackend(url, max_size=pool_size)
+    raise ValueError(f"Unsupported assembly store URL: {url}")
+
+
+class AssemblyStore:
+    """Assemblies by id: a bounded in-process LRU in front of an optional durable backend.
+
+    The front tier holds at most ``max_entries`` assemblies and ``max_bytes`` of
+    serialized schema, evicting least-recently-used entries. Each entry may
+    carry the ``SchemaDigest`` of its revision, counted in ``max_bytes`` and
+    evicted with it, which later revisions hash against. Every write goes
+    through to the backend, so an assembly evicted here (or remembered by
+    another replica) is still found on ``get``. With a backend, a lookup
+    without ``schema_hash`` always asks the backend for the latest revision,
+    since another replica may have written a newer one.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, backend: Optional[Any] = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        # assembly_id -> (latest revision, its digest or None, bytes of both)
+        self._entries: "OrderedDict[str, Tuple[AssemblySchema, Optional[SchemaDigest], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "AssemblyStore":
+        max_entries = env_int("RULES_ASSEMBLY_CACHE_MAX_ENTRIES", 1024)
+        max_bytes = env_int("RULES_ASSEMBLY_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+        backend = backend_from_url(
+            os.getenv("RULES_ASSEMBLY_STORE_URL", ""), pool_size=env_int("RULES_ASSEMBLY_STORE_POOL_SIZE", 4),
+        )
+        return cls(max_entries=max_entries, max_bytes=max_bytes, backend=backend)
+
+    def put(self, assembly: AssemblySchema, digest: Optional[SchemaDigest] = None) -> None:
+        """Store ``assembly``; ``digest``, if given, must have been computed over its sections."""
+        payload = assembly.model_dump_json()
+        if self.backend is not None:
+            self.backend.put(assembly.assembly_id, assembly.schema_hash, payload)
+        self._cache(assembly, len(payload.encode("utf-8")), digest)
+
+    def digest(self, assembly_id: str, schema_hash: Optional[str]) -> Optional[SchemaDigest]:
+        """Digest kept with the in-process revision ``schema_hash`` of ``assembly_id``, if any."""
+        with self._lock:
+            entry = self._entries.get(assembly_id)
+            if entry is None or entry[0].schema_hash != schema_hash:
+                return None
+            return entry[1]
+
+    def attach_digest(self, assembly: AssemblySchema, digest: SchemaDigest) -> None:
+        """Keep ``digest`` with ``assembly`` if the front tier holds that very object."""
+        with self._lock:
+            entry = self._entries.get(assembly.assembly_id)
+            if entry is None or entry[0] is not assembly or entry[1] is not None:
+                return
+            size = entry[2] + digest.nbytes
+            if size > self.max_bytes:
+                return
+            self._entries[assembly.assembly_id] = (assembly, digest, size)
+            self._entries.move_to_end(assembly.assembly_id)
+            self._bytes += size - entry[2]
+            self._evict()
+
+    def get(self, assembly_id: str, schema_hash: Optional[str] = None) -> Optional[AssemblySchema]:
+        if schema_hash is not None or self.backend is None:
+            with self._lock:
+                entry = self._entries.get(assembly_id)
+                if entry is not None and (schema_hash is None or entry[0].schema_hash == schema_hash):
+                    self._entries.move_to_end(assembly_id)
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+
+        if self.backend is None:
+            return None
+        payload = self.backend.get(assembly_id, schema_hash)
+        if payload is None:
+            return None
+        assembly = AssemblySchema.model_validate_json(payload)
+        with self._lock:
+            self.backend_hits += 1
+        if schema_hash is None:
+            # Only the latest revision is kept in the front tier
+            self._cache(assembly, len(payload.encode("utf-8")))
+        return assembly
+
+    def _cache(self, assembly: AssemblySchema, size: int, digest: Optional[SchemaDigest] = None) -> None:
+        if digest is not None:
+            # A digest that does not fit is dropped rather than the assembly
+            digest_size = digest.nbytes
+            if size + digest_size <= self.max_bytes:
+                size += digest_size
+            else:
+                digest = None
+        with self._lock:
+            previous = self._entries.pop(assembly.assembly_id, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            if self.max_entries <= 0 or size > self.max_bytes:
+                return
+            self._entries[assembly.assembly_id] = (assembly, digest, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "backend_hits": self.backend_hits,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "backend": type(self.backend).__name__ if self.backend is not None else None,
+            }
@@ -0,0 +1,25 @@
+import json
+import shutil
+
+import pytest
+
+from .rule_registry import RULESETS_DIR, RuleRegistry
+
+
+@pytest.fixture
+def registry_with(tmp_path):
+    """``registry_with(ruleset_id, edit=None)``: registry holding rs-001 and a copy of it as ``ruleset_id``.
+
+    ``edit``, if given, is called with the copy's manifest before it is written.
+    """
+    def build(ruleset_id, edit=None):
+        shutil.copytree(RULESETS_DIR / "rs-001", tmp_path / "rs-001")
+        shutil.copytree(RULESETS_DIR / "rs-001", tmp_path / ruleset_id)
+        manifest_path = tmp_path / ruleset_id / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["id"] = ruleset_id
+        if edit is not None:
+            edit(manifest)
+        manifest_path.write_text(json.dumps(manifest))
+        return RuleRegistry(root=tmp_path)
+    return build
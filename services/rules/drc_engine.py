@@ -1,82 +1,315 @@
 from __future__ import annotations
 
-import hashlib
-import json
-from copy import deepcopy
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from service_common.env import env_int
+from service_common.rule_timing import rule_timer
+
+from .assembly_store import AssemblyStore
+from .features import AssemblyFeatures, Wire
 from .models import AssemblySchema, DRCFinding, DRCFix, DRCReport
+from .report_cache import CachedReport, DomainResults, ReportCache
+from .rule_registry import RulePlan, RuleRegistry
+from .schema_digest import SchemaDigest
+from .schema_patch import SchemaPatch
+
+
+def _timed(checker: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """``checker(*args)`` and the CPU seconds it took on the worker thread."""
+    started = time.thread_time()
+    results = checker(*args)
+    return results, time.thread_time() - started
+
+
+# Process workers: recent runs' (engine, features, plan), by shared memory block name
+_SHARED_RUNS: "OrderedDict[str, Tuple[DRCEngine, AssemblyFeatures, RulePlan]]" = OrderedDict()
+_SHARED_RUNS_SIZE = 4
+
+
+def _shared_task(block: str, method: str, wires: Optional[Tuple[int, int]] = None) -> Tuple[Any, float]:
+    """Run ``method`` on the run shipped in shared memory ``block``; returns its results and CPU seconds.
+
+    A worker unpickles each run once, however many of its tasks it gets.
+    ``wires`` selects the wirelist partition of a ``_check_wire_colors`` task.
+    """
+    run = _SHARED_RUNS.get(block)
+    if run is None:
+        memory = shared_memory.SharedMemory(name=block)
+        try:
+            run = pickle.loads(memory.buf)
+        finally:
+            memory.close()
+        _SHARED_RUNS[block] = run
+        while len(_SHARED_RUNS) > _SHARED_RUNS_SIZE:
+            _SHARED_RUNS.popitem(last=False)
+    engine, features, plan = run
+    checker = getattr(engine, method)
+    if wires is None:
+        return _timed(checker, features, plan)
+    return _timed(checker, plan, features.locale, features.wires[wires[0]:wires[1]])
 
 
 class DRCEngine:
-    """Deterministic Step 3 DRC engine."""
-
-    DEFAULT_RULESET = {
-        "id": "rs-001",
-        "version": "1.0.0",
-        "created_at": "2025-01-01T00:00:00Z",
-        "notes": "Baseline deterministic ruleset",
-    }
-
-    AMPACITY_TABLE = {
-        30: 0.86,
-        28: 1.4,
-        26: 2.2,
-        24: 3.5,
-        22: 5.5,
-        20: 8.8,
-        18: 14.0,
-        16: 22.0,
-        14: 32.0,
-        12: 41.0,
-        10: 55.0,
-    }
-
-    RIBBON_BEND_TABLE_MM = {
-        0.025: 5.0,
-        0.05: 7.5,
-        0.1: 12.5,
+    """Deterministic Step 3 DRC engine.
+
+    Which rules run, and their thresholds and tables, come from the ruleset
+    plan selected by ``ruleset_id`` (see ``rule_registry``).
+    """
+
+    # Schema paths each domain checker reads; ``*`` matches any endpoint name
+    DOMAIN_READS = {
+        "mechanical": (
+            "cable.type", "cable.environment", "cable.bend_radius_mm", "cable.min_bend_radius_mm", "cable.od_mm",
+            "conductors.count", "conductors.ribbon", "wirelist",
+            "endpoints.*.connector", "endpoints.*.accessories",
+        ),
+        "electrical": (
+            "cable.electrical", "cable.environment", "cable.ratings", "conductors.awg", "shield",
+            "endpoints.*.shield_termination", "endpoints.*.contacts",
+        ),
+        "standards": ("cable.compliance", "labels"),
+        "labeling": ("labels",),
+        "consistency": (
+            "cable.type", "cable.locale", "conductors.ribbon", "wirelist",
+            "endpoints.*.connector", "endpoints.*.termination", "endpoints.*.lugs",
+            "endpoints.*.requires_heat_shrink", "endpoints.*.heat_shrink",
+        ),
     }
 
-    LABEL_OFFSET_DEFAULT = 30
-    LABEL_OFFSET_RANGE = (25, 50)
-    CLAMP_TOLERANCE_MM = 0.2
+    EXECUTOR_MODES = ("serial", "thread", "process")
 
-    def __init__(self) -> None:
-        self._assemblies: Dict[str, AssemblySchema] = {}
+    def __init__(
+        self,
+        store: Optional[AssemblyStore] = None,
+        report_cache: Optional[ReportCache] = None,
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        registry: Optional[RuleRegistry] = None,
+    ) -> None:
+        self.registry = registry if registry is not None else RuleRegistry.from_env()
+        # Domain checkers (and wirelist partitions) run serially or on a thread/process pool
+        self.executor_mode = executor or os.getenv("RULES_DRC_EXECUTOR", "serial")
+        if self.executor_mode not in self.EXECUTOR_MODES:
+            raise ValueError(f"RULES_DRC_EXECUTOR must be one of {', '.join(self.EXECUTOR_MODES)}")
+        self.workers = max(1, workers or env_int("RULES_DRC_WORKERS", os.cpu_count() or 1))
+        self.wirelist_chunk = max(1, env_int("RULES_DRC_WIRELIST_CHUNK", 2048))
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self.store = store if store is not None else AssemblyStore.from_env()
+        self.report_cache = report_cache if report_cache is not None else ReportCache.from_env()
 
     # ---------------------------------------------------------------------
     # Public API
     # ---------------------------------------------------------------------
     def get_rulesets(self) -> List[Dict[str, Any]]:
         """Return available rulesets."""
-        return [self.DEFAULT_RULESET.copy()]
+        return [plan.metadata() for plan in self.registry.plans()]
 
     def remember(self, assembly: AssemblySchema) -> None:
-        """Cache an assembly for subsequent operations (e.g. apply-fixes)."""
-        self._assemblies[assembly.assembly_id] = assembly
-
-    def load(self, assembly_id: str) -> Optional[AssemblySchema]:
-        """Lookup an assembly by id (populated via remember)."""
-        return self._assemblies.get(assembly_id)
+        """Store an assembly for subsequent operations (e.g. apply-fixes)."""
+        self.store.put(assembly)
+
+    def load(self, assembly_id: str, schema_hash: Optional[str] = None) -> Optional[AssemblySchema]:
+        """Lookup an assembly by id (populated via remember), optionally at a given revision."""
+        return self.store.get(assembly_id, schema_hash)
+
+    def schema_digest(self, assembly: AssemblySchema) -> SchemaDigest:
+        """Merkle digest of ``assembly``'s content; ``sections`` holds the per-section digests.
+
+        ``assembly.schema_hash`` is not trusted: the digest the store keeps next
+        to that revision only serves as a base, so sections identical (``is``)
+        to the ones it hashed are reused and everything else is rehashed.
+        Revisions built by ``apply_fixes`` share all their sections with that
+        base and rehash nothing. The digest is kept only if the store holds
+        ``assembly`` itself, and goes when that revision is evicted.
+        """
+        base = self.store.digest(assembly.assembly_id, assembly.schema_hash)
+        digest = SchemaDigest({name: getattr(assembly, name) for name in AssemblySchema.model_fields}, base=base)
+        self.store.attach_digest(assembly, digest)
+        return digest
 
     def run_drc(self, assembly: AssemblySchema, ruleset_id: Optional[str] = None) -> DRCReport:
+        plan = self.registry.get(ruleset_id)
+        return self._run(AssemblyFeatures(self._ensure_schema(assembly)), plan)
+
+    def run_drc_many(self, assembly: AssemblySchema, ruleset_ids: List[Optional[str]]) -> List[DRCReport]:
+        """One report per ruleset, in order, from a single feature extraction."""
+        plans = [self.registry.get(ruleset_id) for ruleset_id in ruleset_ids]
+        features = AssemblyFeatures(self._ensure_schema(assembly))
+        content_hash = self.schema_digest(features.assembly).root
+        return [self._run(features, plan, content_hash=content_hash) for plan in plans]
+
+    def iter_drc(self, assembly: AssemblySchema, ruleset_id: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """``run_drc`` as a stream of ``(event, item)`` pairs.
+
+        Yields ``("finding", DRCFinding)`` and ``("fix", DRCFix)`` as each
+        domain checker finishes (in completion order on a pool), then
+        ``("report", DRCReport)`` with the same report ``run_drc`` returns.
+        The ruleset is resolved before the first item is requested.
+        """
+        plan = self.registry.get(ruleset_id)
+        return self._iter_run(AssemblyFeatures(self._ensure_schema(assembly)), plan)
+
+    def _iter_run(self, features: AssemblyFeatures, plan: RulePlan) -> Iterator[Tuple[str, Any]]:
+        assembly = features.assembly
+        content_hash = self.schema_digest(assembly).root
+        cached = self._cached_report(assembly, content_hash, plan)
+        if cached is not None:
+            yield from (("finding", finding) for finding in cached.findings)
+            yield from (("fix", fix) for fix in cached.fixes)
+            yield "report", cached
+            return
+
+        started = time.thread_time()
+        checkers = self._checkers()
+        pending = [(domain, checker) for domain, checker in checkers if domain in plan.domains]
+        results: DomainResults = {}
+        seen_findings = set()
+        seen_fixes = set()
+        worker_cpu_s = 0.0
+        for domain, (findings, fixes), cpu_s in self._iter_checkers(features, plan, pending):
+            results[domain] = (findings, fixes)
+            worker_cpu_s += cpu_s
+            for finding in findings:
+                if (finding.id, finding.where) not in seen_findings:
+                    seen_findings.add((finding.id, finding.where))
+                    yield "finding", finding
+            for fix in fixes:
+                if fix.id not in seen_fixes:
+                    seen_fixes.add(fix.id)
+                    yield "fix", fix
+
+        domains = {domain: results.get(domain, ([], [])) for domain, _ in checkers}
+        cpu_s = time.thread_time() - started + worker_cpu_s
+        yield "report", self._report(assembly, plan, domains, cpu_s, content_hash)
+
+    def apply_fixes(
+        self,
+        assembly: AssemblySchema,
+        fix_ids: List[str],
+        ruleset_id: Optional[str] = None,
+    ) -> Tuple[AssemblySchema, DRCReport]:
         assembly = self._ensure_schema(assembly)
+        plan = self.registry.get(ruleset_id)
+        # Fixes patch copies of just the containers they touch; the rest is shared
+        patch = SchemaPatch(assembly)
 
-        findings: List[DRCFinding] = []
-        fixes: List[DRCFix] = []
+        base = self.schema_digest(assembly)
+        prior = self.report_cache.get(base.root, plan.id, plan.version)
 
-        checkers = [
-            self._check_mechanical_rules,
-            self._check_electrical_rules,
-            self._check_standards_rules,
-            self._check_labeling_rules,
-            self._check_consistency_rules,
+        written: List[str] = []
+        for fix_id in fix_ids:
+            if fix_id == "FIX_LABEL_OFFSET_DEFAULT":
+                labels = patch.writable("labels")
+                labels["offset_mm"] = plan.label_offset_default
+                written.append("labels.offset_mm")
+            elif fix_id.startswith("FIX_CLAMP_ADJUST_"):
+                clamp_id = fix_id.split("FIX_CLAMP_ADJUST_", 1)[1]
+                written.extend(self._apply_clamp_adjustment(patch, clamp_id))
+            elif fix_id.startswith("FIX_CONTACT_PLATING_"):
+                end_key = fix_id.split("FIX_CONTACT_PLATING_", 1)[1].lower()
+                written.extend(self._apply_contact_plating_upgrade(patch, end_key))
+            elif fix_id.startswith("FIX_ADD_HEAT_SHRINK_"):
+                end_key = fix_id.split("FIX_ADD_HEAT_SHRINK_", 1)[1].lower()
+                written.extend(self._apply_heat_shrink(patch, end_key))
+
+        digest = SchemaDigest(patch.hash_view(), base=base)
+        updated = patch.build(digest.root)
+        self.store.put(updated, digest)
+
+        # Domains that read none of the written paths keep their prior findings
+        reuse = None
+        if prior is not None:
+            reuse = {
+                domain: results
+                for domain, results in prior.domains.items()
+                if not any(self._paths_overlap(read, path) for read in self.DOMAIN_READS[domain] for path in written)
+            }
+
+        report = self._run(AssemblyFeatures(updated), plan, reuse, digest.root)
+        return updated, report
+
+    def _run(
+        self,
+        features: AssemblyFeatures,
+        plan: RulePlan,
+        reuse: Optional[DomainResults] = None,
+        content_hash: Optional[str] = None,
+    ) -> DRCReport:
+        """Run the domain checkers, taking results for the domains in ``reuse`` as given.
+
+        ``content_hash`` is the assembly's digest root, if the caller already has it.
+        """
+        assembly = features.assembly
+        content_hash = content_hash or self.schema_digest(assembly).root
+        cached = self._cached_report(assembly, content_hash, plan)
+        if cached is not None:
+            return cached
+
+        started = time.thread_time()
+        checkers = self._checkers()
+        # Domains without rules in the plan, or whose results are reused, are not run
+        pending = [
+            (domain, checker) for domain, checker in checkers
+            if domain in plan.domains and not (reuse and domain in reuse)
+        ]
+        results: DomainResults = {}
+        worker_cpu_s = 0.0
+        for domain, domain_results, cpu_s in self._iter_checkers(features, plan, pending):
+            results[domain] = domain_results
+            worker_cpu_s += cpu_s
+
+        domains: DomainResults = {}
+        for domain, _ in checkers:
+            if domain in results:
+                domains[domain] = results[domain]
+            elif reuse and domain in reuse:
+                domains[domain] = reuse[domain]
+            else:
+                domains[domain] = ([], [])
+        return self._report(assembly, plan, domains, time.thread_time() - started + worker_cpu_s, content_hash)
+
+    def _cached_report(self, assembly: AssemblySchema, content_hash: str, plan: RulePlan) -> Optional[DRCReport]:
+        # Reports are deterministic for the assembly's content and the ruleset version
+        cached = self.report_cache.get(content_hash, plan.id, plan.version)
+        if cached is None:
+            return None
+        return cached.report.model_copy(
+            update={"assembly_id": assembly.assembly_id, "generated_at": self._generated_at()},
+            deep=True,
+        )
+
+    def _checkers(self) -> List[Tuple[str, Any]]:
+        """Domain checkers in report order."""
+        return [
+            ("mechanical", self._check_mechanical_rules),
+            ("electrical", self._check_electrical_rules),
+            ("standards", self._check_standards_rules),
+            ("labeling", self._check_labeling_rules),
+            ("consistency", self._check_consistency_rules),
         ]
 
-        for checker in checkers:
-            checker_findings, checker_fixes = checker(assembly)
+    def _report(
+        self, assembly: AssemblySchema, plan: RulePlan, domains: DomainResults, cpu_s: float,
+        content_hash: Optional[str],
+    ) -> DRCReport:
+        """Report from per-domain results (in checker order); cached under ``content_hash`` unless it is None.
+
+        ``cpu_s`` is the CPU time the checkers took, on every thread and process.
+        """
+        ruleset_id = plan.id
+        version = plan.version
+        findings: List[DRCFinding] = []
+        fixes: List[DRCFix] = []
+        for checker_findings, checker_fixes in domains.values():
             findings.extend(checker_findings)
             fixes.extend(checker_fixes)
 
@@ -89,71 +322,154 @@ class DRCEngine:
 
         report = DRCReport(
             assembly_id=assembly.assembly_id,
-            ruleset_id=ruleset_id or self.DEFAULT_RULESET["id"],
-            version=self.DEFAULT_RULESET["version"],
+            ruleset_id=ruleset_id,
+            version=version,
             passed=passed,
             errors=errors,
             warnings=warnings,
             findings=findings,
             fixes=fixes,
-            generated_at=datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+            generated_at=self._generated_at(),
         )
 
+        if content_hash is not None:
+            self.report_cache.put(content_hash, ruleset_id, version, CachedReport(report, domains, cpu_s))
         return report
 
-    def apply_fixes(
-        self,
-        assembly: AssemblySchema,
-        fix_ids: List[str],
-        ruleset_id: Optional[str] = None,
-    ) -> Tuple[AssemblySchema, DRCReport]:
-        assembly = self._ensure_schema(assembly)
-        working = deepcopy(assembly.model_dump(mode="python"))
-
-        for fix_id in fix_ids:
-            if fix_id == "FIX_LABEL_OFFSET_DEFAULT":
-                labels = working.setdefault("labels", {})
-                labels["offset_mm"] = self.LABEL_OFFSET_DEFAULT
-            elif fix_id.startswith("FIX_CLAMP_ADJUST_"):
-                clamp_id = fix_id.split("FIX_CLAMP_ADJUST_", 1)[1]
-                self._apply_clamp_adjustment(working, clamp_id)
-            elif fix_id.startswith("FIX_CONTACT_PLATING_"):
-                end_key = fix_id.split("FIX_CONTACT_PLATING_", 1)[1].lower()
-                self._apply_contact_plating_upgrade(working, end_key)
-            elif fix_id.startswith("FIX_ADD_HEAT_SHRINK_"):
-                end_key = fix_id.split("FIX_ADD_HEAT_SHRINK_", 1)[1].lower()
-                self._apply_heat_shrink(working, end_key)
-
-        data_for_hash = deepcopy(working)
-        data_for_hash.pop("schema_hash", None)
-        normalized = json.dumps(data_for_hash, sort_keys=True, separators=(",", ":")).encode("utf-8")
-        schema_hash = hashlib.sha1(normalized).hexdigest()
+    def close(self) -> None:
+        """Shut down the checker pool, if one was started."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Process workers get the engine once per run, in shared memory; the store and caches stay here
+        return {"executor_mode": "serial", "wirelist_chunk": self.wirelist_chunk}
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.executor_mode == "serial":
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                pool = ThreadPoolExecutor if self.executor_mode == "thread" else ProcessPoolExecutor
+                self._executor = pool(max_workers=self.workers)
+            return self._executor
+
+    def _iter_checkers(
+        self, features: AssemblyFeatures, plan: RulePlan, checkers: List[Tuple[str, Any]]
+    ) -> Iterator[Tuple[str, Tuple[List[DRCFinding], List[DRCFix]], float]]:
+        """``(domain, results, cpu_s)`` for ``checkers``, each result identical to calling the checker.
+
+        Serially, domains come in ``checkers`` order and ``cpu_s`` is 0, as the
+        work is on the caller's thread. On a pool, every domain is a separate
+        task and comes as soon as it finishes, with the CPU seconds its tasks
+        took on the workers; the consistency wirelist pass is split into
+        ``wirelist_chunk``-row partitions whose findings are concatenated in
+        wirelist order. Process workers receive the features and plan once
+        per run, through a shared memory block, rather than with every task.
+
+        With OTEL_DRC_RULE_TIMING on, each domain is timed; on a pool, from
+        submission until its results are collected.
+        """
+        executor = self._get_executor()
+        timer = rule_timer(plan.id)
+        if executor is None:
+            for domain, checker in checkers:
+                yield domain, checker(features, plan) if timer is None else timer(domain, checker, features, plan), 0.0
+            return
 
-        working["schema_hash"] = schema_hash
-        updated = AssemblySchema.model_validate(working)
-        self.remember(updated)
+        memory = None
+        if self.executor_mode == "process":
+            payload = pickle.dumps((self, features, plan), protocol=pickle.HIGHEST_PROTOCOL)
+            memory = shared_memory.SharedMemory(create=True, size=len(payload))
+            memory.buf[:len(payload)] = payload
+        try:
+            submit = self._submitter(executor, memory, features, plan)
+            waiting: Dict[str, Any] = {}
+            submitted: Dict[str, int] = {}
+            for domain, checker in checkers:
+                submitted[domain] = time.time_ns()
+                if getattr(checker, "__func__", None) is type(self)._check_consistency_rules:
+                    waiting[domain] = self._submit_consistency(submit, features)
+                else:
+                    waiting[domain] = submit(checker)
+            while waiting:
+                wait([future for handle in waiting.values() for future in self._futures(handle)], return_when=FIRST_COMPLETED)
+                for domain, handle in list(waiting.items()):
+                    if all(future.done() for future in self._futures(handle)):
+                        del waiting[domain]
+                        results, cpu_s = self._merge_consistency(handle) if isinstance(handle, tuple) else handle.result()
+                        if timer is not None:
+                            timer.record(domain, submitted[domain], time.time_ns(), results)
+                        yield domain, results, cpu_s
+        finally:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+
+    def _submitter(
+        self, executor: Executor, memory: Optional[shared_memory.SharedMemory], features: AssemblyFeatures, plan: RulePlan
+    ) -> Callable[..., Future]:
+        """``submit(checker, wires=None)``: a future of ``(results, cpu_s)`` for one checker task."""
+        def submit(checker: Callable[..., Any], wires: Optional[Tuple[int, int]] = None) -> Future:
+            if memory is not None:
+                return executor.submit(_shared_task, memory.name, checker.__name__, wires)
+            if wires is None:
+                return executor.submit(_timed, checker, features, plan)
+            return executor.submit(_timed, checker, plan, features.locale, features.wires[wires[0]:wires[1]])
+        return submit
+
+    def _futures(self, handle: Any) -> List[Future]:
+        if isinstance(handle, tuple):
+            markings, wire_colors, terminations = handle
+            return [markings, *wire_colors, terminations]
+        return [handle]
+
+    def _submit_consistency(
+        self, submit: Callable[..., Future], features: AssemblyFeatures
+    ) -> Tuple[Future, List[Future], Future]:
+        count = len(features.wires)
+        return (
+            submit(self._check_consistency_markings),
+            [
+                submit(self._check_wire_colors, (start, start + self.wirelist_chunk))
+                for start in range(0, count, self.wirelist_chunk)
+            ],
+            submit(self._check_consistency_terminations),
+        )
 
-        report = self.run_drc(updated, ruleset_id)
-        return updated, report
+    def _merge_consistency(
+        self, futures: Tuple[Future, List[Future], Future]
+    ) -> Tuple[Tuple[List[DRCFinding], List[DRCFix]], float]:
+        markings, wire_colors, terminations = futures
+        (findings, fixes), cpu_s = markings.result()
+        for partition in wire_colors:
+            partition_findings, partition_cpu_s = partition.result()
+            findings.extend(partition_findings)
+            cpu_s += partition_cpu_s
+        (termination_findings, termination_fixes), termination_cpu_s = terminations.result()
+        return (findings + termination_findings, fixes + termination_fixes), cpu_s + termination_cpu_s
 
     # ---------------------------------------------------------------------
     # Mechanical domain
     # ---------------------------------------------------------------------
-    def _check_mechanical_rules(self, assembly: AssemblySchema) -> Tuple[List[DRCFinding], List[DRCFix]]:
+    def _check_mechanical_rules(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
         findings: List[DRCFinding] = []
         fixes: List[DRCFix] = []
 
-        cable = assembly.cable
-        conductors = assembly.conductors
-        endpoints = assembly.endpoints or {}
+        cable = features.cable
+        endpoints = features.endpoints
 
-        cable_type = cable.get("type", "")
-        conductor_count = conductors.get("count") or len(assembly.wirelist)
-        ribbon = conductors.get("ribbon") or {}
+        cable_type = features.cable_type
+        conductor_count = features.conductor_count
+        ribbon = features.ribbon
         ribbon_ways = ribbon.get("ways")
         expected_positions = ribbon_ways if cable_type == "ribbon" and ribbon_ways else conductor_count
 
-        for end_name, endpoint in endpoints.items():
+        for end_name, endpoint in endpoints.items() if plan.enabled("MECH_CONNECTOR_POSITIONS") else ():
             connector = endpoint.get("connector") or {}
             positions = connector.get("positions")
             if positions is None:
@@ -173,13 +489,17 @@ class DRCEngine:
                     )
                 )
 
-        environment = cable.get("environment") or {}
-        flex_class = environment.get("flex_class", "static")
+        flex_class = features.environment.get("flex_class", "static")
         design_radius = cable.get("bend_radius_mm")
         recommended_radius = cable.get("min_bend_radius_mm") or self._recommended_bend_radius(
-            cable_type, cable.get("od_mm"), ribbon
+            plan, cable_type, features.od_mm, ribbon
         )
-        if design_radius is not None and recommended_radius is not None and design_radius < recommended_radius:
+        if (
+            plan.enabled("MECH_BEND_RADIUS")
+            and design_radius is not None
+            and recommended_radius is not None
+            and design_radius < recommended_radius
+        ):
             severity = "error" if flex_class != "static" else "warning"
             findings.append(
                 DRCFinding(
@@ -195,8 +515,8 @@ class DRCEngine:
                 )
             )
 
-        cable_od = cable.get("od_mm")
-        for end_name, endpoint in endpoints.items():
+        cable_od = features.od_mm
+        for end_name, endpoint in endpoints.items() if plan.enabled("MECH_CLAMP_RANGE") else ():
             for index, accessory in enumerate(endpoint.get("accessories", []) or []):
                 clamp = accessory.get("clamp")
                 if not clamp or cable_od is None:
@@ -217,7 +537,7 @@ class DRCEngine:
                     delta = cable_od - max_od
                     direction = "above"
 
-                severity = "warning" if delta <= self.CLAMP_TOLERANCE_MM else "error"
+                severity = "warning" if delta <= plan.clamp_tolerance_mm else "error"
                 findings.append(
                     DRCFinding(
                         id=f"MECH_CLAMP_RANGE_{end_name.upper()}_{index}",
@@ -251,31 +571,29 @@ class DRCEngine:
     # ---------------------------------------------------------------------
     # Electrical domain
     # ---------------------------------------------------------------------
-    def _check_electrical_rules(self, assembly: AssemblySchema) -> Tuple[List[DRCFinding], List[DRCFix]]:
+    def _check_electrical_rules(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
         findings: List[DRCFinding] = []
         fixes: List[DRCFix] = []
 
-        cable = assembly.cable
-        conductors = assembly.conductors
-        endpoints = assembly.endpoints or {}
+        endpoints = features.endpoints
 
-        awg = conductors.get("awg")
-        electrical = cable.get("electrical") or {}
-        per_circuit = electrical.get("per_circuit") or []
-        system_voltage = electrical.get("system_voltage_v")
-        env = cable.get("environment") or {}
+        awg = features.conductors.get("awg")
+        per_circuit = features.per_circuit
+        system_voltage = features.system_voltage_v
+        env = features.environment
         temp_max = env.get("temp_max_c")
-        ratings = cable.get("ratings") or {}
-        rating_voltage = ratings.get("voltage_v")
-        rating_temp = ratings.get("temp_c")
+        rating_voltage = features.ratings.get("voltage_v")
+        rating_temp = features.ratings.get("temp_c")
 
-        max_current = max((circuit.get("current_a", 0.0) for circuit in per_circuit), default=0.0)
-        loaded_circuits = sum(1 for circuit in per_circuit if circuit.get("current_a", 0.0) > 0.0)
+        max_current = features.max_current_a
+        loaded_circuits = features.loaded_circuits
 
-        if awg in self.AMPACITY_TABLE and per_circuit:
-            ampacity = self.AMPACITY_TABLE[awg]
-            bundle_factor = 0.8 if loaded_circuits > 3 else 1.0
-            allowable = ampacity * bundle_factor * 0.8  # 20% design margin
+        if plan.enabled("ELEC_AMPACITY_MARGIN") and awg in plan.ampacity and per_circuit:
+            ampacity = plan.ampacity[awg]
+            bundle_factor = plan.bundle_factor if loaded_circuits >= plan.bundle_min_loaded_circuits else 1.0
+            allowable = ampacity * bundle_factor * plan.design_margin
             if max_current > allowable:
                 findings.append(
                     DRCFinding(
@@ -291,7 +609,7 @@ class DRCEngine:
                     )
                 )
 
-        if system_voltage and rating_voltage and rating_voltage < system_voltage:
+        if plan.enabled("ELEC_VOLTAGE_RATING") and system_voltage and rating_voltage and rating_voltage < system_voltage:
             findings.append(
                 DRCFinding(
                     id="ELEC_VOLTAGE_RATING",
@@ -303,7 +621,7 @@ class DRCEngine:
                 )
             )
 
-        if rating_temp and temp_max and rating_temp < temp_max:
+        if plan.enabled("ELEC_TEMPERATURE_RATING") and rating_temp and temp_max and rating_temp < temp_max:
             findings.append(
                 DRCFinding(
                     id="ELEC_TEMPERATURE_RATING",
@@ -317,9 +635,9 @@ class DRCEngine:
                 )
             )
 
-        shield = assembly.shield or {}
+        shield = features.shield
         drain_policy = shield.get("drain_policy")
-        if shield.get("type") and shield.get("type") != "none" and drain_policy:
+        if plan.enabled("ELEC_SHIELD_POLICY") and shield.get("type") and shield.get("type") != "none" and drain_policy:
             for end_name, endpoint in endpoints.items():
                 termination_policy = endpoint.get("shield_termination")
                 if termination_policy and termination_policy != drain_policy:
@@ -338,8 +656,8 @@ class DRCEngine:
                     )
 
         chemicals = env.get("chemicals") or []
-        low_level_signal = max_current <= 1.0
-        if chemicals and low_level_signal:
+        low_level_signal = max_current <= plan.max_signal_current_a
+        if plan.enabled("ELEC_CONTACT_PLATING") and chemicals and low_level_signal:
             for end_name, endpoint in endpoints.items():
                 contacts = (endpoint.get("contacts") or {}).get("primary") or {}
                 plating = contacts.get("plating")
@@ -373,13 +691,14 @@ class DRCEngine:
     # ---------------------------------------------------------------------
     # Standards domain
     # ---------------------------------------------------------------------
-    def _check_standards_rules(self, assembly: AssemblySchema) -> Tuple[List[DRCFinding], List[DRCFix]]:
+    def _check_standards_rules(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
         findings: List[DRCFinding] = []
-        cable = assembly.cable
-        compliance = cable.get("compliance") or {}
+        compliance = features.compliance
 
         ipc_class = compliance.get("ipc_class")
-        if not ipc_class:
+        if plan.enabled("STD_IPC_CLASS") and not ipc_class:
             findings.append(
                 DRCFinding(
                     id="STD_IPC_CLASS",
@@ -391,7 +710,7 @@ class DRCEngine:
                 )
             )
 
-        if compliance.get("rohs_reach") is not True:
+        if plan.enabled("STD_ROHS_REACH") and compliance.get("rohs_reach") is not True:
             findings.append(
                 DRCFinding(
                     id="STD_ROHS_REACH",
@@ -403,8 +722,8 @@ class DRCEngine:
                 )
             )
 
-        labels = assembly.labels or {}
-        if labels and compliance.get("ul94_v0_labels") is not True:
+        labels = features.labels
+        if plan.enabled("STD_UL94_V0") and labels and compliance.get("ul94_v0_labels") is not True:
             findings.append(
                 DRCFinding(
                     id="STD_UL94_V0",
@@ -421,16 +740,17 @@ class DRCEngine:
     # ---------------------------------------------------------------------
     # Labeling domain
     # ---------------------------------------------------------------------
-    def _check_labeling_rules(self, assembly: AssemblySchema) -> Tuple[List[DRCFinding], List[DRCFix]]:
+    def _check_labeling_rules(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
         findings: List[DRCFinding] = []
         fixes: List[DRCFix] = []
 
-        labels = assembly.labels or {}
+        labels = features.labels
 
         title_block = labels.get("title_block") or {}
-        required_fields = ["pn", "rev", "mfr", "date"]
-        missing_fields = [field for field in required_fields if not title_block.get(field)]
-        if missing_fields:
+        missing_fields = [field for field in plan.title_block_fields if not title_block.get(field)]
+        if plan.enabled("LAB_TITLE_BLOCK") and missing_fields:
             findings.append(
                 DRCFinding(
                     id="LAB_TITLE_BLOCK",
@@ -443,9 +763,8 @@ class DRCEngine:
             )
 
         label_text = labels.get("text", "") or ""
-        expected_tokens = ["PN", "REV", "MFR"]
-        missing_tokens = [token for token in expected_tokens if token not in label_text.upper()]
-        if missing_tokens or not any(char.isdigit() for char in label_text):
+        missing_tokens = [token for token in plan.label_tokens if token not in label_text.upper()]
+        if plan.enabled("LAB_TEXT_CONTENT") and (missing_tokens or not any(char.isdigit() for char in label_text)):
             findings.append(
                 DRCFinding(
                     id="LAB_TEXT_CONTENT",
@@ -458,14 +777,15 @@ class DRCEngine:
             )
 
         offset = labels.get("offset_mm")
-        if offset is None:
+        low, high = plan.label_offset_range
+        if offset is None and plan.enabled("LAB_OFFSET_MISSING"):
             findings.append(
                 DRCFinding(
                     id="LAB_OFFSET_MISSING",
                     severity="warning",
                     domain="labeling",
                     code="LABEL_OFFSET_MISSING",
-                    message="Label offset not specified; defaulting to 30mm from end.",
+                    message=f"Label offset not specified; defaulting to {plan.label_offset_default}mm from end.",
                     where="labels.offset_mm",
                 )
             )
@@ -473,12 +793,12 @@ class DRCEngine:
                 DRCFix(
                     id="FIX_LABEL_OFFSET_DEFAULT",
                     label="Apply default label offset",
-                    description="Set label offset to default 30mm from connector datum.",
+                    description=f"Set label offset to default {plan.label_offset_default}mm from connector datum.",
                     applies_to=["labels.offset_mm"],
                     effect="non_destructive",
                 )
             )
-        elif not (self.LABEL_OFFSET_RANGE[0] <= offset <= self.LABEL_OFFSET_RANGE[1]):
+        elif offset is not None and plan.enabled("LAB_OFFSET_RANGE") and not (low <= offset <= high):
             findings.append(
                 DRCFinding(
                     id="LAB_OFFSET_RANGE",
@@ -486,8 +806,7 @@ class DRCEngine:
                     domain="labeling",
                     code="LABELING/OFFSET_RANGE",
                     message=(
-                        f"Label offset {offset}mm outside recommended range "
-                        f"{self.LABEL_OFFSET_RANGE[0]}-{self.LABEL_OFFSET_RANGE[1]}mm."
+                        f"Label offset {offset}mm outside recommended range {low}-{high}mm."
                     ),
                     where="labels.offset_mm",
                 )
@@ -498,17 +817,26 @@ class DRCEngine:
     # ---------------------------------------------------------------------
     # Consistency domain
     # ---------------------------------------------------------------------
-    def _check_consistency_rules(self, assembly: AssemblySchema) -> Tuple[List[DRCFinding], List[DRCFix]]:
+    def _check_consistency_rules(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
+        findings, fixes = self._check_consistency_markings(features, plan)
+        findings.extend(self._check_wire_colors(plan, features.locale, features.wires))
+        termination_findings, termination_fixes = self._check_consistency_terminations(features, plan)
+        findings.extend(termination_findings)
+        fixes.extend(termination_fixes)
+        return findings, fixes
+
+    def _check_consistency_markings(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
         findings: List[DRCFinding] = []
         fixes: List[DRCFix] = []
 
-        cable = assembly.cable
-        conductors = assembly.conductors
-        endpoints = assembly.endpoints or {}
+        endpoints = features.endpoints
 
-        if cable.get("type") == "ribbon":
-            ribbon = conductors.get("ribbon") or {}
-            if not ribbon.get("red_stripe", False):
+        if plan.enabled("CONSIST_RIBBON_STRIPE") and features.cable_type == "ribbon":
+            if not features.ribbon.get("red_stripe", False):
                 findings.append(
                     DRCFinding(
                         id="CONSIST_RIBBON_STRIPE",
@@ -520,7 +848,7 @@ class DRCEngine:
                     )
                 )
 
-        for end_name, endpoint in endpoints.items():
+        for end_name, endpoint in endpoints.items() if plan.enabled("CONSIST_PIN1") else ():
             connector = endpoint.get("connector") or {}
             if connector and connector.get("pin1_indicator") is not True:
                 findings.append(
@@ -534,24 +862,37 @@ class DRCEngine:
                     )
                 )
 
-        locale = cable.get("locale")
-        if locale == "EU":
-            for wire in assembly.wirelist:
-                circuit = (wire.get("circuit") or "").upper()
-                color = (wire.get("color") or "").upper()
-                if circuit in ("L", "N", "PE") and not self._is_eu_color_correct(circuit, color):
+        return findings, fixes
+
+    def _check_wire_colors(
+        self, plan: RulePlan, locale: Optional[str], wires: List[Wire]
+    ) -> List[DRCFinding]:
+        findings: List[DRCFinding] = []
+
+        circuit_colors = plan.locale_colors.get(locale) if plan.enabled("CONSIST_COLOR") else None
+        if circuit_colors:
+            for conductor, circuit, color in wires:
+                if circuit in circuit_colors and color not in circuit_colors[circuit]:
                     findings.append(
                         DRCFinding(
                             id=f"CONSIST_COLOR_{circuit}",
                             severity="warning",
                             domain="consistency",
                             code="CONSISTENCY/LOCALE_COLOR",
-                            message=f"EU locale requires {circuit} circuit colors to follow IEC standard.",
-                            where=f"wirelist[{wire.get('conductor', 0)}].color",
+                            message=f"{locale} locale requires {circuit} circuit colors to follow IEC standard.",
+                            where=f"wirelist[{conductor}].color",
                         )
                     )
 
-        for end_name, endpoint in endpoints.items():
+        return findings
+
+    def _check_consistency_terminations(
+        self, features: AssemblyFeatures, plan: RulePlan
+    ) -> Tuple[List[DRCFinding], List[DRCFix]]:
+        findings: List[DRCFinding] = []
+        fixes: List[DRCFix] = []
+
+        for end_name, endpoint in features.endpoints.items():
             if endpoint.get("termination") == "ring_lug":
                 lugs = endpoint.get("lugs") or []
                 missing_stud = False
@@ -559,7 +900,7 @@ class DRCEngine:
                     if not lug.get("stud"):
                         missing_stud = True
                         break
-                if not lugs or missing_stud:
+                if plan.enabled("CONSIST_STUD_SIZE") and (not lugs or missing_stud):
                     findings.append(
                         DRCFinding(
                             id=f"CONSIST_STUD_SIZE_{end_name.upper()}",
@@ -572,7 +913,7 @@ class DRCEngine:
                     )
 
                 needs_heat_shrink = endpoint.get("requires_heat_shrink")
-                if needs_heat_shrink and not endpoint.get("heat_shrink"):
+                if plan.enabled("CONSIST_HEAT_SHRINK") and needs_heat_shrink and not endpoint.get("heat_shrink"):
                     fixes.append(
                         DRCFix(
                             id=f"FIX_ADD_HEAT_SHRINK_{end_name.upper()}",
@@ -603,6 +944,9 @@ class DRCEngine:
             return assembly
         return AssemblySchema.model_validate(assembly)
 
+    def _generated_at(self) -> str:
+        return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
     def _dedupe_findings(self, findings: List[DRCFinding]) -> List[DRCFinding]:
         unique: Dict[Tuple[str, Optional[str]], DRCFinding] = {}
         for finding in findings:
@@ -619,6 +963,7 @@ class DRCEngine:
 
     def _recommended_bend_radius(
         self,
+        plan: RulePlan,
         cable_type: str,
         od_mm: Optional[float],
         ribbon: Dict[str, Any],
@@ -626,44 +971,46 @@ class DRCEngine:
         if cable_type == "ribbon":
             pitch = ribbon.get("pitch_in")
             if isinstance(pitch, (int, float)):
-                return self.RIBBON_BEND_TABLE_MM.get(float(pitch), 10.0)
-            return 10.0
+                return plan.ribbon_bend_mm.get(float(pitch), plan.ribbon_bend_default_mm)
+            return plan.ribbon_bend_default_mm
         if od_mm is not None:
-            return round(8.0 * float(od_mm), 2)
+            multiplier = plan.od_bend_multipliers.get(cable_type, plan.od_bend_default)
+            return round(multiplier * float(od_mm), 2)
         return None
 
-    def _is_eu_color_correct(self, circuit: str, color: str) -> bool:
-        eu_colors = {
-            "L": {"BROWN", "BLACK"},
-            "N": {"BLUE"},
-            "PE": {"GREEN/YELLOW", "GREEN-YELLOW", "GREEN/YEL"},
-        }
-        return color in eu_colors.get(circuit, set())
+    def _paths_overlap(self, a: str, b: str) -> bool:
+        """True if one path is a prefix of the other, with ``*`` matching any segment."""
+        segments_a = a.replace("[", ".").replace("]", "").split(".")
+        segments_b = b.replace("[", ".").replace("]", "").split(".")
+        return all(x == y or "*" in (x, y) for x, y in zip(segments_a, segments_b))
+
+    # Fix helpers return the schema paths they wrote.
 
-    def _apply_clamp_adjustment(self, data: Dict[str, Any], clamp_id: str) -> None:
-        cable_od = data.get("cable", {}).get("od_mm")
+    def _apply_clamp_adjustment(self, patch: SchemaPatch, clamp_id: str) -> List[str]:
+        cable_od = patch.get("cable", "od_mm")
         if cable_od is None:
-            return
+            return []
 
-        for endpoint in (data.get("endpoints") or {}).values():
-            for accessory in endpoint.get("accessories", []) or []:
+        for end_name, endpoint in (patch.get("endpoints") or {}).items():
+            for index, accessory in enumerate(endpoint.get("accessories", []) or []):
                 mpn = accessory.get("mpn") or ""
                 if mpn == clamp_id:
-                    clamp = accessory.setdefault("clamp", {})
+                    clamp = patch.writable("endpoints", end_name, "accessories", index, "clamp")
                     clamp["min_od_mm"] = min(clamp.get("min_od_mm", cable_od), cable_od - 0.05)
                     clamp["max_od_mm"] = max(clamp.get("max_od_mm", cable_od), cable_od + 0.05)
-                    return
+                    return [f"endpoints.{end_name}.accessories[{index}].clamp"]
+        return []
 
-    def _apply_contact_plating_upgrade(self, data: Dict[str, Any], end_key: str) -> None:
-        endpoint = (data.get("endpoints") or {}).get(end_key)
-        if not endpoint:
-            return
-        contacts = endpoint.setdefault("contacts", {})
-        primary = contacts.setdefault("primary", {})
+    def _apply_contact_plating_upgrade(self, patch: SchemaPatch, end_key: str) -> List[str]:
+        if not patch.get("endpoints", end_key):
+            return []
+        primary = patch.writable("endpoints", end_key, "contacts", "primary")
         primary["plating"] = "gold-flash"
+        return [f"endpoints.{end_key}.contacts.primary.plating"]
 
-    def _apply_heat_shrink(self, data: Dict[str, Any], end_key: str) -> None:
-        endpoint = (data.get("endpoints") or {}).get(end_key)
-        if not endpoint:
-            return
+    def _apply_heat_shrink(self, patch: SchemaPatch, end_key: str) -> List[str]:
+        if not patch.get("endpoints", end_key):
+            return []
+        endpoint = patch.writable("endpoints", end_key)
         endpoint["heat_shrink"] = True
+        return [f"endpoints.{end_key}.heat_shrink"]
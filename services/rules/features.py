@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .models import AssemblySchema
+
+
+class Wire(NamedTuple):
+    conductor: Any
+    # Upper-cased, "" when missing
+    circuit: str
+    color: str
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Wire":
+        return cls(row.get("conductor", 0), (row.get("circuit") or "").upper(), (row.get("color") or "").upper())
+
+
+class AssemblyFeatures:
+    """Everything the domain checkers read from an assembly, extracted once.
+
+    Checkers take these instead of the raw schema, so evaluating the same
+    revision against several rulesets resolves sections, defaults and
+    derived values (circuit currents, normalised wire colours) only once.
+    """
+
+    def __init__(self, assembly: AssemblySchema) -> None:
+        self.assembly = assembly
+        self.cable: Dict[str, Any] = assembly.cable
+        self.conductors: Dict[str, Any] = assembly.conductors
+        self.endpoints: Dict[str, Any] = assembly.endpoints or {}
+        self.shield: Dict[str, Any] = assembly.shield or {}
+        self.labels: Dict[str, Any] = assembly.labels or {}
+
+        cable = self.cable
+        self.cable_type: str = cable.get("type", "")
+        self.locale: Optional[str] = cable.get("locale")
+        self.od_mm: Optional[float] = cable.get("od_mm")
+        self.environment: Dict[str, Any] = cable.get("environment") or {}
+        self.ratings: Dict[str, Any] = cable.get("ratings") or {}
+        self.compliance: Dict[str, Any] = cable.get("compliance") or {}
+
+        self.ribbon: Dict[str, Any] = self.conductors.get("ribbon") or {}
+        self.conductor_count = self.conductors.get("count") or len(assembly.wirelist)
+
+        electrical = cable.get("electrical") or {}
+        self.per_circuit: List[Dict[str, Any]] = electrical.get("per_circuit") or []
+        self.system_voltage_v = electrical.get("system_voltage_v")
+        self.max_current_a = max((circuit.get("current_a", 0.0) for circuit in self.per_circuit), default=0.0)
+        self.loaded_circuits = sum(1 for circuit in self.per_circuit if circuit.get("current_a", 0.0) > 0.0)
+
+        self._wires: Optional[List[Wire]] = None
+
+    @property
+    def wires(self) -> List[Wire]:
+        """Wirelist rows with upper-cased circuit and colour, built on first use."""
+        if self._wires is None:
+            self._wires = [Wire.from_row(wire) for wire in self.assembly.wirelist]
+        return self._wires
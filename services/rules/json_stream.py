@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Iterable, Optional, Tuple
+
+# (kind, section, value): ("section", name, value) for a fully parsed member,
+# ("row", name, row) for each element of a streamed array, ("end", name, rows)
+StreamEvent = Tuple[str, str, Any]
+
+_WHITESPACE = " \t\r\n"
+# Largest single member or row accepted, in characters
+MAX_VALUE_CHARS = 16 * 1024 * 1024
+
+# What decides where a value ends: brackets and quotes outside strings, the
+# closing quote (or an escape) inside one, and a delimiter after a scalar
+_CONTAINER_TOKEN = re.compile(r'[{}\[\]"]')
+_STRING_TOKEN = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+class StreamParseError(ValueError):
+    """The request body is not a single well-formed JSON object."""
+
+
+class _Reader:
+    """Character-level view over an async stream of byte chunks.
+
+    Consumed text is dropped as parsing advances, so the buffer only ever
+    holds the value being decoded plus one chunk. A value is decoded once it
+    is whole; finding its end resumes where the previous chunk left off, so
+    a value spread over many chunks is scanned and decoded once.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], max_value_chars: int = MAX_VALUE_CHARS) -> None:
+        self._max_value_chars = max_value_chars
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        # Where the value at _pos has been scanned up to, and the scan's state
+        self._scan_at = 0
+        self._scanning = False
+        self._scalar = False
+        self._in_string = False
+        self._depth = 0
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._buffer = self._buffer[self._pos:] + self._decoder.decode(b"", final=True)
+            self._scan_at -= self._pos
+            self._pos = 0
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(chunk)
+        self._scan_at -= self._pos
+        self._pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of input."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                return ""
+
+    async def next_char(self) -> str:
+        char = await self.peek()
+        self._pos += len(char)
+        return char
+
+    async def expect(self, expected: str) -> None:
+        char = await self.next_char()
+        if char != expected:
+            raise StreamParseError(f"Expected {expected!r} but found {char or 'end of input'!r}")
+
+    async def value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it is whole."""
+        await self.peek()
+        self._scan_at = self._pos
+        self._scanning = False
+        # At end of input, decoding what is left reports a truncated value
+        while self._value_end() is None:
+            if len(self._buffer) - self._pos > self._max_value_chars:
+                raise StreamParseError(f"JSON value exceeds {self._max_value_chars} characters")
+            if not await self._fill():
+                break
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as exc:
+            raise StreamParseError(str(exc)) from exc
+        self._pos = end
+        return value
+
+    def _value_end(self) -> Optional[int]:
+        """End of the value starting at ``_pos`` if the buffer holds all of it, else None.
+
+        Only structure is tracked; ``raw_decode`` validates the value once it is whole.
+        """
+        buffer, i = self._buffer, self._scan_at
+        if i >= len(buffer):
+            return None
+        if not self._scanning:
+            self._scanning = True
+            self._scalar = buffer[i] not in '{["'
+            self._in_string = False
+            self._depth = 0
+        if self._scalar:
+            # A number (or literal) ending at the buffer edge may continue in the next chunk
+            match = _SCALAR_END.search(buffer, i)
+            self._scan_at = len(buffer) if match is None else match.start()
+            return None if match is None else match.start()
+        while True:
+            if self._in_string:
+                match = _STRING_TOKEN.search(buffer, i)
+                if match is None:
+                    self._scan_at = len(buffer)
+                    return None
+                i = match.start()
+                if buffer[i] == "\\":
+                    if i + 1 >= len(buffer):
+                        self._scan_at = i
+                        return None
+                    i += 2
+                    continue
+                self._in_string = False
+                i += 1
+                if self._depth == 0:
+                    return i
+                continue
+            match = _CONTAINER_TOKEN.search(buffer, i)
+            if match is None:
+                self._scan_at = len(buffer)
+                return None
+            i = match.end()
+            token = match.group()
+            if token == '"':
+                self._in_string = True
+            elif token in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return i
+
+
+async def iter_object(
+    chunks: AsyncIterator[bytes], streamed: Iterable[str], max_value_chars: int = MAX_VALUE_CHARS
+) -> AsyncIterator[StreamEvent]:
+    """Parse one JSON object incrementally from ``chunks``.
+
+    Members named in ``streamed`` must be arrays; their elements are yielded
+    one at a time as "row" events and never held together in memory. Every
+    other member is decoded whole and yielded as a "section" event.
+    """
+    streamed = frozenset(streamed)
+    reader = _Reader(chunks, max_value_chars)
+
+    await reader.expect("{")
+    if await reader.peek() == "}":
+        await reader.next_char()
+    else:
+        while True:
+            name = await reader.value()
+            if not isinstance(name, str):
+                raise StreamParseError("Object keys must be strings")
+            await reader.expect(":")
+            if name in streamed:
+                rows = 0
+                await reader.expect("[")
+                if await reader.peek() == "]":
+                    await reader.next_char()
+                else:
+                    while True:
+                        yield "row", name, await reader.value()
+                        rows += 1
+                        separator = await reader.next_char()
+                        if separator == "]":
+                            break
+                        if separator != ",":
+                            raise StreamParseError(f"Expected ',' or ']' in {name} but found {separator!r}")
+                yield "end", name, rows
+            else:
+                yield "section", name, await reader.value()
+
+            separator = await reader.next_char()
+            if separator == "}":
+                break
+            if separator != ",":
+                raise StreamParseError(f"Expected ',' or '}}' but found {separator or 'end of input'!r}")
+
+    if await reader.peek():
+        raise StreamParseError("Unexpected data after the JSON object")
@@ -1,27 +1,86 @@
-from typing import Union
+from contextlib import asynccontextmanager
+from typing import Optional, Union
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
 from drc_engine import DRCEngine
 from models import (
     AssemblySchema,
     DRCApplyFixesRequest,
     DRCApplyFixesResponse,
+    DRCMultiReport,
     DRCReport,
     DRCRunRequest,
     RulesetsResponse,
 )
-
-app = FastAPI(title="DRC Rules Service", version="1.0.0")
+from rule_registry import UnknownRulesetError
+from service_common import metrics
+from service_common.framing import NDJSON, encode_events, stream_media_type
+from service_common.rule_timing import rule_timings
+from streaming import BodyStreamingResponse, StreamingRun, stream_drc
 
 drc_engine = DRCEngine()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stops the checker pool's threads or worker processes
+    drc_engine.close()
+
+
+app = FastAPI(title="DRC Rules Service", version="1.0.0", lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
+
+
+@metrics.registry.collector
+def engine_metrics():
+    """Cache, store and rule-timing figures kept by the engine."""
+    cache = drc_engine.report_cache.stats()
+    cache["saved_cpu_seconds"] = cache.pop("saved_cpu_s")
+    yield from metrics.stats_families(
+        "rules_report_cache", cache, "DRC report cache",
+        counters=("hits", "misses", "evictions", "invalidations", "saved_cpu_seconds"),
+    )
+    yield from metrics.stats_families(
+        "rules_assembly_store", drc_engine.store.stats(), "Assembly store",
+        counters=("hits", "misses", "backend_hits", "evictions"),
+    )
+    yield from metrics.rule_timing_families(rule_timings.snapshot(), rule_timings.buckets_ms)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "service": "rules"}
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Runtime metrics in the Prometheus text format."""
+    # Async so the threadpool collector reads the limiter from the event loop
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/drc/store/stats")
+def assembly_store_stats():
+    """Return assembly store size, memory and eviction counters."""
+    return drc_engine.store.stats()
+
+
+@app.get("/drc/report-cache/stats")
+def report_cache_stats():
+    """Return DRC report cache hit ratio and CPU time saved."""
+    return drc_engine.report_cache.stats()
+
+
+@app.post("/drc/schema-digest")
+def schema_digest(assembly: AssemblySchema):
+    """Return the Merkle root and per-section digests of an assembly."""
+    digest = drc_engine.schema_digest(assembly)
+    return {"assembly_id": assembly.assembly_id, "root": digest.root, "sections": digest.sections}
+
+
 @app.get("/drc/rulesets", response_model=RulesetsResponse)
 def get_rulesets():
     """Return available rulesets."""
@@ -32,9 +91,16 @@ def get_rulesets():
         raise HTTPException(status_code=500, detail=f"Failed to load DRC rulesets: {exc}") from exc
 
 
-@app.post("/drc/run", response_model=DRCReport)
-def run_drc(request: Union[DRCRunRequest, AssemblySchema]):
-    """Run DRC on an assembly supplied directly or via cached assembly id."""
+@app.post("/drc/run", response_model=Union[DRCReport, DRCMultiReport])
+def run_drc(request: Union[DRCRunRequest, AssemblySchema], http_request: Request):
+    """Run DRC on an assembly supplied directly or via cached assembly id.
+
+    With ``ruleset_ids``, returns one report per ruleset from a single pass.
+    With ``Accept: application/x-ndjson`` or ``text/event-stream`` (single
+    ruleset), streams each finding and fix as its checker produces it,
+    followed by the report; a failure after the first frame ends the stream
+    with an ``error`` frame.
+    """
     try:
         if isinstance(request, AssemblySchema):
             assembly = request
@@ -48,14 +114,37 @@ def run_drc(request: Union[DRCRunRequest, AssemblySchema]):
                 assembly = AssemblySchema.model_validate(assembly)
             drc_engine.remember(assembly)
             ruleset_id = request.ruleset_id
+            if request.ruleset_ids:
+                reports = drc_engine.run_drc_many(assembly, request.ruleset_ids)
+                return DRCMultiReport(assembly_id=assembly.assembly_id, reports=reports)
 
+        media_type = stream_media_type(http_request.headers.get("accept"))
+        if media_type is not None:
+            events = drc_engine.iter_drc(assembly, ruleset_id)
+            return StreamingResponse(encode_events(events, media_type, "DRC run failed"), media_type=media_type)
         return drc_engine.run_drc(assembly, ruleset_id)
     except HTTPException:
         raise
+    except UnknownRulesetError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"DRC run failed: {exc}") from exc
 
 
+@app.post("/drc/run/stream")
+async def run_drc_stream(request: Request, ruleset_id: Optional[str] = None):
+    """Run DRC on an assembly body parsed incrementally, streaming findings as they are found.
+
+    Frames are NDJSON unless ``Accept: text/event-stream`` asks for SSE.
+    """
+    try:
+        run = StreamingRun(drc_engine, drc_engine.registry.get(ruleset_id))
+    except UnknownRulesetError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    media_type = stream_media_type(request.headers.get("accept")) or NDJSON
+    return BodyStreamingResponse(stream_drc(run, request.stream(), media_type), media_type=media_type)
+
+
 @app.post("/drc/apply-fixes", response_model=DRCApplyFixesResponse)
 def apply_fixes(request: DRCApplyFixesRequest):
     """Apply selected fixes and return updated report."""
@@ -74,5 +163,7 @@ def apply_fixes(request: DRCApplyFixesRequest):
             schema=updated_assembly.model_dump(mode="json"),
             drc=report,
         )
+    except UnknownRulesetError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Apply fixes failed: {exc}") from exc
@@ -46,8 +46,15 @@ class RulesetsResponse(BaseModel):
 class DRCRunRequest(BaseModel):
     assembly_id: str
     ruleset_id: Optional[str] = None
+    # Evaluate several rulesets in one pass; takes precedence over ruleset_id
+    ruleset_ids: Optional[List[str]] = None
     schema: Optional["AssemblySchema"] = None
 
+# DRC Run response for several rulesets, one report per ruleset in request order
+class DRCMultiReport(BaseModel):
+    assembly_id: str
+    reports: List[DRCReport]
+
 # DRC Apply Fixes request
 class DRCApplyFixesRequest(BaseModel):
     assembly_id: str
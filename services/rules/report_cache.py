@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from service_common.env import env_int
+
+from .models import DRCFinding, DRCFix, DRCReport
+
+DomainResults = Dict[str, Tuple[List[DRCFinding], List[DRCFix]]]
+
+
+class CachedReport(NamedTuple):
+    report: DRCReport
+    # Findings and fixes per domain checker, before de-duplication
+    domains: DomainResults
+    cpu_s: float
+
+
+def _serialized_size(cached: CachedReport) -> int:
+    """JSON bytes of the report plus every domain's findings and fixes."""
+    size = len(cached.report.model_dump_json())
+    for findings, fixes in cached.domains.values():
+        size += sum(len(item.model_dump_json()) for item in (*findings, *fixes))
+    return size
+
+
+class ReportCache:
+    """LRU of DRC reports keyed by (content_hash, ruleset_id) and tagged with the ruleset version.
+
+    ``content_hash`` is the assembly's Merkle root (``SchemaDigest.root``),
+    never a client-sent ``schema_hash``.
+
+    A lookup under a different ruleset version than the one an entry was
+    computed with drops that entry. Each entry remembers the CPU time its
+    report took, so hits can report the work they saved. The LRU holds at
+    most ``max_entries`` entries and ``max_bytes`` of serialized reports and
+    per-domain results; ``max_entries`` of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (content_hash, ruleset_id) -> (ruleset version, cached report, serialized bytes)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, CachedReport, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.saved_cpu_s = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ReportCache":
+        return cls(
+            max_entries=env_int("RULES_REPORT_CACHE_MAX_ENTRIES", 1024),
+            max_bytes=env_int("RULES_REPORT_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        )
+
+    def get(self, content_hash: str, ruleset_id: str, version: str) -> Optional[CachedReport]:
+        key = (content_hash, ruleset_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            cached_version, cached, size = entry
+            if cached_version != version:
+                del self._entries[key]
+                self._bytes -= size
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_cpu_s += cached.cpu_s
+            return cached
+
+    def put(self, content_hash: str, ruleset_id: str, version: str, cached: CachedReport) -> None:
+        if self.max_entries <= 0:
+            return
+        size = _serialized_size(cached)
+        key = (content_hash, ruleset_id)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, cached, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "saved_cpu_s": self.saved_cpu_s,
+            }
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+RULESETS_DIR = Path(__file__).parent / "rulesets"
+DEFAULT_RULESET_ID = "rs-001"
+DOMAINS = ("mechanical", "electrical", "standards", "labeling", "consistency")
+
+_RULESET_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+class UnknownRulesetError(LookupError):
+    """No ruleset directory with a manifest exists for the requested id."""
+
+
+class CompiledRule(NamedTuple):
+    id: str
+    domain: str
+    params: Dict[str, Any]
+
+
+class RulePlan:
+    """A ruleset manifest compiled into the lookups the DRC checkers use.
+
+    Rules are indexed by id and by domain, so a checker tests membership
+    instead of scanning the manifest, and a domain with no rules is skipped.
+    Thresholds and tables are resolved (and ``$table`` references read) once
+    at load time.
+    """
+
+    def __init__(self, manifest: Dict[str, Any], root: Path) -> None:
+        self.id: str = manifest["id"]
+        self.version: str = manifest["version"]
+        self.created_at: str = manifest.get("created_at", "")
+        self.notes: Optional[str] = manifest.get("notes")
+
+        self.rules: Dict[str, CompiledRule] = {}
+        by_domain: Dict[str, List[str]] = {domain: [] for domain in DOMAINS}
+        for entry in manifest.get("rules", []):
+            domain = entry.get("domain")
+            if domain not in by_domain:
+                raise ValueError(f"Ruleset {self.id}: rule {entry.get('id')} has unknown domain {domain!r}")
+            params = {name: self._resolve(root, value) for name, value in (entry.get("params") or {}).items()}
+            self.rules[entry["id"]] = CompiledRule(entry["id"], domain, params)
+            by_domain[domain].append(entry["id"])
+        self.by_domain: Dict[str, Tuple[str, ...]] = {domain: tuple(ids) for domain, ids in by_domain.items()}
+        self.domains: FrozenSet[str] = frozenset(domain for domain, ids in by_domain.items() if ids)
+        self._enabled: FrozenSet[str] = frozenset(self.rules)
+
+        bend = self.params("MECH_BEND_RADIUS")
+        # Only multipliers referenced to the outer diameter apply to OD-based radii
+        self.od_bend_multipliers: Dict[str, float] = {
+            family: float(data["multiplier"])
+            for family, data in (bend.get("multipliers") or {}).items()
+            if isinstance(data, dict) and data.get("reference") == "OD"
+        }
+        self.od_bend_default: float = self.od_bend_multipliers.get("standard", 8.0)
+        self.ribbon_bend_mm: Dict[float, float] = {
+            float(pitch): float(radius) for pitch, radius in (bend.get("ribbon_pitch_in_mm") or {}).items()
+        }
+        self.ribbon_bend_default_mm: float = float(bend.get("ribbon_default_mm", 10.0))
+
+        self.clamp_tolerance_mm: float = float(self.params("MECH_CLAMP_RANGE").get("tolerance_mm", 0.2))
+
+        ampacity = self.params("ELEC_AMPACITY_MARGIN")
+        self.ampacity: Dict[int, float] = {int(awg): float(amps) for awg, amps in (ampacity.get("ampacity") or {}).items()}
+        self.design_margin: float = ampacity.get("design_margin", 0.8)
+        self.bundle_factor: float = ampacity.get("bundle_factor", 0.8)
+        self.bundle_min_loaded_circuits: int = ampacity.get("bundle_min_loaded_circuits", 4)
+        self.max_signal_current_a: float = self.params("ELEC_CONTACT_PLATING").get("max_signal_current_a", 1.0)
+
+        self.title_block_fields: Tuple[str, ...] = tuple(self.params("LAB_TITLE_BLOCK").get("required_fields", ()))
+        self.label_tokens: Tuple[str, ...] = tuple(self.params("LAB_TEXT_CONTENT").get("tokens", ()))
+        self.label_offset_default: Any = self.params("LAB_OFFSET_MISSING").get("default_mm", 30)
+        low, high = self.params("LAB_OFFSET_RANGE").get("range_mm", (25, 50))
+        self.label_offset_range: Tuple[Any, Any] = (low, high)
+
+        self.locale_colors: Dict[str, Dict[str, FrozenSet[str]]] = {
+            locale: {circuit: frozenset(colors) for circuit, colors in circuits.items()}
+            for locale, circuits in (self.params("CONSIST_COLOR").get("locales") or {}).items()
+        }
+
+    @staticmethod
+    def _resolve(root: Path, value: Any) -> Any:
+        """Replace ``{"$table": file, "$key": key}`` with that table's ``data`` (or one key of it)."""
+        if isinstance(value, dict) and "$table" in value:
+            with open(root / value["$table"], encoding="utf-8") as handle:
+                data = json.load(handle).get("data", {})
+            return data[value["$key"]] if "$key" in value else data
+        return value
+
+    def enabled(self, rule_id: str) -> bool:
+        return rule_id in self._enabled
+
+    def params(self, rule_id: str) -> Dict[str, Any]:
+        rule = self.rules.get(rule_id)
+        return rule.params if rule is not None else {}
+
+    def metadata(self) -> Dict[str, Any]:
+        return {"id": self.id, "version": self.version, "created_at": self.created_at, "notes": self.notes}
+
+
+class RuleRegistry:
+    """Compiled rulesets by id, loaded from ``<root>/<ruleset_id>/manifest.json``.
+
+    Rulesets are compiled on first use and stay in memory, so any number of
+    them can be served side by side; adding a ruleset is adding a directory.
+    ``reload`` drops the compiled plans so edited manifests are read again.
+    """
+
+    def __init__(self, root: Path = RULESETS_DIR, default_id: str = DEFAULT_RULESET_ID) -> None:
+        self.root = Path(root)
+        self.default_id = default_id
+        self._plans: Dict[str, RulePlan] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RuleRegistry":
+        return cls(
+            root=Path(os.getenv("RULES_RULESETS_DIR", str(RULESETS_DIR))),
+            default_id=os.getenv("RULES_DEFAULT_RULESET", DEFAULT_RULESET_ID),
+        )
+
+    def get(self, ruleset_id: Optional[str] = None) -> RulePlan:
+        ruleset_id = ruleset_id or self.default_id
+        plan = self._plans.get(ruleset_id)
+        if plan is not None:
+            return plan
+        with self._lock:
+            plan = self._plans.get(ruleset_id)
+            if plan is None:
+                plan = self._plans[ruleset_id] = self._load(ruleset_id)
+            return plan
+
+    def ids(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            path.name for path in self.root.iterdir()
+            if _RULESET_ID.match(path.name) and (path / "manifest.json").is_file()
+        )
+
+    def plans(self) -> List[RulePlan]:
+        return [self.get(ruleset_id) for ruleset_id in self.ids()]
+
+    def reload(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def _load(self, ruleset_id: str) -> RulePlan:
+        path = self.root / ruleset_id / "manifest.json"
+        if not _RULESET_ID.match(ruleset_id) or not path.is_file():
+            raise UnknownRulesetError(f"Unknown ruleset: {ruleset_id}")
+        with open(path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("id", ruleset_id) != ruleset_id:
+            raise ValueError(f"Ruleset manifest {path} declares id {manifest['id']!r}")
+        manifest.setdefault("id", ruleset_id)
+        return RulePlan(manifest, path.parent)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Top-level sections hashed into the root, in order
+SECTIONS = ("assembly_id", "cable", "conductors", "endpoints", "shield", "wirelist", "bom", "labels")
+# Sections hashed per named entry / per fixed-size chunk of rows
+KEYED_SECTIONS = ("endpoints",)
+CHUNKED_SECTIONS = ("wirelist", "bom")
+CHUNK_ROWS = 256
+
+
+def _leaf(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _combine(children: Iterable[Tuple[str, str]]) -> str:
+    payload = "\n".join(f"{name}:{digest}" for name, digest in children).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+class SchemaDigest:
+    """Merkle digest of an assembly's sections.
+
+    Each section in ``SECTIONS`` gets its own digest; endpoints are hashed per
+    endpoint and wirelist/bom per chunk of ``CHUNK_ROWS`` rows. ``root``
+    combines the section digests and is used as ``schema_hash``.
+
+    Given the digest of a ``base`` revision, any section, endpoint or chunk
+    whose objects are identical (``is``) to the base's is not rehashed. With
+    copy-on-write patches, a fix to one endpoint rehashes just that endpoint.
+    """
+
+    def __init__(self, data: Dict[str, Any], base: Optional["SchemaDigest"] = None) -> None:
+        # node path -> (hashed object, digest), for reuse by later revisions
+        self._nodes: Dict[str, Tuple[Any, str]] = {}
+        self._base_nodes = base._nodes if base is not None else {}
+        self.rehashed = 0
+        self.sections: Dict[str, str] = {name: self._section(name, data.get(name)) for name in SECTIONS}
+        self.root = _combine(self.sections.items())
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory of the node table (hashed sections belong to the assembly)."""
+        return sum(
+            sys.getsizeof(path) + sys.getsizeof(digest) + (sys.getsizeof(value) if path.endswith("]") else 0)
+            for path, (value, digest) in self._nodes.items()
+        )
+
+    def _reuse(self, path: str, value: Any) -> Optional[str]:
+        cached = self._base_nodes.get(path)
+        if cached is not None and cached[0] is value:
+            self._nodes[path] = cached
+            return cached[1]
+        return None
+
+    def _node(self, path: str, value: Any, digest: str) -> str:
+        self._nodes[path] = (value, digest)
+        return digest
+
+    def _section(self, name: str, value: Any) -> str:
+        digest = self._reuse(name, value)
+        if digest is not None:
+            return digest
+        if name in KEYED_SECTIONS and isinstance(value, dict):
+            digest = _combine(
+                (key, self._reuse(f"{name}.{key}", item) or self._hash(f"{name}.{key}", item))
+                for key, item in sorted(value.items())
+            )
+        elif name in CHUNKED_SECTIONS and isinstance(value, list):
+            digest = _combine(
+                (str(start), self._chunk(f"{name}[{start}]", value[start:start + CHUNK_ROWS]))
+                for start in range(0, len(value), CHUNK_ROWS)
+            )
+        else:
+            return self._hash(name, value)
+        return self._node(name, value, digest)
+
+    def _chunk(self, path: str, rows: List[Any]) -> str:
+        cached = self._base_nodes.get(path)
+        if cached is not None and len(cached[0]) == len(rows) and all(a is b for a, b in zip(cached[0], rows)):
+            self._nodes[path] = cached
+            return cached[1]
+        return self._hash(path, rows)
+
+    def _hash(self, path: str, value: Any) -> str:
+        self.rehashed += 1
+        return self._node(path, value, _leaf(value))
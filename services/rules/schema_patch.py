@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Set, Union
+
+from .models import AssemblySchema
+
+PathKey = Union[str, int]
+
+
+class SchemaPatch:
+    """Copy-on-write edit of an assembly's sections.
+
+    ``data`` starts out referencing the assembly's own section objects.
+    ``writable(*path)`` shallow-copies only the containers along ``path`` (once
+    each), so untouched subtrees such as ``wirelist`` and ``bom`` stay shared
+    with the original assembly, which is never mutated.
+    """
+
+    def __init__(self, assembly: AssemblySchema) -> None:
+        self.data: Dict[str, Any] = {name: getattr(assembly, name) for name in AssemblySchema.model_fields}
+        self._owned: Set[int] = {id(self.data)}
+
+    def get(self, *path: PathKey) -> Any:
+        """Read-only lookup; None if any step is missing."""
+        node: Any = self.data
+        for key in path:
+            if isinstance(node, dict):
+                node = node.get(key)
+            elif isinstance(node, list) and isinstance(key, int) and -len(node) <= key < len(node):
+                node = node[key]
+            else:
+                return None
+        return node
+
+    def writable(self, *path: PathKey) -> Any:
+        """Container at ``path``, copied so it can be mutated in place.
+
+        Missing or None dict entries along the way are created as ``{}``.
+        """
+        node: Any = self.data
+        for key in path:
+            child = node[key] if isinstance(node, list) else node.get(key)
+            if child is None:
+                child = {}
+            elif id(child) not in self._owned:
+                child = child.copy()
+            else:
+                node = child
+                continue
+            self._owned.add(id(child))
+            node[key] = child
+            node = child
+        return node
+
+    def hash_view(self) -> Dict[str, Any]:
+        """Sections without ``schema_hash``, sharing every value with ``data``."""
+        return {name: value for name, value in self.data.items() if name != "schema_hash"}
+
+    def build(self, schema_hash: str) -> AssemblySchema:
+        """Assembly with the patched sections; nothing is copied or re-validated."""
+        return AssemblySchema.model_construct(**{**self.data, "schema_hash": schema_hash})
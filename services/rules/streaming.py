@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from starlette.responses import StreamingResponse
+
+from service_common.framing import NDJSON, encode_frame
+
+from .drc_engine import DRCEngine
+from .features import AssemblyFeatures, Wire
+from .json_stream import iter_object
+from .models import AssemblySchema, DRCFinding, DRCFix, DRCReport
+from .report_cache import DomainResults
+from .rule_registry import RulePlan
+
+STREAMED_SECTIONS = ("wirelist", "bom")
+
+
+class StreamingRun:
+    """DRC of one assembly whose ``wirelist`` and ``bom`` arrive row by row.
+
+    Header sections are kept as they arrive. Wirelist rows go through the
+    per-row colour rules and are then dropped; only wires that arrive before
+    ``cable`` (which holds the locale) are held, in their compact normalised
+    form, until it does. ``finish`` runs the whole-assembly checks and returns
+    the same report ``DRCEngine.run_drc`` would for the complete assembly.
+    """
+
+    def __init__(self, engine: DRCEngine, plan: RulePlan) -> None:
+        self.engine = engine
+        self.plan = plan
+        self.header: Dict[str, Any] = {}
+        self.rows: Dict[str, int] = {}
+        self._checks_wires = "consistency" in plan.domains and plan.enabled("CONSIST_COLOR")
+        self._pending: Optional[List[Wire]] = [] if self._checks_wires else None
+        self._colour_findings: List[DRCFinding] = []
+        self._seen: Set[Tuple[str, Optional[str]]] = set()
+        self._started = time.thread_time()
+
+    def section(self, name: str, value: Any) -> List[DRCFinding]:
+        if name in STREAMED_SECTIONS:
+            raise ValueError(f"{name} must be streamed row by row")
+        self.header[name] = value
+        if name == "cable" and self._pending is not None:
+            if not isinstance(value, dict):
+                raise ValueError("cable must be an object")
+            pending, self._pending = self._pending, None
+            return self._check_wires(pending)
+        return []
+
+    def row(self, name: str, row: Any) -> List[DRCFinding]:
+        if not isinstance(row, dict):
+            raise ValueError(f"{name} rows must be objects")
+        self.rows[name] = self.rows.get(name, 0) + 1
+        if name != "wirelist" or not self._checks_wires:
+            return []
+        wire = Wire.from_row(row)
+        if self._pending is not None:
+            self._pending.append(wire)
+            return []
+        return self._check_wires([wire])
+
+    def end(self, name: str, rows: int) -> None:
+        self.rows[name] = rows
+
+    def finish(self) -> Tuple[List[DRCFinding], List[DRCFix], DRCReport]:
+        """Findings and fixes not yet returned by ``section``/``row``, and the final report."""
+        missing = [name for name in STREAMED_SECTIONS if name not in self.rows]
+        if missing:
+            raise ValueError(f"Field required: {', '.join(missing)}")
+        assembly = AssemblySchema.model_validate({**self.header, "wirelist": [], "bom": []})
+        features = AssemblyFeatures(assembly)
+        features.conductor_count = assembly.conductors.get("count") or self.rows["wirelist"]
+
+        engine, plan = self.engine, self.plan
+        domains: DomainResults = {}
+        for domain, checker in engine._checkers():
+            if domain not in plan.domains:
+                domains[domain] = ([], [])
+            elif domain == "consistency":
+                findings, fixes = engine._check_consistency_markings(features, plan)
+                termination_findings, termination_fixes = engine._check_consistency_terminations(features, plan)
+                domains[domain] = (findings + self._colour_findings + termination_findings, fixes + termination_fixes)
+            else:
+                domains[domain] = checker(features, plan)
+
+        # The rows are not kept, so the content digest is unknown and the report is not cached
+        report = engine._report(assembly, plan, domains, time.thread_time() - self._started, None)
+        remaining = [finding for finding in report.findings if (finding.id, finding.where) not in self._seen]
+        return remaining, report.fixes, report
+
+    def _check_wires(self, wires: List[Wire]) -> List[DRCFinding]:
+        locale = self.header["cable"].get("locale")
+        found: List[DRCFinding] = []
+        for finding in self.engine._check_wire_colors(self.plan, locale, wires):
+            key = (finding.id, finding.where)
+            if key not in self._seen:
+                self._seen.add(key)
+                found.append(finding)
+        self._colour_findings.extend(found)
+        return found
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse whose content reads the request body as it streams.
+
+    The stock response also polls ``receive`` for disconnects while streaming,
+    which would consume (and drop) the body chunks the content is parsing.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def stream_drc(
+    run: StreamingRun, chunks: AsyncIterator[bytes], media_type: str = NDJSON
+) -> AsyncIterator[bytes]:
+    """Frames for a streamed assembly body.
+
+    Each finding is sent as soon as it is found (wirelist colour findings
+    while the body is still arriving), then the fixes, then the report. A
+    malformed body ends the stream with an ``error`` frame.
+    """
+    try:
+        async for kind, name, value in iter_object(chunks, STREAMED_SECTIONS):
+            if kind == "row":
+                found = run.row(name, value)
+            elif kind == "section":
+                found = run.section(name, value)
+            else:
+                run.end(name, value)
+                found = []
+            for finding in found:
+                yield encode_frame("finding", finding, media_type)
+
+        findings, fixes, report = run.finish()
+    except ValueError as exc:
+        yield encode_frame("error", {"detail": str(exc)}, media_type)
+        return
+
+    for finding in findings:
+        yield encode_frame("finding", finding, media_type)
+    for fix in fixes:
+        yield encode_frame("fix", fix, media_type)
+    yield encode_frame("report", report, media_type)
@@ -0,0 +1,132 @@
+import psycopg2
+
+from .assembly_store import AssemblyStore, PostgresAssemblyBackend, SQLiteAssemblyBackend, backend_from_url
+from .drc_engine import DRCEngine
+from .fixtures import clamp_sensor_assembly, ribbon_assembly
+
+
+def test_lru_evicts_by_count_and_bytes():
+    store = AssemblyStore(max_entries=2)
+    ribbon = ribbon_assembly()
+    clamp = clamp_sensor_assembly()
+    other = ribbon.model_copy(update={"assembly_id": "assy-other"})
+
+    store.put(ribbon)
+    store.put(clamp)
+    assert store.get(ribbon.assembly_id) is ribbon
+    store.put(other)
+
+    assert store.get(clamp.assembly_id) is None
+    assert store.stats()["evictions"] == 1
+    assert store.stats()["bytes"] == len(ribbon.model_dump_json()) + len(other.model_dump_json())
+
+    small = AssemblyStore(max_bytes=len(ribbon.model_dump_json()) + 1)
+    small.put(ribbon)
+    small.put(other)
+    assert len(small) == 1 and small.get(other.assembly_id) is other
+
+
+def test_malformed_settings_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv("RULES_ASSEMBLY_CACHE_MAX_BYTES", "64MiB")
+    monkeypatch.setenv("RULES_ASSEMBLY_CACHE_MAX_ENTRIES", "512")
+
+    store = AssemblyStore.from_env()
+
+    assert (store.max_entries, store.max_bytes) == (512, 64 * 1024 * 1024)
+
+
+def test_backend_survives_eviction_and_restart(tmp_path):
+    url = f"sqlite:///{tmp_path / 'assemblies.db'}"
+    store = AssemblyStore(max_entries=1, backend=backend_from_url(url))
+    ribbon = ribbon_assembly()
+    clamp = clamp_sensor_assembly()
+    store.put(ribbon)
+    store.put(clamp)
+
+    assert store.get(ribbon.assembly_id) == ribbon
+    assert store.stats()["backend_hits"] == 1
+
+    # A fresh store (another replica, or after restart) reads the same rows
+    restarted = AssemblyStore(backend=backend_from_url(url))
+    assert restarted.get(clamp.assembly_id) == clamp
+
+
+def test_revisions_are_keyed_by_schema_hash():
+    engine = DRCEngine(store=AssemblyStore(backend=SQLiteAssemblyBackend(":memory:")))
+    assembly = ribbon_assembly()
+    assembly.labels.pop("offset_mm")
+    engine.remember(assembly)
+
+    updated, _ = engine.apply_fixes(assembly, ["FIX_LABEL_OFFSET_DEFAULT"])
+
+    assert engine.load(assembly.assembly_id) == updated
+    assert engine.load(assembly.assembly_id, assembly.schema_hash) == assembly
+    assert engine.load(assembly.assembly_id, "unknown") is None
+
+
+def test_latest_revision_comes_from_the_backend(tmp_path):
+    url = f"sqlite:///{tmp_path / 'assemblies.db'}"
+    replica_a = AssemblyStore(backend=backend_from_url(url))
+    replica_b = AssemblyStore(backend=backend_from_url(url))
+    assembly = ribbon_assembly()
+    replica_a.put(assembly)
+    assert replica_a.get(assembly.assembly_id) == assembly
+
+    updated = assembly.model_copy(update={"schema_hash": "sha256:newer"})
+    replica_b.put(updated)
+
+    assert replica_a.get(assembly.assembly_id) == updated
+    assert replica_a.get(assembly.assembly_id, assembly.schema_hash) == assembly
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.dropped:
+            self.conn.closed = 2
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append(sql)
+
+    def fetchone(self):
+        return ("{}",)
+
+
+class FakeConnection:
+    def __init__(self, dropped=False):
+        self.autocommit = False
+        self.closed = 0
+        self.dropped = dropped
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakePool:
+    def __init__(self, *connections):
+        self.idle = list(connections)
+        self.discarded = []
+
+    def getconn(self):
+        return self.idle.pop(0) if self.idle else FakeConnection()
+
+    def putconn(self, conn, close=False):
+        (self.discarded if close else self.idle).append(conn)
+
+
+def test_postgres_backend_replaces_dropped_connections():
+    pool = FakePool(FakeConnection())
+    backend = PostgresAssemblyBackend("postgresql://unused", pool=pool)
+    pool.idle[0].dropped = True
+
+    assert backend.get("assy-1") == "{}"
+    assert len(pool.discarded) == 1
+    assert len(pool.idle) == 1 and pool.idle[0].executed
@@ -0,0 +1,53 @@
+import pytest
+
+from .drc_engine import DRCEngine
+from .fixtures import clamp_sensor_assembly, ribbon_assembly
+from .report_cache import ReportCache
+
+
+def without_timestamp(report):
+    return report.model_dump(exclude={"generated_at"})
+
+
+@pytest.fixture
+def engine():
+    return DRCEngine(report_cache=ReportCache(max_entries=8))
+
+
+def test_label_fix_reruns_only_label_domains(engine, monkeypatch):
+    assembly = ribbon_assembly()
+    assembly.labels.pop("offset_mm")
+    engine.run_drc(assembly)
+
+    ran = []
+    for name in ("_check_mechanical_rules", "_check_electrical_rules", "_check_standards_rules",
+                 "_check_labeling_rules", "_check_consistency_rules"):
+        checker = getattr(engine, name)
+        monkeypatch.setattr(engine, name, lambda *args, name=name, checker=checker: ran.append(name) or checker(*args))
+
+    updated, report = engine.apply_fixes(assembly, ["FIX_LABEL_OFFSET_DEFAULT"])
+
+    assert ran == ["_check_standards_rules", "_check_labeling_rules"]
+    full = DRCEngine(report_cache=ReportCache(max_entries=0)).run_drc(updated)
+    assert without_timestamp(report) == without_timestamp(full)
+
+
+def test_clamp_fix_matches_full_run(engine):
+    assembly = clamp_sensor_assembly()
+    assembly.labels.pop("offset_mm")
+    before = engine.run_drc(assembly)
+    fix_ids = [fix.id for fix in before.fixes]
+    assert any(fix_id.startswith("FIX_CLAMP_ADJUST_") for fix_id in fix_ids)
+
+    updated, report = engine.apply_fixes(assembly, fix_ids)
+
+    full = DRCEngine(report_cache=ReportCache(max_entries=0)).run_drc(updated)
+    assert without_timestamp(report) == without_timestamp(full)
+    assert all(f.code != "MECHANICAL/CLAMP_RANGE_MISMATCH" for f in report.findings)
+
+
+def test_paths_overlap(engine):
+    assert engine._paths_overlap("endpoints.*.accessories", "endpoints.endA.accessories[0].clamp")
+    assert engine._paths_overlap("labels", "labels.offset_mm")
+    assert not engine._paths_overlap("endpoints.*.contacts", "endpoints.endA.heat_shrink")
+    assert not engine._paths_overlap("cable.compliance", "labels.offset_mm")
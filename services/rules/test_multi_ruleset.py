@@ -0,0 +1,62 @@
+import pytest
+
+from . import drc_engine as drc_engine_module
+from .drc_engine import DRCEngine
+from .features import AssemblyFeatures
+from .fixtures import eu_harness
+from .report_cache import ReportCache
+from .rule_registry import UnknownRulesetError
+
+
+def class3_overlay(manifest):
+    manifest["version"] = "3.0.0"
+    for rule in manifest["rules"]:
+        if rule["id"] == "ELEC_AMPACITY_MARGIN":
+            rule["params"]["design_margin"] = 0.25
+
+
+@pytest.fixture
+def engine(registry_with):
+    registry = registry_with("rs-class3", class3_overlay)
+    return DRCEngine(report_cache=ReportCache(max_entries=0), registry=registry)
+
+
+def without_timestamp(report):
+    return report.model_dump(exclude={"generated_at"})
+
+
+def test_reports_match_separate_runs(engine):
+    assembly = eu_harness(wires=12)
+
+    reports = engine.run_drc_many(assembly, ["rs-001", "rs-class3"])
+
+    assert [report.ruleset_id for report in reports] == ["rs-001", "rs-class3"]
+    assert [without_timestamp(report) for report in reports] == [
+        without_timestamp(engine.run_drc(assembly, "rs-001")),
+        without_timestamp(engine.run_drc(assembly, "rs-class3")),
+    ]
+    assert "ELEC_AMPACITY_MARGIN" in {f.id for f in reports[1].findings}
+    assert "ELEC_AMPACITY_MARGIN" not in {f.id for f in reports[0].findings}
+
+
+def test_features_are_extracted_once(engine, monkeypatch):
+    extracted = []
+
+    class CountingFeatures(AssemblyFeatures):
+        def __init__(self, assembly):
+            extracted.append(assembly.assembly_id)
+            super().__init__(assembly)
+
+    monkeypatch.setattr(drc_engine_module, "AssemblyFeatures", CountingFeatures)
+
+    reports = engine.run_drc_many(eu_harness(wires=12), ["rs-001", "rs-class3", None])
+
+    assert len(reports) == 3 and reports[2].ruleset_id == "rs-001"
+    assert len(extracted) == 1
+
+
+def test_unknown_ruleset_fails_before_running(engine, monkeypatch):
+    monkeypatch.setattr(engine, "_run", lambda *args: pytest.fail("no ruleset should run"))
+
+    with pytest.raises(UnknownRulesetError):
+        engine.run_drc_many(eu_harness(wires=2), ["rs-001", "rs-404"])
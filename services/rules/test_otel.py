@@ -0,0 +1,51 @@
+import pytest
+
+from service_common import rule_timing
+
+from .drc_engine import DRCEngine
+from .fixtures import eu_harness
+from .report_cache import ReportCache
+
+
+@pytest.fixture
+def timings(monkeypatch):
+    monkeypatch.setattr(rule_timing, "OTEL_DRC_RULE_TIMING", True)
+    rule_timing.rule_timings.reset()
+    yield rule_timing.rule_timings
+    rule_timing.rule_timings.reset()
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_rule_timing_covers_every_domain_checker(timings, executor):
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0), executor=executor, workers=2)
+    try:
+        engine.run_drc(eu_harness(wires=50))
+        engine.run_drc(eu_harness(wires=50))
+    finally:
+        engine.close()
+
+    snapshot = timings.snapshot()
+    ruleset = engine.registry.get(None).id
+    assert sorted(rule for _, rule in snapshot) == sorted(name for name, _ in engine._checkers())
+    for (timed_ruleset, _), histogram in snapshot.items():
+        assert timed_ruleset == ruleset
+        assert histogram["count"] == 2 == sum(histogram["buckets"])
+        assert histogram["sum_ms"] >= 0
+
+
+def test_rule_timing_is_off_by_default():
+    rule_timing.rule_timings.reset()
+
+    DRCEngine(report_cache=ReportCache(max_entries=0)).run_drc(eu_harness(wires=5))
+
+    assert rule_timing.rule_timer("rs-001") is None
+    assert rule_timing.rule_timings.snapshot() == {}
+
+
+def test_rule_timings_bucket_by_upper_bound():
+    timings = rule_timing.RuleTimings(buckets_ms=(1.0, 10.0))
+
+    for duration_ms in (0.5, 1.0, 5.0, 50.0):
+        timings.observe("rs-001", "labeling", duration_ms)
+
+    assert timings.snapshot() == {("rs-001", "labeling"): {"count": 4, "sum_ms": 56.5, "buckets": [2, 1, 1]}}
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .drc_engine import DRCEngine
+from .fixtures import eu_harness
+from .report_cache import ReportCache
+
+
+def report_without_timestamp(engine, assembly):
+    try:
+        return engine.run_drc(assembly).model_dump(exclude={"generated_at"})
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_pool_matches_serial_order(executor):
+    assembly = eu_harness(wires=50)
+    serial = DRCEngine(report_cache=ReportCache(max_entries=0), executor="serial")
+    pooled = DRCEngine(report_cache=ReportCache(max_entries=0), executor=executor, workers=2)
+    pooled.wirelist_chunk = 7
+
+    expected = report_without_timestamp(serial, assembly)
+
+    assert report_without_timestamp(pooled, assembly) == expected
+    wheres = [f["where"] for f in expected["findings"] if f["code"] == "CONSISTENCY/LOCALE_COLOR"]
+    assert wheres == sorted(wheres, key=lambda where: int(where.split("[")[1].split("]")[0]))
+    assert len(wheres) == 20
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.args = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.args.append(args)
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_process_tasks_share_one_copy_of_the_run():
+    assembly = eu_harness(wires=50)
+    expected = report_without_timestamp(DRCEngine(report_cache=ReportCache(max_entries=0)), assembly)
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0), executor="process")
+    engine.wirelist_chunk = 7
+    # Runs the process-mode tasks on threads, so the submitted arguments can be inspected
+    engine._executor = executor = RecordingExecutor()
+
+    assert report_without_timestamp(engine, assembly) == expected
+    assert len(executor.args) == 4 + 2 + 8
+    assert all(isinstance(arg, (str, tuple, type(None))) for args in executor.args for arg in args)
+
+
+def test_worker_cpu_counts_towards_saved_cpu():
+    engine = DRCEngine(report_cache=ReportCache(max_entries=8), executor="thread", workers=2)
+    checker = engine._check_mechanical_rules
+
+    def busy(features, plan):
+        started = time.thread_time()
+        while time.thread_time() - started < 0.05:
+            pass
+        return checker(features, plan)
+    engine._check_mechanical_rules = busy
+    assembly = eu_harness(wires=10)
+    report_without_timestamp(engine, assembly)
+
+    engine.run_drc(assembly)
+
+    assert engine.report_cache.stats()["saved_cpu_s"] >= 0.05
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        DRCEngine(executor="gpu")
@@ -0,0 +1,91 @@
+import pytest
+
+from .drc_engine import DRCEngine
+from .fixtures import ring_lug_power_assembly
+from .report_cache import ReportCache
+
+
+@pytest.fixture
+def engine(registry_with):
+    return DRCEngine(report_cache=ReportCache(max_entries=8), registry=registry_with("rs-002"))
+
+
+def test_hit_skips_checkers_and_refreshes_timestamp(engine, monkeypatch):
+    assembly = ring_lug_power_assembly()
+    first = engine.run_drc(assembly)
+
+    def unexpected(*args):
+        raise AssertionError("checker should not run on a cache hit")
+    monkeypatch.setattr(engine, "_check_consistency_rules", unexpected)
+    monkeypatch.setattr(engine, "_generated_at", lambda: "2030-01-01T00:00:00Z")
+    resent = assembly.model_copy(deep=True)
+
+    second = engine.run_drc(resent)
+
+    assert second.generated_at == "2030-01-01T00:00:00Z"
+    assert second.model_dump(exclude={"generated_at"}) == first.model_dump(exclude={"generated_at"})
+    stats = engine.report_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5 and stats["saved_cpu_s"] >= 0.0
+
+
+def test_ruleset_id_and_version_are_part_of_the_key(engine, monkeypatch):
+    assembly = ring_lug_power_assembly()
+    engine.run_drc(assembly)
+    engine.run_drc(assembly, "rs-002")
+    assert engine.report_cache.stats()["misses"] == 2
+
+    monkeypatch.setattr(engine.registry.get("rs-001"), "version", "1.1.0")
+    report = engine.run_drc(assembly)
+
+    assert report.version == "1.1.0"
+    assert engine.report_cache.stats()["invalidations"] == 1
+    assert engine.run_drc(assembly).version == "1.1.0"
+    assert engine.report_cache.stats()["hits"] == 1
+
+
+def test_apply_fixes_rehash_misses_the_cache(engine):
+    assembly = ring_lug_power_assembly()
+    assembly.labels.pop("offset_mm")
+    engine.run_drc(assembly)
+
+    updated, report = engine.apply_fixes(assembly, ["FIX_LABEL_OFFSET_DEFAULT"])
+
+    assert updated.schema_hash != assembly.schema_hash
+    assert all(f.code != "LABEL_OFFSET_MISSING" for f in report.findings)
+    # Only the prior report is found; the fixed revision is computed
+    stats = engine.report_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_key_is_the_content_not_the_client_schema_hash(engine):
+    assembly = ring_lug_power_assembly()
+    first = engine.run_drc(assembly)
+    tighter = ring_lug_power_assembly()
+    tighter.cable["bend_radius_mm"] = 10.0
+    assert tighter.schema_hash == assembly.schema_hash
+
+    report = engine.run_drc(tighter)
+
+    assert engine.report_cache.stats()["hits"] == 0
+    assert report.findings != first.findings
+
+
+def test_lru_is_bounded_by_bytes():
+    assembly = ring_lug_power_assembly()
+    engine = DRCEngine(report_cache=ReportCache(max_entries=8))
+    engine.run_drc(assembly)
+    size = engine.report_cache.stats()["bytes"]
+    assert size > 0
+
+    cache = ReportCache(max_entries=8, max_bytes=size)
+    engine = DRCEngine(report_cache=cache)
+    engine.run_drc(assembly)
+    thicker = ring_lug_power_assembly()
+    thicker.cable["od_mm"] += 1.0
+    engine.run_drc(thicker)
+
+    assert len(cache) == 1 and cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= size
+    engine.run_drc(thicker)
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from .drc_engine import DRCEngine
+from .fixtures import ring_lug_power_assembly
+from .report_cache import ReportCache
+from .rule_registry import RULESETS_DIR, RuleRegistry, UnknownRulesetError
+
+
+def test_baseline_plan_reads_the_ruleset_tables():
+    plan = RuleRegistry().get()
+
+    ampacity = json.loads((RULESETS_DIR / "rs-001" / "ampacity.json").read_text())["data"]
+    assert plan.id == "rs-001" and plan.version == "1.0.0"
+    assert plan.ampacity == {int(awg): float(amps) for awg, amps in ampacity.items()}
+    assert plan.label_offset_default == 30 and plan.label_offset_range == (25, 50)
+    assert plan.od_bend_multipliers == {"round": 8.0, "coaxial": 6.0, "standard": 8.0}
+    assert plan.domains == {"mechanical", "electrical", "standards", "labeling", "consistency"}
+    assert "ELEC_AMPACITY_MARGIN" in plan.by_domain["electrical"]
+    assert plan.locale_colors["EU"]["PE"] == {"GREEN/YELLOW", "GREEN-YELLOW", "GREEN/YEL"}
+
+
+def test_unknown_rulesets_are_rejected(tmp_path):
+    registry = RuleRegistry(root=tmp_path)
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0), registry=registry)
+
+    for ruleset_id in ("rs-404", "../rules/rulesets/rs-001"):
+        with pytest.raises(UnknownRulesetError):
+            engine.run_drc(ring_lug_power_assembly(), ruleset_id)
+
+
+def test_rulesets_are_selected_by_id_and_stay_loaded(registry_with):
+    def overlay(manifest):
+        manifest["version"] = "2.0.0"
+        manifest["rules"] = [rule for rule in manifest["rules"] if rule["domain"] != "standards"]
+        for rule in manifest["rules"]:
+            if rule["id"] == "LAB_OFFSET_RANGE":
+                rule["params"]["range_mm"] = [40, 60]
+
+    registry = registry_with("rs-overlay", overlay)
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0), registry=registry)
+    assembly = ring_lug_power_assembly()
+    assembly.labels["offset_mm"] = 30
+    assembly.cable["compliance"] = {}
+
+    ran = []
+    checker = engine._check_standards_rules
+    engine._check_standards_rules = lambda *args: ran.append(args[1].id) or checker(*args)
+    baseline = engine.run_drc(assembly)
+    overlay_report = engine.run_drc(assembly, "rs-overlay")
+
+    assert ran == ["rs-001"]
+    assert overlay_report.ruleset_id == "rs-overlay" and overlay_report.version == "2.0.0"
+    assert any(f.domain == "standards" for f in baseline.findings)
+    assert not any(f.domain == "standards" for f in overlay_report.findings)
+    assert "LAB_OFFSET_RANGE" not in {f.id for f in baseline.findings}
+    assert "LAB_OFFSET_RANGE" in {f.id for f in overlay_report.findings}
+    assert registry.get("rs-overlay") is registry.get("rs-overlay")
+    assert [ruleset["id"] for ruleset in engine.get_rulesets()] == ["rs-001", "rs-overlay"]
@@ -0,0 +1,94 @@
+from .assembly_store import AssemblyStore
+from .drc_engine import DRCEngine
+from .fixtures import ring_lug_power_assembly
+from .report_cache import ReportCache
+from .schema_digest import CHUNK_ROWS, SchemaDigest
+from .schema_patch import SchemaPatch
+
+
+def sections(assembly):
+    return {name: getattr(assembly, name) for name in type(assembly).model_fields if name != "schema_hash"}
+
+
+def large_assembly():
+    assembly = ring_lug_power_assembly()
+    assembly.wirelist = [{"circuit": f"C{i}", "conductor": i, "color": "RED"} for i in range(3 * CHUNK_ROWS)]
+    return assembly
+
+
+def test_root_depends_only_on_content():
+    first = SchemaDigest(sections(large_assembly()))
+    second = SchemaDigest(sections(large_assembly()))
+
+    assert first.root == second.root
+    assert set(first.sections) == {"assembly_id", "cable", "conductors", "endpoints", "shield", "wirelist", "bom", "labels"}
+
+    changed = large_assembly()
+    changed.wirelist[-1]["color"] = "BLUE"
+    digest = SchemaDigest(sections(changed))
+    assert digest.root != first.root
+    assert {name for name in digest.sections if digest.sections[name] != first.sections[name]} == {"wirelist"}
+
+
+def test_patch_rehashes_only_touched_subtrees():
+    assembly = large_assembly()
+    base = SchemaDigest(sections(assembly))
+    patch = SchemaPatch(assembly)
+    patch.writable("endpoints", "endB")["heat_shrink"] = True
+
+    digest = SchemaDigest(patch.hash_view(), base=base)
+
+    assert digest.rehashed == 1
+    assert digest.root == SchemaDigest(patch.hash_view()).root
+    assert digest.sections["wirelist"] == base.sections["wirelist"]
+    assert digest.sections["endpoints"] != base.sections["endpoints"]
+
+
+def test_apply_fixes_reuses_the_base_digest():
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0))
+    assembly = large_assembly()
+    assembly.labels.pop("offset_mm")
+    base = engine.schema_digest(assembly)
+
+    updated, _ = engine.apply_fixes(assembly, ["FIX_LABEL_OFFSET_DEFAULT"])
+
+    assert engine.store.digest(updated.assembly_id, updated.schema_hash).rehashed == 1
+    # Looking the fixed revision up again rehashes nothing
+    digest = engine.schema_digest(updated)
+    assert updated.schema_hash == digest.root
+    assert digest.rehashed == 0
+    assert {name for name in digest.sections if digest.sections[name] != base.sections[name]} == {"labels"}
+
+
+def test_digests_are_kept_with_stored_revisions_only():
+    store = AssemblyStore(max_entries=1)
+    engine = DRCEngine(store=store, report_cache=ReportCache(max_entries=0))
+    assembly = large_assembly()
+    engine.remember(assembly)
+    size = store.stats()["bytes"]
+
+    digest = engine.schema_digest(assembly)
+
+    assert store.digest(assembly.assembly_id, assembly.schema_hash) is digest
+    assert store.stats()["bytes"] == size + digest.nbytes
+    # An assembly the store does not hold leaves nothing behind
+    engine.run_drc(large_assembly().model_copy(update={"assembly_id": "assy-other"}))
+    assert store.stats()["bytes"] == size + digest.nbytes
+    # The digest goes with its revision
+    engine.remember(ring_lug_power_assembly().model_copy(update={"assembly_id": "assy-other"}))
+    assert store.digest(assembly.assembly_id, assembly.schema_hash) is None
+
+
+def test_colliding_schema_hash_is_not_trusted():
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0))
+    assembly = ring_lug_power_assembly()
+    thicker = ring_lug_power_assembly()
+    thicker.cable["od_mm"] = assembly.cable["od_mm"] + 1.0
+    assert thicker.schema_hash == assembly.schema_hash
+
+    first = engine.schema_digest(assembly)
+    second = engine.schema_digest(thicker)
+
+    assert second.root != first.root
+    assert second.root == SchemaDigest(sections(thicker)).root
+    assert engine.schema_digest(assembly).root == first.root
@@ -0,0 +1,40 @@
+from copy import deepcopy
+
+from .drc_engine import DRCEngine
+from .fixtures import clamp_sensor_assembly, ring_lug_power_assembly
+from .report_cache import ReportCache
+from .schema_digest import SchemaDigest
+from .schema_patch import SchemaPatch
+
+
+def test_writable_copies_only_the_touched_path():
+    assembly = clamp_sensor_assembly()
+    patch = SchemaPatch(assembly)
+
+    clamp = patch.writable("endpoints", "endA", "accessories", 0, "clamp")
+    clamp["max_od_mm"] = 6.1
+    patch.writable("endpoints", "endA")["heat_shrink"] = True
+
+    assert assembly.endpoints["endA"]["accessories"][0]["clamp"]["max_od_mm"] == 5.85
+    assert "heat_shrink" not in assembly.endpoints["endA"]
+    assert patch.data["endpoints"]["endA"]["accessories"][0]["clamp"]["max_od_mm"] == 6.1
+    assert patch.data["endpoints"]["endA"]["heat_shrink"] is True
+    assert patch.data["endpoints"]["endB"] is assembly.endpoints["endB"]
+    assert patch.data["wirelist"] is assembly.wirelist and patch.data["cable"] is assembly.cable
+
+
+def test_apply_fixes_shares_untouched_sections_and_keeps_hash():
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0))
+    assembly = ring_lug_power_assembly()
+    assembly.labels.pop("offset_mm")
+    original = assembly.model_dump()
+
+    updated, _ = engine.apply_fixes(assembly, ["FIX_LABEL_OFFSET_DEFAULT"])
+
+    assert assembly.model_dump() == original
+    assert updated.wirelist is assembly.wirelist and updated.bom is assembly.bom
+    assert updated.endpoints is assembly.endpoints
+    expected = deepcopy(original)
+    expected["labels"]["offset_mm"] = engine.registry.get().label_offset_default
+    assert updated.schema_hash == SchemaDigest(deepcopy(expected)).root
+    assert updated.model_dump(exclude={"schema_hash"}) == {k: v for k, v in expected.items() if k != "schema_hash"}
@@ -0,0 +1,207 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from service_common.framing import encode_events, encode_frame, stream_media_type
+
+from . import json_stream
+from .drc_engine import DRCEngine
+from .fixtures import eu_harness
+from .json_stream import StreamParseError, iter_object
+from .report_cache import ReportCache
+from .streaming import BodyStreamingResponse, StreamingRun, stream_drc
+
+
+async def chunked(payload: bytes, size: int):
+    for start in range(0, len(payload), size):
+        yield payload[start:start + size]
+
+
+def collect(agen):
+    async def run():
+        return [item async for item in agen]
+    return asyncio.run(run())
+
+
+def body(assembly, wirelist_first=False):
+    data = assembly.model_dump()
+    if wirelist_first:
+        data = {"wirelist": data.pop("wirelist"), **data}
+    return json.dumps(data, indent=1).encode("utf-8")
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_parser_streams_rows_and_keeps_sections(size):
+    payload = b'{"a": 12345, "wirelist": [{"n": 1.5e3}, {"s": "\xc3\xa9"}], "bom": [], "z": [true, null]}'
+
+    events = collect(iter_object(chunked(payload, size), ("wirelist", "bom")))
+
+    assert events == [
+        ("section", "a", 12345),
+        ("row", "wirelist", {"n": 1500.0}),
+        ("row", "wirelist", {"s": "é"}),
+        ("end", "wirelist", 2),
+        ("end", "bom", 0),
+        ("section", "z", [True, None]),
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_parser_decodes_each_value_once(size, monkeypatch):
+    decoded = []
+
+    class CountingDecoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            decoded.append(idx)
+            return super().raw_decode(s, idx)
+    monkeypatch.setattr(json_stream.json, "JSONDecoder", CountingDecoder)
+    cable = {"note": 'quote \\" and ] } [ { inside', "path": "C:\\\\", "sizes": [[1, 2], {"x": -1.5e-3}]}
+    payload = json.dumps({"cable": cable, "wirelist": [{"n": 1}, "]", 12.5], "bom": [], "ok": True}).encode()
+
+    events = collect(iter_object(chunked(payload, size), ("wirelist", "bom")))
+
+    assert events == [
+        ("section", "cable", cable),
+        ("row", "wirelist", {"n": 1}),
+        ("row", "wirelist", "]"),
+        ("row", "wirelist", 12.5),
+        ("end", "wirelist", 3),
+        ("end", "bom", 0),
+        ("section", "ok", True),
+    ]
+    # Four keys, two sections and three rows, each decoded once however many chunks it spans
+    assert len(decoded) == 4 + 2 + 3
+
+
+@pytest.mark.parametrize("payload", [b'{"a": 1', b'{"a": 1} x', b'{"wirelist": {}}', b'[1]'])
+def test_parser_rejects_malformed_bodies(payload):
+    with pytest.raises(StreamParseError):
+        collect(iter_object(chunked(payload, 3), ("wirelist",)))
+
+
+@pytest.mark.parametrize("wirelist_first", [False, True])
+def test_stream_matches_run_drc(wirelist_first):
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0))
+    assembly = eu_harness(wires=40)
+    expected = engine.run_drc(assembly).model_dump(exclude={"generated_at"})
+
+    frames = [json.loads(line) for line in collect(
+        stream_drc(StreamingRun(engine, engine.registry.get()), chunked(body(assembly, wirelist_first), 64))
+    )]
+
+    events = [frame["event"] for frame in frames]
+    assert events[-1] == "report"
+    report = frames[-1]["data"]
+    report.pop("generated_at")
+    assert report == expected
+    streamed = [frame["data"] for frame in frames if frame["event"] == "finding"]
+    assert sorted(map(json.dumps, streamed)) == sorted(map(json.dumps, expected["findings"]))
+    assert [frame["data"] for frame in frames if frame["event"] == "fix"] == expected["fixes"]
+    if not wirelist_first:
+        # Colour findings are sent while the wirelist is still being read
+        assert streamed[0]["code"] == "CONSISTENCY/LOCALE_COLOR"
+
+
+def test_http_body_streams_through_the_response():
+    # Same wiring as main.run_drc_stream, which cannot be imported from the package
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0))
+    app = FastAPI()
+
+    @app.post("/drc/run/stream")
+    async def run_drc_stream(request: Request):
+        run = StreamingRun(engine, engine.registry.get())
+        return BodyStreamingResponse(stream_drc(run, request.stream()), media_type="application/x-ndjson")
+
+    assembly = eu_harness(wires=40)
+    payload = body(assembly)
+    chunks = (payload[start:start + 256] for start in range(0, len(payload), 256))
+
+    with TestClient(app) as client:
+        response = client.post("/drc/run/stream", content=chunks)
+
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert frames[-1]["event"] == "report"
+    report = frames[-1]["data"]
+    report.pop("generated_at")
+    assert report == engine.run_drc(assembly).model_dump(exclude={"generated_at"})
+
+
+def test_streamed_reports_are_not_cached():
+    # Without the rows the content digest is unknown; caching under the client schema_hash could serve the wrong report
+    engine = DRCEngine(report_cache=ReportCache(max_entries=8))
+    assembly = eu_harness(wires=4)
+
+    collect(stream_drc(StreamingRun(engine, engine.registry.get()), chunked(body(assembly), 64)))
+
+    assert len(engine.report_cache) == 0
+
+
+def test_stream_reports_errors_in_band():
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0))
+    data = eu_harness(wires=2).model_dump()
+    del data["bom"]
+
+    frames = [json.loads(line) for line in collect(
+        stream_drc(StreamingRun(engine, engine.registry.get()), chunked(json.dumps(data).encode(), 16))
+    )]
+
+    assert frames[-1]["event"] == "error" and "report" not in [frame["event"] for frame in frames]
+    assert "bom" in frames[-1]["data"]["detail"]
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_iter_drc_ends_with_run_drc_report(executor):
+    engine = DRCEngine(report_cache=ReportCache(max_entries=0), executor=executor, workers=4)
+    assembly = eu_harness(wires=40)
+    expected = engine.run_drc(assembly)
+
+    events = list(engine.iter_drc(assembly))
+    engine.close()
+
+    kinds = [event for event, _ in events]
+    assert kinds[-1] == "report" and kinds.count("report") == 1
+    report = events[-1][1]
+    assert report.model_dump(exclude={"generated_at"}) == expected.model_dump(exclude={"generated_at"})
+    streamed = [item for event, item in events if event == "finding"]
+    assert sorted(f.model_dump_json() for f in streamed) == sorted(f.model_dump_json() for f in expected.findings)
+    assert sorted(x.id for event, x in events if event == "fix") == sorted(x.id for x in expected.fixes)
+
+
+def test_iter_drc_replays_cached_report():
+    engine = DRCEngine(report_cache=ReportCache())
+    assembly = eu_harness(wires=8)
+    report = engine.run_drc(assembly)
+
+    events = list(engine.iter_drc(assembly))
+
+    assert [item for event, item in events if event == "finding"] == report.findings
+    assert events[-1][1].findings == report.findings
+
+
+@pytest.mark.parametrize("media_type", ["application/x-ndjson", "text/event-stream"])
+def test_encode_frame(media_type):
+    frame = encode_frame("result", {"ok": True}, media_type).decode()
+
+    if media_type == "text/event-stream":
+        assert frame == 'event: result\ndata: {"ok":true}\n\n'
+    else:
+        assert json.loads(frame) == {"event": "result", "data": {"ok": True}}
+    assert stream_media_type(f"{media_type}, */*") == media_type
+    assert stream_media_type("application/json") is None
+
+
+def test_encode_events_ends_a_failed_stream_with_an_error_frame():
+    def events():
+        yield "finding", {"id": "F1"}
+        raise RuntimeError("checker exploded")
+
+    frames = [json.loads(frame) for frame in encode_events(events(), failure="DRC run failed")]
+
+    assert frames == [
+        {"event": "finding", "data": {"id": "F1"}},
+        {"event": "error", "data": {"detail": "DRC run failed: checker exploded"}},
+    ]
@@ -0,0 +1,6 @@
+"""Code shared by the Python services (rules, drc).
+
+Both images copy this directory next to their own modules as
+``service_common`` (Dockerfile.drc, services/drc/Dockerfile,
+services/rules/Dockerfile); tests and benchmarks run from ``services/``.
+"""
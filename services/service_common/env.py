@@ -0,0 +1,21 @@
+"""Numeric settings read from the environment.
+
+Shared by the rules and drc services. A setting that is unset or does not
+parse falls back to its default, so a typo in a deployment variable degrades
+to the documented behaviour.
+"""
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
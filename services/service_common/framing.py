@@ -0,0 +1,49 @@
+"""NDJSON and SSE framing of streamed responses, shared by the rules and drc services."""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("service_common.framing")
+
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+
+
+def stream_media_type(accept: Optional[str]) -> Optional[str]:
+    """NDJSON or SSE if the Accept header asks for one, else None for a plain JSON response."""
+    accept = accept or ""
+    if SSE in accept:
+        return SSE
+    if NDJSON in accept:
+        return NDJSON
+    return None
+
+
+def encode_frame(event: str, data: Any, media_type: str = NDJSON) -> bytes:
+    """One frame: an NDJSON line ``{"event": ..., "data": ...}`` or an SSE ``event:``/``data:`` block."""
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    if media_type == SSE:
+        return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+    return (json.dumps({"event": event, "data": data}, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def encode_events(
+    events: Iterable[Tuple[str, Any]], media_type: str = NDJSON, failure: str = "Stream failed"
+) -> Iterator[bytes]:
+    """Frames for ``(event, data)`` pairs, in the order they are produced.
+
+    The status line has gone out with the first frame, so an exception raised
+    by ``events`` ends the stream with an ``error`` frame whose ``detail``
+    starts with ``failure``.
+    """
+    try:
+        for event, data in events:
+            yield encode_frame(event, data, media_type)
+    except Exception as exc:
+        logger.exception("%s mid-stream", failure)
+        yield encode_frame("error", {"detail": f"{failure}: {exc}"}, media_type)
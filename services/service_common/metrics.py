@@ -0,0 +1,266 @@
+"""Prometheus text-format metrics, served at ``/metrics`` by the rules and drc services.
+
+Request latency is recorded as it happens; cache, store, pool, threadpool and
+rule-timing figures are read from their owners at scrape time by collectors
+registered on ``registry``. The drc service adds its MDM metrics to
+``registry``.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+logger = logging.getLogger("service_common.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (s) of the latency histogram buckets
+LATENCY_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Sample(NamedTuple):
+    name: str
+    labels: Mapping[str, str]
+    value: float
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    type: str
+    help: str
+    samples: List[Sample]
+
+
+def histogram_samples(name: str, labels: Mapping[str, str], bounds: Sequence[float],
+                      buckets: Sequence[int], total: float) -> List[Sample]:
+    """``_bucket``/``_sum``/``_count`` samples from per-bucket counts (the last one is +Inf)."""
+    samples = []
+    cumulative = 0
+    for bound, count in zip([*bounds, float("inf")], buckets):
+        cumulative += count
+        samples.append(Sample(f"{name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+    samples.append(Sample(f"{name}_sum", labels, total))
+    samples.append(Sample(f"{name}_count", labels, cumulative))
+    return samples
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            values = list(self._values.items())
+        return MetricFamily(self.name, self.type, self.help,
+                            [Sample(self.name, self._labels(labels), value) for labels, value in values])
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS_S):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bucket] += 1
+            series[1] += value
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            series = [(labels, list(buckets), total) for labels, (buckets, total) in self._series.items()]
+        samples = []
+        for labels, buckets, total in series:
+            samples.extend(histogram_samples(self.name, self._labels(labels), self.buckets, buckets, total))
+        return MetricFamily(self.name, self.type, self.help, samples)
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered together in the text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS_S) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, collect: Collector) -> Collector:
+        """Register ``collect`` to be called on every scrape; usable as a decorator."""
+        self._collectors.append(collect)
+        return collect
+
+    def collect(self) -> List[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        for collect in self._collectors:
+            try:
+                families.extend(collect())
+            except Exception as exc:
+                # One broken source must not fail the whole scrape
+                logger.warning("Metrics collector %s failed: %s", getattr(collect, "__name__", collect), exc)
+        return families
+
+    def render(self) -> str:
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for sample in family.samples:
+                lines.append(f"{sample.name}{_format_labels(sample.labels)} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def stats_families(prefix: str, stats: Mapping[str, object], help: str,
+                   counters: Iterable[str] = ()) -> List[MetricFamily]:
+    """One family per numeric entry of a ``stats()`` dict; ``counters`` name the cumulative ones."""
+    counters = set(counters)
+    families = []
+    for key, value in stats.items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            continue
+        if key in counters:
+            name = f"{prefix}_{key}" if key.endswith("_total") else f"{prefix}_{key}_total"
+            families.append(MetricFamily(name, "counter", f"{help}: {key}", [Sample(name, {}, value)]))
+        else:
+            name = f"{prefix}_{key}"
+            families.append(MetricFamily(name, "gauge", f"{help}: {key}", [Sample(name, {}, value)]))
+    return families
+
+
+def threadpool_families() -> List[MetricFamily]:
+    """Saturation of the threadpool that runs sync handlers; call from the event loop."""
+    from anyio import to_thread
+
+    limiter = to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return [
+        MetricFamily("threadpool_workers_max", "gauge", "Threads available to sync handlers",
+                     [Sample("threadpool_workers_max", {}, limiter.total_tokens)]),
+        MetricFamily("threadpool_workers_busy", "gauge", "Threads running sync handlers",
+                     [Sample("threadpool_workers_busy", {}, statistics.borrowed_tokens)]),
+        MetricFamily("threadpool_tasks_waiting", "gauge", "Sync handlers waiting for a thread",
+                     [Sample("threadpool_tasks_waiting", {}, statistics.tasks_waiting)]),
+    ]
+
+
+def rule_timing_families(snapshot: Mapping[Tuple[str, str], Mapping[str, object]],
+                         bounds_ms: Sequence[float]) -> List[MetricFamily]:
+    """``drc_rule_duration_seconds`` from an ``otel.RuleTimings`` snapshot."""
+    name = "drc_rule_duration_seconds"
+    samples = []
+    for (ruleset, rule), histogram in sorted(snapshot.items()):
+        samples.extend(histogram_samples(
+            name, {"ruleset": ruleset, "rule": rule}, [bound / 1000.0 for bound in bounds_ms],
+            histogram["buckets"], histogram["sum_ms"] / 1000.0,
+        ))
+    return [MetricFamily(name, "histogram", "Duration of one DRC rule check (OTEL_DRC_RULE_TIMING)", samples)]
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, until the response body is sent",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests being handled", ("method",))
+registry.collector(threadpool_families)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route template, and in-flight requests."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = [500]
+
+        async def send_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method)
+            # The router stores the matched route in the scope; templates keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_SECONDS.observe(time.perf_counter() - started, method, route, str(status[0]))
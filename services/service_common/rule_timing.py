@@ -0,0 +1,133 @@
+"""Opt-in timing of rule checks as OTEL spans and latency histograms.
+
+Shared by the rules service's domain checkers and the drc service's
+``DrcEngine`` checks.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover
+    otel_metrics = None
+    otel_trace = None
+
+OTEL_DRC_RULE_TIMING = os.getenv("OTEL_DRC_RULE_TIMING", "false").lower() == "true"
+
+# Upper bounds (ms) of the rule latency histogram buckets
+RULE_DURATION_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+
+
+class RuleTimings:
+    """In-process latency histograms of rule checks, by ``(ruleset, rule)``."""
+
+    def __init__(self, buckets_ms: Sequence[float] = RULE_DURATION_BUCKETS_MS) -> None:
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        # (ruleset, rule) -> [count, sum_ms, per-bucket counts (last one is +Inf)]
+        self._histograms: Dict[Tuple[str, str], List[Any]] = {}
+
+    def observe(self, ruleset: str, rule: str, duration_ms: float) -> None:
+        bucket = next((i for i, bound in enumerate(self.buckets_ms) if duration_ms <= bound), len(self.buckets_ms))
+        with self._lock:
+            histogram = self._histograms.get((ruleset, rule))
+            if histogram is None:
+                histogram = self._histograms[(ruleset, rule)] = [0, 0.0, [0] * (len(self.buckets_ms) + 1)]
+            histogram[0] += 1
+            histogram[1] += duration_ms
+            histogram[2][bucket] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """``{(ruleset, rule): {"count", "sum_ms", "buckets"}}``; ``buckets`` are per-bucket, not cumulative."""
+        with self._lock:
+            return {
+                key: {"count": count, "sum_ms": sum_ms, "buckets": list(buckets)}
+                for key, (count, sum_ms, buckets) in self._histograms.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+rule_timings = RuleTimings()
+
+_rule_histograms: Dict[str, Any] = {}
+
+
+def _otel_rule_histogram(scope: str):
+    if scope not in _rule_histograms and otel_metrics is not None:
+        _rule_histograms[scope] = otel_metrics.get_meter(scope).create_histogram(
+            "drc.rule.duration", unit="ms", description="Duration of one DRC rule check"
+        )
+    return _rule_histograms.get(scope)
+
+
+def _result_attributes(results: Any) -> Dict[str, int]:
+    # Domain checkers return (findings, fixes); DrcEngine checks return a list of issues
+    if isinstance(results, tuple):
+        findings, fixes = results
+        return {"drc.findings": len(findings), "drc.fixes": len(fixes)}
+    return {"drc.issues": len(results)}
+
+
+class RuleTimer:
+    """Times the rule checks of one ruleset.
+
+    A check run in-line gets a current span, so work it does (MDM queries)
+    nests under it. A check that ran on a pool is recorded after the fact
+    with explicit start and end times, so it still gets a child span of the
+    caller's trace.
+    """
+
+    def __init__(self, ruleset_id: str, scope: str = "rules") -> None:
+        self.ruleset_id = ruleset_id
+        self.scope = scope
+
+    def __call__(self, rule: str, checker: Callable[..., Any], *args: Any) -> Any:
+        """``checker(*args)``, timed as ``rule``."""
+        attributes = {"drc.rule": rule, "drc.ruleset": self.ruleset_id}
+        started = time.time_ns()
+        if otel_trace is None:
+            results = checker(*args)
+        else:
+            with otel_trace.get_tracer(self.scope).start_as_current_span(
+                f"drc.rule.{rule}", start_time=started, attributes=attributes
+            ) as span:
+                results = checker(*args)
+                span.set_attributes(_result_attributes(results))
+        self._observe(rule, (time.time_ns() - started) / 1e6, attributes)
+        return results
+
+    def record(self, rule: str, started_ns: int, ended_ns: int, results: Any) -> None:
+        """Record one ``rule`` run from ``started_ns`` to ``ended_ns`` (``time.time_ns``)."""
+        attributes = {"drc.rule": rule, "drc.ruleset": self.ruleset_id}
+        self._observe(rule, (ended_ns - started_ns) / 1e6, attributes)
+        if otel_trace is not None:
+            span = otel_trace.get_tracer(self.scope).start_span(
+                f"drc.rule.{rule}", start_time=started_ns, attributes={**attributes, **_result_attributes(results)},
+            )
+            span.end(end_time=ended_ns)
+
+    def _observe(self, rule: str, duration_ms: float, attributes: Dict[str, str]) -> None:
+        rule_timings.observe(self.ruleset_id, rule, duration_ms)
+        histogram = _otel_rule_histogram(self.scope)
+        if histogram is not None:
+            histogram.record(duration_ms, attributes)
+
+
+def rule_timer(ruleset_id: str, scope: str = "rules") -> Optional[RuleTimer]:
+    """Timer for ``ruleset_id``'s checks, or None when OTEL_DRC_RULE_TIMING is off.
+
+    ``scope`` names the tracer and meter. Timings always reach
+    ``rule_timings``; spans and the ``drc.rule.duration`` histogram are
+    exported when the opentelemetry API is importable.
+    """
+    if not OTEL_DRC_RULE_TIMING:
+        return None
+    return RuleTimer(ruleset_id, scope)
@@ -0,0 +1,80 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from service_common.rule_timing import RuleTimings
+
+from . import metrics
+
+
+def test_registry_renders_text_exposition_format():
+    registry = metrics.Registry()
+    requests = registry.counter("jobs_total", "Jobs run", ("queue",))
+    latency = registry.histogram("job_seconds", "Job latency", buckets=(0.1, 1.0))
+    registry.collector(lambda: metrics.stats_families("cache", {"hits": 3, "size": 2, "backend": "x"}, "Cache", ("hits",)))
+    requests.inc('a"b')
+    for value in (0.05, 0.1, 0.5, 5.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{queue="a\\"b"} 1.0' in lines
+    assert [line for line in lines if line.startswith("job_seconds")] == [
+        'job_seconds_bucket{le="0.1"} 2', 'job_seconds_bucket{le="1.0"} 3', 'job_seconds_bucket{le="+Inf"} 4',
+        "job_seconds_sum 5.65", "job_seconds_count 4",
+    ]
+    assert "cache_hits_total 3" in lines and "cache_size 2" in lines
+    assert not any(line.startswith("cache_backend") for line in lines)
+
+
+def test_failing_collector_does_not_fail_the_scrape():
+    registry = metrics.Registry()
+    registry.gauge("up", "Up").inc()
+
+    @registry.collector
+    def broken():
+        raise RuntimeError("gone")
+
+    assert "up 1.0" in registry.render()
+
+
+def test_rule_timings_are_exported_in_seconds():
+    timings = RuleTimings(buckets_ms=(1.0, 10.0))
+    timings.observe("rs-001", "labeling", 0.5)
+    timings.observe("rs-001", "labeling", 20.0)
+
+    (family,) = metrics.rule_timing_families(timings.snapshot(), timings.buckets_ms)
+
+    labels = {"ruleset": "rs-001", "rule": "labeling"}
+    assert family.samples[0] == metrics.Sample("drc_rule_duration_seconds_bucket", {**labels, "le": "0.001"}, 1)
+    assert family.samples[-2:] == [
+        metrics.Sample("drc_rule_duration_seconds_sum", labels, 0.0205),
+        metrics.Sample("drc_rule_duration_seconds_count", labels, 2),
+    ]
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/scrape")
+    async def scrape():
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+    client = TestClient(app)
+    for item_id in ("a", "b"):
+        client.get(f"/items/{item_id}")
+    client.get("/missing")
+    response = client.get("/scrape")
+
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in text
+    # The scrape itself is the only request in flight
+    assert 'http_requests_in_flight{method="GET"} 1.0' in text
+    assert "threadpool_workers_max " in text
@@ -0,0 +1,6 @@
+"""Fixtures and seed data for the services' tests and benchmarks.
+
+Not copied into any image. ``drc_fixtures`` imports the drc modules by bare
+name, so it needs ``services/drc`` on the path (the drc tests run from there;
+``benchmarks.use_drc_service`` adds it).
+"""
@@ -0,0 +1,122 @@
+"""Seed catalog, sample payloads and database fakes shared by the tests and benchmarks.
+
+Nothing here talks to Postgres: ``snapshot_dao`` answers every lookup from
+``seed_snapshot``, and ``FakeConnection`` records the SQL it is given.
+"""
+from mdm_dao import MDMDAO, MDMConnectionPool
+from mdm_snapshot import MDMSnapshot
+from models import (
+    EMI, AssemblyStep1, ConductorSpec, Electrical, Endpoint, EndpointFull, EndpointSelectorSeries,
+    Environment, PartRef, ShieldSpec, SynthesisProposal,
+)
+from testkit.seed_data import seed_rows
+
+
+# The parts of 001_seed.sql in the test snapshot; the rest stay out so lookups can miss
+SNAPSHOT_MPNS = {
+    "mdm_cables": {"3M-3365-10-300", "3M-3365-40-300", "3M-3302-10-300", "BELDEN-8723-002", "BELDEN-9501-002"},
+    "mdm_connectors": {"3M-3510-5010", "TE-320582", "TE-321460"},
+    "mdm_contacts": {"MOLEX-76650-0001", "MOLEX-76650-0003", "JST-SPH-002T-P0.5L"},
+    "mdm_accessories": {"3M-3420-0001", "3M-3420-0002", "3M-3420-0003", "JST-PHDR-TB"},
+}
+
+
+def seed_snapshot() -> MDMSnapshot:
+    """Snapshot of the ``SNAPSHOT_MPNS`` rows of db/postgres_extra/init/001_seed.sql."""
+    rows = seed_rows()
+    tables = {table: [row for row in rows[table] if row["mpn"] in mpns] for table, mpns in SNAPSHOT_MPNS.items()}
+    return MDMSnapshot(
+        tables["mdm_cables"], tables["mdm_connectors"], tables["mdm_contacts"], tables["mdm_accessories"],
+        version="seed-v1",
+    )
+
+
+def snapshot_dao() -> MDMDAO:
+    """DAO answering from ``seed_snapshot``; its pool is never used."""
+    dao = MDMDAO(pool=MDMConnectionPool("postgresql://unused"), snapshot_mode=False)
+    dao.use_snapshot(seed_snapshot())
+    return dao
+
+
+def ring_lug_proposal() -> SynthesisProposal:
+    """8 AWG ring-lug proposal whose lugs and contacts the seed catalog cannot supply."""
+    endpoint = EndpointFull(
+        connector=PartRef(mpn="JST-PHR-2", family="JST PH"),
+        termination="ring_lug",
+        contacts={"primary": PartRef(mpn="NOPE-1"), "alternates": []},
+    )
+    return SynthesisProposal(
+        proposal_id="prop-1", draft_id="draft-1", cable={},
+        conductors=ConductorSpec(awg=8, count=2, od_mm=2.54),
+        endpoints={"endA": endpoint, "endB": endpoint},
+        shield=ShieldSpec(type="none", drain_policy="isolated"),
+        wirelist=[], bom=[], warnings=[], errors=[], explain=[],
+    )
+
+
+def step1(length_mm: int = 1000) -> AssemblyStep1:
+    """10-way IDC ribbon Step 1 payload."""
+    endpoint = Endpoint(selector=EndpointSelectorSeries(series="IDC-0.050", positions=10), termination="idc")
+    return AssemblyStep1(
+        type="ribbon", length_mm=length_mm, tolerance_mm=50, locale="NA",
+        endA=endpoint, endB=endpoint,
+        electrical=Electrical(system_voltage_v=5, per_circuit=[]),
+        environment=Environment(temp_min_c=-20, temp_max_c=85, flex_class="static", chemicals=[]),
+        emi=EMI(shield="none", drain_policy="isolated"),
+        compliance={}, constraints={}, must_use=[], notes_pack_id="test_pack",
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.executed.append(sql)
+
+    def fetchall(self):
+        return self.conn.rows
+
+
+class FakeConnection:
+    """psycopg2-like connection that records executed SQL and returns ``rows``."""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.executed = []
+        self.rows = []
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        self.closed = 1
@@ -0,0 +1,117 @@
+"""Rows of the seed catalog, read from db/postgres_extra/init/001_seed.sql.
+
+The SQL file is the only copy of the seed data: the test snapshot and the
+benchmark catalogs parse it here rather than repeating its rows.
+"""
+import os
+import re
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+SEED_SQL = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "db", "postgres_extra", "init", "001_seed.sql",
+)
+
+_CREATE = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\);", re.S)
+_COLUMN = re.compile(r"^\s*(\w+) (\w+)(?:\(\d+(?:,(\d+))?\))?(?:\[\d*\])?(.*?),?\s*(?:--.*)?$", re.M)
+_DEFAULT = re.compile(r"DEFAULT ('(?:[^']|'')*'|\w+)")
+_INSERT = re.compile(r"INSERT INTO (\w+) \(([^)]*)\) VALUES(.*?)(?:ON CONFLICT[^;]*)?;", re.S)
+_TOKEN = re.compile(r"\s*(?:'((?:[^']|'')*)'|(ARRAY\[)|(-?\d+\.\d*)|(-?\d+)|(\w+)|([(),\]]))")
+_KEYWORDS = {"null": None, "true": True, "false": False}
+_SERVER_DEFAULTS = {"CURRENT_TIMESTAMP"}
+
+
+class _Column(NamedTuple):
+    scale: Optional[int]  # digits after the point of a NUMERIC column
+    default: Any
+
+
+def _tokens(text: str) -> Iterator[Any]:
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Unexpected seed SQL at: {text[position:position + 40]!r}")
+        position = match.end()
+        string, array, decimal, integer, word, punctuation = match.groups()
+        if string is not None:
+            yield ("value", string.replace("''", "'"))
+        elif array is not None:
+            yield ("[", None)
+        elif decimal is not None:
+            yield ("value", Decimal(decimal))
+        elif integer is not None:
+            yield ("value", int(integer))
+        elif word is not None:
+            yield ("value", _KEYWORDS[word.lower()])
+        else:
+            yield (punctuation, None)
+
+
+def _literal(token: str) -> Any:
+    return next(_tokens(token))[1]
+
+
+def _columns(body: str) -> Dict[str, _Column]:
+    columns = {}
+    for name, type_name, scale, rest in _COLUMN.findall(body):
+        if type_name.upper() in ("PRIMARY", "UNIQUE", "CONSTRAINT"):
+            continue
+        default = _DEFAULT.search(rest)
+        if default is not None and default.group(1) in _SERVER_DEFAULTS:
+            continue
+        columns[name] = _Column(int(scale) if scale else None, None if default is None else _literal(default.group(1)))
+    return columns
+
+
+def _rows(values: str) -> Iterator[List[Any]]:
+    row: Optional[List[Any]] = None
+    array: Optional[List[Any]] = None
+    for kind, value in _tokens(values):
+        if kind == "(":
+            row = []
+        elif kind == ")":
+            yield row
+            row = None
+        elif kind == "[":
+            array = []
+        elif kind == "]":
+            row.append(array)
+            array = None
+        elif kind == "value":
+            (row if array is None else array).append(value)
+
+
+def _typed(value: Any, column: _Column) -> Any:
+    if column.scale is None:
+        return value
+    quantum = Decimal(1).scaleb(-column.scale)
+    if isinstance(value, list):
+        return [Decimal(item).quantize(quantum) for item in value]
+    return None if value is None else Decimal(value).quantize(quantum)
+
+
+def seed_rows(path: str = SEED_SQL) -> Dict[str, List[Dict[str, Any]]]:
+    """``{table: rows}`` of the MDM tables as a fresh load of ``path`` would hold them.
+
+    Rows carry the ids the SERIAL assigns, every column except server-side
+    timestamps (omitted columns take their DEFAULT, or None), and NUMERIC
+    values as Decimals at the column's scale, the way psycopg2 returns them.
+    """
+    with open(path, encoding="utf-8") as handle:
+        sql = handle.read()
+    tables = {name: _columns(body) for name, body in _CREATE.findall(sql)}
+    rows: Dict[str, List[Dict[str, Any]]] = {name: [] for name in tables}
+    for table, names, values in _INSERT.findall(sql):
+        columns = tables[table]
+        names = [name.strip() for name in names.split(",")]
+        for values_row in _rows(values):
+            given = dict(zip(names, values_row))
+            row = {"id": len(rows[table]) + 1}
+            for name, column in columns.items():
+                if name != "id":
+                    row[name] = _typed(given[name], column) if name in given else column.default
+            rows[table].append(row)
+    return rows
@@ -0,0 +1,23 @@
+from decimal import Decimal
+
+from .seed_data import seed_rows
+
+
+def test_seed_rows_match_a_fresh_load():
+    rows = seed_rows()
+
+    assert {table: len(table_rows) for table, table_rows in rows.items()} == {
+        "mdm_cables": 8, "mdm_connectors": 12, "mdm_contacts": 5, "mdm_accessories": 8,
+    }
+    ribbon = rows["mdm_cables"][0]
+    assert ribbon["id"] == 1 and ribbon["mpn"] == "3M-3365-10-300"
+    # Omitted columns are NULL or their DEFAULT; NUMERICs keep the column's scale
+    assert ribbon["conductor_awg"] is None and ribbon["status"] == "active"
+    assert str(ribbon["pitch_in"]) == "0.0500"
+    assert "created_at" not in ribbon
+
+    lug = rows["mdm_connectors"][9]
+    assert (lug["id"], lug["mpn"], lug["stud_size"], lug["pitch_mm"]) == (10, "TE-320582", "#10", None)
+    assert lug["compatible_contacts_awg"] == [8, 10, 12, 14, 16, 18]
+    assert rows["mdm_contacts"][2]["insulation_support"] is True
+    assert rows["mdm_accessories"][0]["cable_od_range_in"] == [Decimal("0.15"), Decimal("0.30")]